@@ -0,0 +1,87 @@
+# benchmarks/bench_dates.py
+
+"""
+Benchmark de throughput da extração de datas em um documento longo.
+
+Uso:
+    python benchmarks/bench_dates.py --size-mb 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analysis import extract_dates, _resolve_date
+
+SENTENCES = [
+    "O contrato foi assinado em {d} de {m} de {y} pela diretoria.",
+    "A revisão do procedimento ocorreu em {y}-{mm}-{dd} conforme o cronograma.",
+    "O prazo final para entrega é {dd}/{mm}/{y}.",
+    "The board approved the budget on {M} {d}, {y}.",
+    "The audit is scheduled for {M} {y} and has no further dates.",
+    "Este parágrafo não contém nenhuma data, apenas texto corrido sobre o processo.",
+    "This sentence has numbers like 42 and 3.14 but no dates at all.",
+]
+MONTHS_PT = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho',
+             'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+MONTHS_EN = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+             'August', 'September', 'October', 'November', 'December']
+
+
+def generate_document(size_bytes, seed=42):
+    """
+    Gera um documento sintético bilíngue com datas em vários formatos.
+
+    Parâmetros:
+        size_bytes (int): Tamanho aproximado do documento em bytes.
+        seed (int): Semente do gerador pseudoaleatório.
+
+    Retorna:
+        str: Documento gerado.
+    """
+    rng = random.Random(seed)
+    parts = []
+    total = 0
+    while total < size_bytes:
+        month = rng.randrange(12)
+        day = rng.randint(1, 28)
+        sentence = rng.choice(SENTENCES).format(
+            d=day, dd=f"{day:02d}", m=MONTHS_PT[month], M=MONTHS_EN[month],
+            mm=f"{month + 1:02d}", y=rng.randint(1990, 2030)
+        )
+        parts.append(sentence)
+        total += len(sentence) + 1
+    return ' '.join(parts)
+
+
+def run(size_mb, language, repeat):
+    """
+    Executa o benchmark e imprime o throughput em MB/s e datas/s.
+
+    Parâmetros:
+        size_mb (float): Tamanho do documento em MB.
+        language (str): Idioma repassado a extract_dates ('pt', 'en' ou None).
+        repeat (int): Número de repetições (a primeira aquece o cache).
+    """
+    text = generate_document(int(size_mb * 1024 * 1024))
+    _resolve_date.cache_clear()
+    for i in range(repeat):
+        start = time.perf_counter()
+        dates = extract_dates(text, language)
+        elapsed = time.perf_counter() - start
+        print(f"[{i + 1}/{repeat}] {len(dates)} datas em {elapsed:.2f}s - "
+              f"{size_mb / elapsed:.2f} MB/s, {len(dates) / elapsed:.0f} datas/s")
+    print(f"Cache: {_resolve_date.cache_info()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de extract_dates")
+    parser.add_argument('--size-mb', type=float, default=1.0, help="Tamanho do documento em MB.")
+    parser.add_argument('--language', type=str, default=None, help="Idioma ('pt' ou 'en').")
+    parser.add_argument('--repeat', type=int, default=2, help="Número de repetições.")
+    args = parser.parse_args()
+    run(args.size_mb, args.language, args.repeat)
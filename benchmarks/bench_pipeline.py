@@ -0,0 +1,211 @@
+# benchmarks/bench_pipeline.py
+
+"""
+Benchmark de ponta a ponta do pipeline (main.main), sem interface gráfica.
+
+Para cada combinação de tamanho de documento, número de documentos e número de processos,
+um corpus sintético é gravado em disco e processado por um pool de processos, cada documento
+em sua própria pasta de saída. São registrados docs/s, MB/s, latência p50/p95 por documento
+e o pico de RSS, em CSV e em gráficos de escalabilidade.
+
+Uso:
+    python benchmarks/bench_pipeline.py --sizes 10KB,100KB --counts 8 --workers 1,2,4
+"""
+
+import argparse
+import csv
+import logging
+import os
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from datetime import datetime
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from corpus import generate_corpus, parse_size
+
+CSV_FIELDS = ['language', 'doc_size', 'doc_count', 'workers', 'wall_s', 'docs_per_s', 'mb_per_s',
+              'p50_s', 'p95_s', 'peak_rss_mb', 'total_worker_rss_mb', 'errors']
+
+
+class _ErrorCounter(logging.Handler):
+    """
+    Conta os erros registrados pelo pipeline, que captura as exceções e as envia ao logging.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.count = 0
+
+    def emit(self, record):
+        self.count += 1
+
+
+def _run_document(input_file, output_folder, report_format):
+    """
+    Executa main.main sobre um documento (em um processo de trabalho).
+
+    Retorna:
+        tuple: (latência em segundos, número de erros registrados, pid, pico de RSS do processo em MB).
+    """
+    import main as pipeline
+    counter = _ErrorCounter()
+    logging.getLogger().addHandler(counter)
+    try:
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            pipeline.main(input_file, output_folder, report_format)
+        latency = time.perf_counter() - start
+    finally:
+        logging.getLogger().removeHandler(counter)
+    # ru_maxrss é informado em KB no Linux
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return latency, counter.count, os.getpid(), peak_rss
+
+
+def _percentile(values, fraction):
+    """
+    Percentil por interpolação linear (fraction entre 0 e 1).
+    """
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def run_configuration(language, size, count, workers, report_format, work_dir):
+    """
+    Processa um corpus sintético com o número de processos indicado e mede o desempenho.
+
+    Parâmetros:
+        language (str): Idioma do corpus ('pt' ou 'en').
+        size (str): Tamanho de cada documento (ex.: '10KB').
+        count (int): Número de documentos.
+        workers (int): Número de processos.
+        report_format (str): Formato do relatório gerado pelo pipeline.
+        work_dir (str): Pasta temporária para entradas e saídas.
+
+    Retorna:
+        dict: Linha do CSV com as métricas da configuração.
+    """
+    run_dir = os.path.join(work_dir, f"{language}_{size}_{count}_{workers}")
+    input_files = []
+    total_bytes = 0
+    for i, text in enumerate(generate_corpus(language, size, count)):
+        path = os.path.join(run_dir, 'input', f"documento_{i:05d}.txt")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        total_bytes += os.path.getsize(path)
+        input_files.append(path)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_run_document, path, os.path.join(run_dir, 'output', f"{i:05d}"), report_format)
+                   for i, path in enumerate(input_files)]
+        results = [future.result() for future in futures]
+    wall = time.perf_counter() - start
+
+    latencies = [latency for latency, _, _, _ in results]
+    worker_rss = {}
+    for _, _, pid, rss in results:
+        worker_rss[pid] = max(rss, worker_rss.get(pid, 0))
+    return {
+        'language': language,
+        'doc_size': size,
+        'doc_count': count,
+        'workers': workers,
+        'wall_s': round(wall, 3),
+        'docs_per_s': round(count / wall, 3),
+        'mb_per_s': round(total_bytes / 1024 ** 2 / wall, 4),
+        'p50_s': round(_percentile(latencies, 0.50), 3),
+        'p95_s': round(_percentile(latencies, 0.95), 3),
+        'peak_rss_mb': round(max(worker_rss.values()), 1),
+        'total_worker_rss_mb': round(sum(worker_rss.values()), 1),
+        'errors': sum(errors for _, errors, _, _ in results),
+    }
+
+
+def plot_scaling(rows, output_prefix):
+    """
+    Gera os gráficos de escalabilidade: docs/s por número de processos e latência p95 por tamanho.
+    """
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    series = {}
+    for row in rows:
+        series.setdefault((row['language'], row['doc_size'], row['doc_count']), []).append(row)
+
+    plt.figure(figsize=(8, 6))
+    for (language, size, count), points in series.items():
+        points = sorted(points, key=lambda r: r['workers'])
+        plt.plot([r['workers'] for r in points], [r['docs_per_s'] for r in points], marker='o',
+                 label=f"{language} {size} x{count}")
+    plt.xlabel('Processos')
+    plt.ylabel('Documentos/s')
+    plt.title('Throughput por número de processos')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.savefig(f"{output_prefix}_throughput.png", format='png')
+    plt.close()
+
+    plt.figure(figsize=(8, 6))
+    by_workers = {}
+    for row in rows:
+        by_workers.setdefault((row['language'], row['workers']), []).append(row)
+    for (language, workers), points in by_workers.items():
+        points = sorted(points, key=lambda r: parse_size(r['doc_size']))
+        plt.plot([parse_size(r['doc_size']) / 1024 for r in points], [r['p95_s'] for r in points], marker='o',
+                 label=f"{language}, {workers} processo(s)")
+    plt.xscale('log')
+    plt.xlabel('Tamanho do documento (KB)')
+    plt.ylabel('Latência p95 por documento (s)')
+    plt.title('Latência por tamanho de documento')
+    plt.legend()
+    plt.grid(True, alpha=0.3)
+    plt.savefig(f"{output_prefix}_latency.png", format='png')
+    plt.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de ponta a ponta do pipeline")
+    parser.add_argument('--sizes', default='10KB,100KB', help="Tamanhos dos documentos.")
+    parser.add_argument('--counts', default='8', help="Números de documentos por corpus.")
+    parser.add_argument('--workers', default=f"1,{os.cpu_count() or 1}", help="Números de processos.")
+    parser.add_argument('--languages', default='pt', help="Idiomas dos corpora.")
+    parser.add_argument('--report-format', default='markdown', choices=['pdf', 'html', 'markdown'],
+                        help="Formato do relatório gerado pelo pipeline.")
+    parser.add_argument('--output', default=None, help="Prefixo dos arquivos de saída (CSV e gráficos).")
+    args = parser.parse_args()
+
+    output_prefix = args.output or os.path.join(BENCHMARK_DIR, 'results', f"pipeline_{datetime.now():%Y%m%d_%H%M%S}")
+    os.makedirs(os.path.dirname(os.path.abspath(output_prefix)), exist_ok=True)
+    worker_counts = sorted({int(w) for w in args.workers.split(',')})
+
+    rows = []
+    with tempfile.TemporaryDirectory() as work_dir, open(f"{output_prefix}.csv", 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+        writer.writeheader()
+        for language in args.languages.split(','):
+            for size in args.sizes.split(','):
+                for count in (int(c) for c in args.counts.split(',')):
+                    for workers in worker_counts:
+                        row = run_configuration(language, size, count, workers, args.report_format, work_dir)
+                        writer.writerow(row)
+                        f.flush()
+                        rows.append(row)
+                        print(', '.join(f"{k}={row[k]}" for k in CSV_FIELDS))
+    plot_scaling(rows, output_prefix)
+    print(f"Resultados salvos em: {output_prefix}.csv, {output_prefix}_throughput.png, {output_prefix}_latency.png")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# benchmarks/bench_readers.py
+
+"""
+Benchmark dos leitores de DOCX e PPTX: leitores incrementais (readers.py) versus
+docx2txt e python-pptx, em tempo e pico de memória alocada.
+
+Uso:
+    python benchmarks/bench_readers.py --paragraphs 20000 --slides 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from readers import iter_docx_paragraphs, iter_pptx_slides
+
+PARAGRAPH = ("O procedimento estabelece as responsabilidades da gerência de tecnologia na "
+             "padronização dos documentos corporativos e na aprovação das normas internas.")
+
+
+def build_docx(path, paragraphs, image_path=None):
+    """
+    Gera um .docx com o número de parágrafos indicado e, opcionalmente, imagens a cada 500 parágrafos.
+    """
+    from docx import Document
+    document = Document()
+    for i in range(paragraphs):
+        document.add_paragraph(f"{i} {PARAGRAPH}")
+        if image_path and i % 500 == 0:
+            document.add_picture(image_path)
+    document.save(path)
+
+
+def build_pptx(path, slides, image_path=None):
+    """
+    Gera um .pptx com o número de slides indicado, cada um com título, texto e, opcionalmente, uma imagem.
+    """
+    from pptx import Presentation
+    from pptx.util import Inches
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]
+    for i in range(slides):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = f"{PARAGRAPH}\n{PARAGRAPH}"
+        if image_path:
+            slide.shapes.add_picture(image_path, Inches(1), Inches(4))
+    presentation.save(path)
+
+
+def build_image(path):
+    """
+    Gera uma imagem PNG de ruído (pouco compressível) para simular mídias embutidas.
+    """
+    import numpy as np
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    rng = np.random.default_rng(0)
+    plt.imsave(path, rng.random((600, 800, 3)))
+
+
+def read_docx_docx2txt(path):
+    import docx2txt
+    return docx2txt.process(path)
+
+
+def read_docx_streaming(path):
+    return '\n'.join(iter_docx_paragraphs(path))
+
+
+def read_pptx_python_pptx(path):
+    from pptx import Presentation
+    text_runs = []
+    for slide in Presentation(path).slides:
+        for shape in slide.shapes:
+            if hasattr(shape, "text"):
+                text_runs.append(shape.text)
+    return ' '.join(text_runs)
+
+
+def read_pptx_streaming(path):
+    return '\n'.join(text for _, text in iter_pptx_slides(path))
+
+
+def measure(function, path):
+    """
+    Executa o leitor e retorna (tempo em segundos, pico de memória em MB, tamanho do texto).
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    text = function(path)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, len(text)
+
+
+def run(paragraphs, slides):
+    with tempfile.TemporaryDirectory() as tmp:
+        image_path = os.path.join(tmp, 'imagem.png')
+        build_image(image_path)
+        docx_path = os.path.join(tmp, 'documento.docx')
+        pptx_path = os.path.join(tmp, 'apresentacao.pptx')
+        build_docx(docx_path, paragraphs, image_path)
+        build_pptx(pptx_path, slides, image_path)
+        cases = [
+            ('docx', 'docx2txt', read_docx_docx2txt, docx_path),
+            ('docx', 'streaming', read_docx_streaming, docx_path),
+            ('pptx', 'python-pptx', read_pptx_python_pptx, pptx_path),
+            ('pptx', 'streaming', read_pptx_streaming, pptx_path),
+        ]
+        print(f"{'formato':<8}{'leitor':<14}{'tamanho (MB)':>14}{'tempo (s)':>12}{'pico (MB)':>12}{'caracteres':>12}")
+        for fmt, name, function, path in cases:
+            elapsed, peak, chars = measure(function, path)
+            size = os.path.getsize(path) / 1024 / 1024
+            print(f"{fmt:<8}{name:<14}{size:>14.1f}{elapsed:>12.2f}{peak:>12.1f}{chars:>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dos leitores de DOCX e PPTX")
+    parser.add_argument('--paragraphs', type=int, default=20000, help="Número de parágrafos do .docx.")
+    parser.add_argument('--slides', type=int, default=500, help="Número de slides do .pptx.")
+    args = parser.parse_args()
+    run(args.paragraphs, args.slides)
@@ -0,0 +1,141 @@
+# benchmarks/corpus.py
+
+"""
+Gerador determinístico de documentos sintéticos em português e inglês para benchmarks.
+
+Os documentos combinam modelos de sentença com entidades, datas, conectores, ações com
+responsáveis e alguns erros de concordância, de forma que todos os analisadores tenham
+material para processar. A mesma semente sempre produz o mesmo texto.
+"""
+
+import random
+import re
+
+SIZE_UNITS = {'B': 1, 'KB': 1024, 'MB': 1024 ** 2}
+
+VOCABULARY = {
+    'pt': {
+        'subjects': ['O gerente', 'A diretoria', 'O analista', 'A equipe de suporte', 'O conselho',
+                     'A coordenadora', 'O facilitador', 'A gerência de tecnologia'],
+        'verbs': ['aprova', 'revisa', 'publica', 'encaminha', 'valida', 'atualiza', 'arquiva', 'analisa'],
+        'objects': ['o documento', 'a norma interna', 'o procedimento', 'o relatório mensal',
+                    'o plano de ação', 'a política de segurança', 'o cronograma', 'o contrato'],
+        'entities': ['Vibra Energia', 'Petrobras', 'João Silva', 'Maria Souza', 'São Paulo',
+                     'Rio de Janeiro', 'Banco Central', 'Ministério de Minas e Energia'],
+        'connectors': ['Além disso,', 'No entanto,', 'Portanto,', 'Por exemplo,', 'Contudo,', 'Em suma,'],
+        'months': ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho', 'agosto',
+                   'setembro', 'outubro', 'novembro', 'dezembro'],
+        'templates': [
+            "{subject} {verb} {object} até {day} de {month} de {year}.",
+            "{connector} {subject} {verb} {object} em conjunto com {entity}.",
+            "{object_cap} é aprovado pelo conselho de {entity}.",
+            "{subject} é responsável pela revisão {of_object}.",
+            "A reunião com {entity} ocorreu em {dd}/{mm}/{year} e tratou {of_object}.",
+            "Nós {verb_plural} {object} e depois ele vão ao escritório de {entity}.",
+            "O processo de padronização garante que {object} seja mantido atualizado e disponível.",
+        ],
+        'verbs_plural': ['aprovamos', 'revisamos', 'publicamos', 'validamos'],
+    },
+    'en': {
+        'subjects': ['The manager', 'The board', 'The analyst', 'The support team', 'The council',
+                     'The coordinator', 'The facilitator', 'The technology department'],
+        'verbs': ['approves', 'reviews', 'publishes', 'forwards', 'validates', 'updates', 'archives', 'analyzes'],
+        'objects': ['the document', 'the internal rule', 'the procedure', 'the monthly report',
+                    'the action plan', 'the security policy', 'the schedule', 'the contract'],
+        'entities': ['Vibra Energy', 'Shell', 'John Smith', 'Mary Johnson', 'London',
+                     'New York', 'the Central Bank', 'the Ministry of Energy'],
+        'connectors': ['Furthermore,', 'However,', 'Therefore,', 'For example,', 'Nevertheless,', 'In summary,'],
+        'months': ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+                   'September', 'October', 'November', 'December'],
+        'templates': [
+            "{subject} {verb} {object} by {month} {day}, {year}.",
+            "{connector} {subject} {verb} {object} together with {entity}.",
+            "{object_cap} is approved by the board of {entity}.",
+            "{subject} is responsible for reviewing {object}.",
+            "The meeting with {entity} took place on {year}-{mm}-{dd} and covered {object}.",
+            "We {verb_plural} {object} and then he are going to the office of {entity}.",
+            "The standardization process ensures that {object} is kept up to date and available.",
+        ],
+        'verbs_plural': ['approve', 'review', 'publish', 'validate'],
+    }
+}
+
+
+def parse_size(size):
+    """
+    Converte um tamanho como '1KB', '2.5MB' ou '500B' em bytes.
+
+    Parâmetros:
+        size (str or int): Tamanho com unidade (B, KB ou MB) ou número de bytes.
+
+    Retorna:
+        int: Tamanho em bytes.
+    """
+    if isinstance(size, int):
+        return size
+    match = re.fullmatch(r'\s*([\d.]+)\s*(B|KB|MB)?\s*', size.upper())
+    if not match:
+        raise ValueError(f"Tamanho inválido: {size}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2) or 'B'])
+
+
+def _sentence(rng, words):
+    """
+    Sorteia um modelo de sentença e preenche suas lacunas.
+    """
+    obj = rng.choice(words['objects'])
+    day = rng.randint(1, 28)
+    month = rng.randrange(12)
+    return rng.choice(words['templates']).format(
+        subject=rng.choice(words['subjects']),
+        verb=rng.choice(words['verbs']),
+        verb_plural=rng.choice(words['verbs_plural']),
+        object=obj,
+        object_cap=obj[0].upper() + obj[1:],
+        of_object=('d' + obj[1:]) if obj.startswith(('o ', 'a ')) else obj,
+        entity=rng.choice(words['entities']),
+        connector=rng.choice(words['connectors']),
+        day=day, dd=f"{day:02d}", month=words['months'][month], mm=f"{month + 1:02d}",
+        year=rng.randint(2015, 2030),
+    )
+
+
+def generate_document(language, size, seed=0):
+    """
+    Gera um documento sintético determinístico.
+
+    Parâmetros:
+        language (str): Idioma do documento ('pt' ou 'en').
+        size (str or int): Tamanho aproximado (ex.: '1KB', '50MB' ou número de bytes).
+        seed (int): Semente do gerador.
+
+    Retorna:
+        str: Documento com parágrafos de 3 a 6 sentenças.
+    """
+    size_bytes = parse_size(size)
+    rng = random.Random(f"{language}-{seed}")
+    words = VOCABULARY[language]
+    paragraphs = []
+    total = 0
+    while total < size_bytes:
+        paragraph = ' '.join(_sentence(rng, words) for _ in range(rng.randint(3, 6)))
+        paragraphs.append(paragraph)
+        total += len(paragraph.encode('utf-8')) + 1
+    return '\n'.join(paragraphs)
+
+
+def generate_corpus(language, size, count, seed=0):
+    """
+    Gera uma sequência de documentos sintéticos com sementes consecutivas.
+
+    Parâmetros:
+        language (str): Idioma dos documentos ('pt' ou 'en').
+        size (str or int): Tamanho aproximado de cada documento.
+        count (int): Número de documentos.
+        seed (int): Semente do primeiro documento.
+
+    Retorna:
+        generator: Textos dos documentos.
+    """
+    for i in range(count):
+        yield generate_document(language, size, seed + i)
@@ -0,0 +1,327 @@
+# benchmarks/run_benchmarks.py
+
+"""
+Microbenchmarks das funções públicas de preprocessing, analysis, visualization e database.
+
+Cada função é executada sobre documentos sintéticos (benchmarks/corpus.py) nos tamanhos e
+idiomas pedidos. Os tempos são gravados em JSON e, se um baseline for informado, o script
+termina com código 1 quando alguma função ficar mais lenta que o limite tolerado.
+
+Uso:
+    python benchmarks/run_benchmarks.py --sizes 1KB,100KB --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 1KB,100KB --baseline benchmarks/baseline.json --threshold 0.25
+"""
+
+import argparse
+import collections
+import inspect
+import json
+import logging
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+from functools import cached_property
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARK_DIR, '..', 'src'))
+
+from corpus import generate_document, parse_size
+
+BENCHMARKED_MODULES = ['preprocessing', 'analysis', 'visualization', 'database']
+
+
+class BenchmarkContext:
+    """
+    Entradas compartilhadas pelos benchmarks de um documento (idioma e tamanho).
+
+    As entradas derivadas (tokens, Doc do spaCy, resultados agregados) são calculadas uma única
+    vez, fora da medição, e reaproveitadas por todas as funções.
+    """
+
+    def __init__(self, language, size, output_folder):
+        self.language = language
+        self.size = size
+        self.text = generate_document(language, size)
+        self.output_folder = output_folder
+
+    def output_path(self, name):
+        return os.path.join(self.output_folder, name)
+
+    @cached_property
+    def tokens(self):
+        return re.findall(r'[^\W\d_]+', self.text.lower())
+
+    @cached_property
+    def word_freq(self):
+        return dict(collections.Counter(self.tokens).most_common(200))
+
+    @cached_property
+    def doc(self):
+        from utils import load_spacy_model
+        return load_spacy_model(self.language)(self.text)
+
+    @property
+    def entities(self):
+        return [('Vibra Energia', 'ORG'), ('São Paulo', 'LOC'), ('João Silva', 'PER'), ('Petrobras', 'ORG')]
+
+    @property
+    def topics(self):
+        return [(i, ' + '.join(f'0.05*"{word}"' for word in list(self.word_freq)[i * 5:(i + 1) * 5]))
+                for i in range(5)]
+
+    @property
+    def actions(self):
+        return [{'action': 'aprovar o documento', 'responsible': 'O gerente'},
+                {'action': 'revisar a norma', 'responsible': 'A diretoria'}]
+
+    @property
+    def analysis_results(self):
+        return {
+            'word_frequency': dict(list(self.word_freq.items())[:20]),
+            'entities': self.entities,
+            'actions': self.actions,
+            'verb_agreement_errors': [{'verb': 'vão', 'subject': 'ele', 'error': 'Concordância incorreta para sujeito singular.'}],
+            'connectives': {'aditivos': 3, 'adversativos': 1, 'conclusivos': 2},
+            'readability': {'flesch_reading_ease': 50.0, 'flesch_kincaid_grade': 9.0, 'fernandez_huerta_adjusted': 0},
+        }
+
+
+# Argumentos de cada função pública, construídos a partir do contexto do documento
+BENCHMARK_ARGS = {
+    'preprocessing': {
+        'detect_language': lambda c: (c.text,),
+        'segment_by_language': lambda c: (c.text, c.language),
+        'tag_and_lemmatize': lambda c: (c.tokens, c.language),
+        'filter_pos_tags': lambda c: (c.tokens, c.language),
+        'preprocess_text': lambda c: (c.text, c.language),
+        'text_statistics': lambda c: (c.text,),
+        'count_syllables_pt': lambda c: (c.text,),
+    },
+    'analysis': {
+        'is_inappropriate': lambda c: ('documento',),
+        'extract_dates': lambda c: (c.text, c.language),
+        'extract_entities': lambda c: (c.text, c.language),
+        'extract_pos_tags': lambda c: (c.text, c.language),
+        'dependency_parsing': lambda c: (c.text, c.language),
+        'keyword_extraction': lambda c: (c.text, c.language),
+        'extract_relationships': lambda c: (c.text, c.language),
+        'lda_topic_modeling': lambda c: (c.tokens, c.language),
+        'sentiment_analysis': lambda c: (c.text, c.language),
+        'sentence_sentiments': lambda c: (c.text, c.language),
+        'analyze_connectors': lambda c: (c.text, c.language),
+        'spelling_correction': lambda c: (c.text, c.language),
+        'readability_scores': lambda c: (c.text, c.language),
+        'iter_actions_and_responsibles': lambda c: (c.doc, c.language),
+        'extract_actions_and_responsibles': lambda c: (c.text, c.language, c.doc),
+        'extract_actions_from_corpus': lambda c: ([c.text], c.language),
+        'iter_verb_agreement_errors': lambda c: (c.doc,),
+        'check_verb_agreement': lambda c: (c.text, c.language, c.doc),
+        'iter_sentence_persons': lambda c: (c.doc, c.language),
+        'iter_person_changes': lambda c: (c.doc, c.language),
+        'detect_person_changes': lambda c: (c.text, c.language, c.doc),
+        'check_grammar_corpus': lambda c: ([c.text], c.language),
+    },
+    'visualization': {
+        'generate_word_cloud': lambda c: (c.word_freq, c.output_path('word_cloud.png')),
+        'generate_entity_network': lambda c: (c.entities, c.output_path('entity_network.png')),
+        'generate_dense_pixel_display': lambda c: (c.text, c.output_path('dense_pixel_display.png')),
+        'generate_topic_visualization': lambda c: (c.topics, c.output_path('topic_visualization.png')),
+        'generate_action_flow': lambda c: (c.actions, c.output_path('action_flow.png')),
+    },
+    'database': {
+        'store_data_in_database': lambda c: (c.analysis_results, c.output_folder),
+        # Após a primeira repetição, index_document mede o caminho incremental (documento inalterado)
+        'index_document': lambda c: (c.analysis_results, c.text, c.output_path('search_index.db'),
+                                     f"{c.language}_{c.size}.txt"),
+        'optimize_search_index': lambda c: (c.output_path('search_index.db'),),
+        'search_documents': lambda c: (c.output_path('search_index.db'), 'energia'),
+    },
+}
+
+
+class _ErrorCounter(logging.Handler):
+    """
+    Conta os registros de erro emitidos durante uma chamada: as funções do toolkit capturam
+    exceções e as registram com logging.error em vez de propagá-las.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def public_functions(module):
+    """
+    Lista as funções públicas definidas no próprio módulo (ignorando as importadas).
+    """
+    return [name for name, function in inspect.getmembers(module, inspect.isfunction)
+            if function.__module__ == module.__name__ and not name.startswith('_')]
+
+
+def time_function(function, args, repeat):
+    """
+    Executa a função repetidamente e retorna as estatísticas de tempo.
+
+    Parâmetros:
+        function (callable): Função a ser medida.
+        args (tuple): Argumentos da chamada.
+        repeat (int): Número de repetições.
+
+    Retorna:
+        dict: 'status' ('ok' ou 'error'), 'median_s', 'min_s', 'max_s', 'repeat' e 'error' (se houver).
+    """
+    counter = _ErrorCounter()
+    root = logging.getLogger()
+    root.addHandler(counter)
+    timings = []
+    try:
+        with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = function(*args)
+                if inspect.isgenerator(result):
+                    collections.deque(result, maxlen=0)
+                timings.append(time.perf_counter() - start)
+    except Exception as e:
+        counter.messages.append(f"{type(e).__name__}: {e}")
+    finally:
+        root.removeHandler(counter)
+    stats = {
+        'status': 'error' if counter.messages else 'ok',
+        'repeat': len(timings),
+        'median_s': statistics.median(timings) if timings else None,
+        'min_s': min(timings) if timings else None,
+        'max_s': max(timings) if timings else None,
+    }
+    if counter.messages:
+        stats['error'] = counter.messages[0][:300]
+    return stats
+
+
+def run_benchmarks(sizes, languages, repeat, pattern=None):
+    """
+    Executa os benchmarks de todas as funções públicas para cada idioma e tamanho.
+
+    Parâmetros:
+        sizes (list): Tamanhos dos documentos (ex.: ['1KB', '1MB']).
+        languages (list): Idiomas ('pt', 'en').
+        repeat (int): Repetições por função.
+        pattern (str): Expressão regular para filtrar 'modulo.funcao'. None para todas.
+
+    Retorna:
+        dict: Resultados indexados por 'modulo.funcao[idioma-tamanho]'.
+    """
+    import importlib
+    results = {}
+    modules = {name: importlib.import_module(name) for name in BENCHMARKED_MODULES}
+    for name, module in modules.items():
+        missing = set(public_functions(module)) - set(BENCHMARK_ARGS[name])
+        for function_name in sorted(missing):
+            print(f"AVISO: {name}.{function_name} não tem especificação de benchmark.")
+    for language in languages:
+        for size in sizes:
+            with tempfile.TemporaryDirectory() as output_folder:
+                context = BenchmarkContext(language, size, output_folder)
+                for module_name, specs in BENCHMARK_ARGS.items():
+                    for function_name, build_args in specs.items():
+                        qualified = f"{module_name}.{function_name}"
+                        if pattern and not re.search(pattern, qualified):
+                            continue
+                        key = f"{qualified}[{language}-{size}]"
+                        try:
+                            args = build_args(context)
+                        except Exception as e:
+                            results[key] = {'status': 'error', 'error': f"Entrada indisponível: {e}"[:300]}
+                        else:
+                            results[key] = time_function(getattr(modules[module_name], function_name), args, repeat)
+                        result = results[key]
+                        timing = f"{result['median_s']:.4f}s" if result.get('median_s') is not None else '-'
+                        print(f"{key:<70} {result['status']:<6} {timing}")
+    return results
+
+
+def compare_with_baseline(results, baseline, threshold, min_delta):
+    """
+    Compara os resultados com um baseline e lista as regressões.
+
+    Uma regressão ocorre quando a mediana atual supera a do baseline em mais de threshold
+    (fração) e em mais de min_delta segundos, para descartar ruído em funções muito rápidas.
+
+    Parâmetros:
+        results (dict): Resultados atuais.
+        baseline (dict): Resultados do baseline.
+        threshold (float): Aumento relativo tolerado (ex.: 0.25 para 25%).
+        min_delta (float): Aumento absoluto mínimo, em segundos, para contar como regressão.
+
+    Retorna:
+        list: Tuplas (chave, mediana do baseline, mediana atual).
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous or previous.get('status') != 'ok' or current.get('status') != 'ok':
+            continue
+        before, after = previous['median_s'], current['median_s']
+        if after > before * (1 + threshold) and after - before > min_delta:
+            regressions.append((key, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Microbenchmarks do Advanced Text Mining Toolkit")
+    parser.add_argument('--sizes', default='1KB,100KB', help="Tamanhos dos documentos, de 1KB a 50MB (ex.: 1KB,1MB).")
+    parser.add_argument('--languages', default='pt,en', help="Idiomas dos documentos.")
+    parser.add_argument('--repeat', type=int, default=3, help="Repetições por função.")
+    parser.add_argument('--functions', default=None, help="Regex para filtrar 'modulo.funcao'.")
+    parser.add_argument('--output', default=None, help="Arquivo JSON de saída.")
+    parser.add_argument('--baseline', default=None, help="Baseline JSON para detectar regressões.")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Aumento relativo tolerado (0.25 = 25%%).")
+    parser.add_argument('--min-delta', type=float, default=0.005, help="Aumento mínimo em segundos para regressão.")
+    parser.add_argument('--save-baseline', default=None, help="Grava os resultados também como baseline.")
+    args = parser.parse_args()
+
+    sizes = [s.strip() for s in args.sizes.split(',')]
+    for size in sizes:
+        if not 1024 <= parse_size(size) <= 50 * 1024 ** 2:
+            parser.error(f"Tamanho fora do intervalo de 1KB a 50MB: {size}")
+    results = run_benchmarks(sizes, [l.strip() for l in args.languages.split(',')], args.repeat, args.functions)
+
+    payload = {
+        'metadata': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': sizes,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    output = args.output or os.path.join(BENCHMARK_DIR, 'results', f"benchmark_{datetime.now():%Y%m%d_%H%M%S}.json")
+    for path in filter(None, [output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, indent=2, ensure_ascii=False)
+        print(f"Resultados salvos em: {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare_with_baseline(results, baseline, args.threshold, args.min_delta)
+        for key, before, after in regressions:
+            print(f"REGRESSÃO: {key}: {before:.4f}s -> {after:.4f}s ({after / before - 1:+.0%})")
+        if regressions:
+            sys.exit(1)
+        print("Nenhuma regressão em relação ao baseline.")
+
+
+if __name__ == "__main__":
+    main()
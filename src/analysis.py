@@ -2,9 +2,14 @@
 
 import logging
 import re
+from datetime import date, datetime
+from functools import lru_cache
+import numpy as np
 from spellchecker import SpellChecker
 from nltk.tokenize import word_tokenize
 from utils import load_spacy_model
+from columnar import ColumnarResult
+from spacy.attrs import DEP, ENT_TYPE, HEAD, ORTH, POS
 from textstat import flesch_reading_ease, flesch_kincaid_grade
 import pyphen
 import dateparser
@@ -78,6 +83,172 @@ CONNECTORS = {
     }
 }
 
+# Nomes de meses (completos e abreviados) usados no pré-filtro de datas
+MONTH_NAMES = {
+    'pt': [
+        'janeiro', 'fevereiro', 'março', 'marco', 'abril', 'maio', 'junho', 'julho',
+        'agosto', 'setembro', 'outubro', 'novembro', 'dezembro',
+        'jan', 'fev', 'mar', 'abr', 'mai', 'jun', 'jul', 'ago', 'set', 'out', 'nov', 'dez'
+    ],
+    'en': [
+        'january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+        'september', 'october', 'november', 'december',
+        'jan', 'feb', 'mar', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec'
+    ]
+}
+
+# Ordem dos campos em datas numéricas ambíguas (ex.: 03/04/2023)
+DATE_ORDER = {'pt': 'DMY', 'en': 'MDY'}
+
+
+def _build_date_pattern():
+    """
+    Compila a expressão regular que localiza spans candidatos a datas em português e inglês.
+
+    Retorna:
+        re.Pattern: Padrão compilado (case-insensitive).
+    """
+    # Nomes mais longos primeiro para que 'março' não seja cortado em 'mar'
+    pt_months = '|'.join(sorted(MONTH_NAMES['pt'], key=len, reverse=True))
+    en_months = '|'.join(sorted(MONTH_NAMES['en'], key=len, reverse=True))
+    ordinal = r'(?:st|nd|rd|th|º|°)?'
+    alternatives = [
+        # ISO 8601: 2023-03-15
+        r'\d{4}-\d{1,2}-\d{1,2}',
+        # Numéricas: 15/03/2023, 15.03.23, 03-15-2023
+        r'\d{1,2}[/.-]\d{1,2}[/.-](?:\d{4}|\d{2})',
+        # Português: 15 de março de 2023, 1º de maio (resolvida só com reference_date), março de 2023
+        rf'\d{{1,2}}{ordinal}\s+de\s+(?:{pt_months})\.?(?:\s+de\s+\d{{4}})?',
+        rf'(?:{pt_months})\.?\s+de\s+\d{{4}}',
+        # Inglês: 15 March 2023, March 15, 2023, March 2023
+        rf'\d{{1,2}}{ordinal}\s+(?:of\s+)?(?:{en_months})\.?,?\s+\d{{4}}',
+        rf'(?:{en_months})\.?\s+\d{{1,2}}{ordinal},?\s+\d{{4}}',
+        rf'(?:{en_months})\.?\s+\d{{4}}',
+    ]
+    return re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?!\w)', re.IGNORECASE)
+
+DATE_CANDIDATE_PATTERN = _build_date_pattern()
+ISO_DATE_PATTERN = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+NUMERIC_DATE_PATTERN = re.compile(r'(\d{1,2})[/.-](\d{1,2})[/.-](\d{4}|\d{2})')
+# Sufixos ordinais ('1º', '2nd'), que o dateparser não reconhece
+ORDINAL_SUFFIX_PATTERN = re.compile(r'(?<=\d)(?:st|nd|rd|th|º|°)')
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+
+def _normalize_date_span(span):
+    """
+    Normaliza um span candidato para servir de chave do cache de resolução.
+
+    Parâmetros:
+        span (str): Texto do span encontrado pelo pré-filtro.
+
+    Retorna:
+        str: Span em minúsculas, com espaços colapsados, sem sufixos ordinais e sem pontuação final.
+    """
+    return ORDINAL_SUFFIX_PATTERN.sub('', ' '.join(span.lower().split())).rstrip('.,')
+
+
+def _numeric_date(normalized_span, date_order):
+    """
+    Converte datas puramente numéricas sem passar pelo dateparser.
+
+    Parâmetros:
+        normalized_span (str): Span normalizado.
+        date_order (str): Ordem dos campos para datas numéricas ('DMY' ou 'MDY').
+
+    Retorna:
+        date or None: Data convertida, ou None se o span não for numérico ou for inválido.
+    """
+    iso = ISO_DATE_PATTERN.fullmatch(normalized_span)
+    if iso:
+        year, month, day = (int(g) for g in iso.groups())
+    else:
+        numeric = NUMERIC_DATE_PATTERN.fullmatch(normalized_span)
+        if not numeric:
+            return None
+        first, second, year = (int(g) for g in numeric.groups())
+        day, month = (first, second) if date_order == 'DMY' else (second, first)
+        if len(numeric.group(3)) == 2:
+            year += 2000 if year < 70 else 1900
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=16384)
+def _resolve_date(normalized_span, languages, date_order, reference_date=None):
+    """
+    Converte um span normalizado em data ISO, consultando o dateparser apenas para datas por extenso.
+
+    Parâmetros:
+        normalized_span (str): Span normalizado por _normalize_date_span.
+        languages (tuple): Idiomas repassados ao dateparser.
+        date_order (str): Ordem dos campos para datas numéricas ('DMY' ou 'MDY').
+        reference_date (date): Data que fornece o ano de datas sem ano (ex.: '1º de maio').
+            Se None, essas datas não são resolvidas, para que o resultado não dependa do dia da execução.
+
+    Retorna:
+        str or None: Data no formato ISO (AAAA-MM-DD) ou None se o span não for uma data válida.
+    """
+    # Caminho rápido: datas numéricas não precisam do dateparser
+    if normalized_span[0].isdigit() and not any(c.isalpha() for c in normalized_span):
+        numeric = _numeric_date(normalized_span, date_order)
+        return numeric.isoformat() if numeric else None
+    settings = {'DATE_ORDER': date_order, 'PREFER_DAY_OF_MONTH': 'first'}
+    if not YEAR_PATTERN.search(normalized_span):
+        if reference_date is None:
+            return None
+        settings['RELATIVE_BASE'] = datetime.combine(reference_date, datetime.min.time())
+    parsed = dateparser.parse(normalized_span, languages=list(languages), settings=settings)
+    return parsed.date().isoformat() if parsed else None
+
+
+def extract_dates(text, language=None, reference_date=None):
+    """
+    Extrai datas do texto em português e inglês.
+
+    Um pré-filtro por expressão regular localiza os spans candidatos e somente eles são
+    resolvidos pelo dateparser, com cache LRU sobre o span normalizado.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): Idioma do texto ('en' ou 'pt'). Se None, ambos são considerados.
+        reference_date (date): Data que fornece o ano de datas sem ano. Se None, elas são ignoradas.
+
+    Retorna:
+        list: Lista de dicionários com 'text', 'start', 'end' (offsets de caracteres) e 'date' (ISO).
+    """
+    try:
+        logging.info("Iniciando extração de datas.")
+        print("Iniciando extração de datas.")
+        if language in DATE_ORDER:
+            languages = (language,)
+            date_order = DATE_ORDER[language]
+        else:
+            languages = ('pt', 'en')
+            date_order = DATE_ORDER['pt']
+
+        dates = []
+        for match in DATE_CANDIDATE_PATTERN.finditer(text):
+            # O ponto de abreviações de mês no fim do span ('15 de mar.') não faz parte da data
+            span = match.group().rstrip('.')
+            iso_date = _resolve_date(_normalize_date_span(span), languages, date_order, reference_date)
+            if iso_date:
+                dates.append({
+                    'text': span,
+                    'start': match.start(),
+                    'end': match.start() + len(span),
+                    'date': iso_date
+                })
+        logging.info(f"Datas extraídas: {len(dates)} ({_resolve_date.cache_info()})")
+        print(f"Datas extraídas: {len(dates)}")
+        return dates
+    except Exception as e:
+        logging.error(f"Erro na extração de datas: {str(e)}")
+        print(f"Erro na extração de datas: {str(e)}")
+        return []
+
 def is_inappropriate(word):
     """
     Verifica se uma palavra é ofensiva ou inadequada.
@@ -92,13 +263,14 @@ def is_inappropriate(word):
     inappropriate_words = {'delicia', 'palavra_ofensiva2', 'palavra_ofensiva3'}  # Adicione outras palavras conforme necessário
     return word.lower() in inappropriate_words
 
-def extract_entities(text, language):
+def extract_entities(text, language, doc=None):
     """
     Extrai entidades nomeadas do texto.
     
     Parâmetros:
         text (str): O texto a ser analisado.
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
     
     Retorna:
         list: Lista de tuplas com entidades e seus tipos.
@@ -106,8 +278,9 @@ def extract_entities(text, language):
     try:
         logging.info("Iniciando extração de entidades nomeadas.")
         print("Iniciando extração de entidades nomeadas.")
-        nlp = load_spacy_model(language)
-        doc = nlp(text)
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
         entities = [(ent.text, ent.label_) for ent in doc.ents]
         logging.info(f"Entidades extraídas: {entities}")
         print(f"Entidades extraídas: {entities}")
@@ -117,55 +290,64 @@ def extract_entities(text, language):
         print(f"Erro na extração de entidades: {str(e)}")
         return []
 
-def extract_pos_tags(text, language):
+def extract_pos_tags(text, language, doc=None):
     """
     Extrai POS tags do texto.
     
     Parâmetros:
         text (str): O texto a ser analisado.
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
     
     Retorna:
-        list: Lista de tokens com suas respectivas POS tags.
+        ColumnarResult: Linhas (token, POS tag), armazenadas por colunas.
     """
     try:
         logging.info("Iniciando extração de POS tags.")
         print("Iniciando extração de POS tags.")
-        nlp = load_spacy_model(language)
-        doc = nlp(text)
-        pos_tags = [(token.text, token.pos_) for token in doc]
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        orth, pos = doc.to_array([ORTH, POS]).T
+        pos_tags = ColumnarResult({'token': orth, 'pos': pos}, doc.vocab.strings, ('token', 'pos'))
         logging.info(f"POS tags extraídos: {pos_tags[:10]}...")  # Log parcial
         print(f"POS tags extraídos: {pos_tags[:10]}...")  # Print parcial
         return pos_tags
     except Exception as e:
         logging.error(f"Erro na extração de POS tags: {str(e)}")
         print(f"Erro na extração de POS tags: {str(e)}")
-        return []
+        return ColumnarResult.empty(('token', 'pos'), ('token', 'pos'))
 
-def dependency_parsing(text, language):
+def dependency_parsing(text, language, doc=None):
     """
     Realiza análise de dependência no texto.
     
     Parâmetros:
         text (str): O texto a ser analisado.
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
     
     Retorna:
-        list: Lista de relações de dependência.
+        ColumnarResult: Linhas (token, relação, núcleo), armazenadas por colunas.
     """
     try:
         logging.info("Iniciando análise de dependência.")
         print("Iniciando análise de dependência.")
-        nlp = load_spacy_model(language)
-        doc = nlp(text)
-        dependencies = [(token.text, token.dep_, token.head.text) for token in doc]
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        orth, head, dep = doc.to_array([ORTH, HEAD, DEP]).T
+        # HEAD é o deslocamento relativo do núcleo (armazenado como uint64)
+        heads = np.arange(len(doc)) + head.astype(np.int64)
+        dependencies = ColumnarResult({'token': orth, 'dep': dep, 'head': orth[heads]},
+                                      doc.vocab.strings, ('token', 'dep', 'head'))
         logging.info(f"Relações de dependência extraídas: {dependencies[:10]}...")  # Log parcial
         print(f"Relações de dependência extraídas: {dependencies[:10]}...")  # Print parcial
         return dependencies
     except Exception as e:
         logging.error(f"Erro na análise de dependência: {str(e)}")
         print(f"Erro na análise de dependência: {str(e)}")
-        return []
+        return ColumnarResult.empty(('token', 'dep', 'head'), ('token', 'dep', 'head'))
 
 def keyword_extraction(text, language):
     """
@@ -196,38 +378,74 @@ def keyword_extraction(text, language):
         print(f"Erro na extração de palavras-chave: {str(e)}")
         return []
 
-def extract_relationships(text, language):
+RELATION_DEPS = ('prep', 'agent')
+
+def _relationship_columns(doc):
+    """
+    Encontra as relações entidade -> preposição/agente -> entidade com máscaras vetorizadas.
+
+    Uma relação é registrada quando a raiz de uma entidade é a raiz da sentença, um filho dela
+    tem dependência em RELATION_DEPS e um filho deste pertence a uma entidade.
+
+    Parâmetros:
+        doc (spacy.tokens.Doc): Documento analisado.
+
+    Retorna:
+        ColumnarResult: Colunas 'entity', 'relation' e 'target', na ordem das entidades e dos tokens.
+    """
+    orth, head, dep, ent_type = doc.to_array([ORTH, HEAD, DEP, ENT_TYPE]).T
+    index = np.arange(len(doc))
+    heads = index + head.astype(np.int64)
+    relation_deps = [doc.vocab.strings.add(label) for label in RELATION_DEPS]
+    # Tokens de relação: filhos (não raízes) de uma raiz de sentença
+    is_relation = np.isin(dep, relation_deps) & (heads != index)
+    is_relation &= heads[heads] == heads
+    # Alvos: tokens de entidade cujo núcleo é um token de relação
+    targets = np.flatnonzero((ent_type != 0) & (heads != index) & is_relation[heads])
+    relations = heads[targets]
+    roots = heads[relations]
+
+    # Entidades cuja raiz é a raiz da sentença, indexadas pela raiz
+    entity_roots = {}
+    for order, ent in enumerate(doc.ents):
+        if ent.root.head.i == ent.root.i:
+            entity_roots.setdefault(ent.root.i, (order, ent.text))
+    keep = np.array([root in entity_roots for root in roots.tolist()], dtype=bool)
+    targets, relations, roots = targets[keep], relations[keep], roots[keep]
+    orders = np.array([entity_roots[root][0] for root in roots.tolist()], dtype=np.int64)
+    sort = np.lexsort((targets, relations, orders))
+    entities = np.array([entity_roots[root][1] for root in roots[sort].tolist()], dtype=object)
+    return ColumnarResult({'entity': entities, 'relation': orth[relations[sort]], 'target': orth[targets[sort]]},
+                          doc.vocab.strings, ('relation', 'target'))
+
+def extract_relationships(text, language, doc=None):
     """
     Extrai relações semânticas entre entidades.
     
     Parâmetros:
         text (str): O texto a ser analisado.
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
     
     Retorna:
-        list: Lista de relações entre entidades.
+        ColumnarResult: Linhas (entidade, relação, entidade), armazenadas por colunas.
     """
     try:
         logging.info("Iniciando extração de relações semânticas.")
         print("Iniciando extração de relações semânticas.")
-        nlp = load_spacy_model(language)
-        doc = nlp(text)
-        relationships = []
-        for ent in doc.ents:
-            for token in ent.root.head.children:
-                if token.dep_ in ('prep', 'agent') and token.head == ent.root:
-                    for child in token.children:
-                        if child.ent_type_:
-                            relationships.append((ent.text, token.text, child.text))
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        relationships = _relationship_columns(doc)
         logging.info(f"Relações extraídas: {relationships[:10]}...")  # Log parcial
         print(f"Relações extraídas: {relationships[:10]}...")  # Print parcial
         return relationships
     except Exception as e:
         logging.error(f"Erro na extração de relações semânticas: {str(e)}")
         print(f"Erro na extração de relações semânticas: {str(e)}")
-        return []
+        return ColumnarResult.empty(('entity', 'relation', 'target'), ('relation', 'target'))
 
-def lda_topic_modeling(tokens, language, num_topics=5, passes=10):
+def lda_topic_modeling(tokens, language, num_topics=5, passes=10, token_corpus=None):
     """
     Realiza modelagem de tópicos utilizando LDA.
     
@@ -236,6 +454,8 @@ def lda_topic_modeling(tokens, language, num_topics=5, passes=10):
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
         num_topics (int): Número de tópicos a serem identificados.
         passes (int): Número de passes pelo corpus durante o treinamento.
+        token_corpus (TokenCorpus, opcional): Corpus de ids já construído (em memória ou mapeado em disco);
+            se informado, é lido em streaming como bag-of-words no lugar de tokens.
     
     Retorna:
         list: Lista de tópicos identificados.
@@ -245,9 +465,13 @@ def lda_topic_modeling(tokens, language, num_topics=5, passes=10):
         print("Iniciando modelagem de tópicos com LDA.")
         from gensim import corpora, models
 
-        dictionary = corpora.Dictionary([tokens])
-        corpus = [dictionary.doc2bow(tokens)]
-        lda_model = models.LdaModel(corpus, num_topics=num_topics, id2word=dictionary, passes=passes)
+        if token_corpus is not None:
+            corpus = token_corpus.bow_corpus()
+            id2word = token_corpus.id2word()
+        else:
+            id2word = corpora.Dictionary([tokens])
+            corpus = [id2word.doc2bow(tokens)]
+        lda_model = models.LdaModel(corpus, num_topics=num_topics, id2word=id2word, passes=passes)
         topics = lda_model.print_topics(num_words=5)
         logging.info(f"Tópicos extraídos: {topics}")
         print(f"Tópicos extraídos: {topics}")
@@ -257,37 +481,382 @@ def lda_topic_modeling(tokens, language, num_topics=5, passes=10):
         print(f"Erro na modelagem de tópicos: {str(e)}")
         return []
 
-def sentiment_analysis(text, language):
+# Léxico de sentimento em português (valência de -4 a 4, na mesma escala do VADER)
+PT_SENTIMENT_LEXICON = {
+    'bom': 1.9, 'boa': 1.9, 'bons': 1.9, 'boas': 1.9, 'ótimo': 3.1, 'ótima': 3.1, 'excelente': 3.3,
+    'excelentes': 3.3, 'maravilhoso': 3.2, 'maravilhosa': 3.2, 'perfeito': 2.9, 'perfeita': 2.9,
+    'positivo': 2.0, 'positiva': 2.0, 'eficiente': 1.9, 'eficientes': 1.9, 'eficaz': 1.9, 'eficazes': 1.9,
+    'sucesso': 2.7, 'sucessos': 2.7, 'satisfeito': 1.8, 'satisfeita': 1.8, 'satisfação': 2.0,
+    'feliz': 2.7, 'felizes': 2.7, 'alegria': 2.8, 'gostar': 1.7, 'gosto': 1.6, 'gostei': 1.8,
+    'adorar': 2.6, 'adoro': 2.6, 'amor': 3.0, 'melhor': 2.0, 'melhores': 2.0, 'melhoria': 1.8,
+    'melhorias': 1.8, 'melhorar': 1.5, 'ganho': 1.6, 'ganhos': 1.6, 'benefício': 1.9, 'benefícios': 1.9,
+    'vantagem': 1.7, 'vantagens': 1.7, 'seguro': 1.3, 'segura': 1.3, 'segurança': 1.4, 'confiável': 1.9,
+    'qualidade': 1.5, 'agradável': 2.0, 'útil': 1.6, 'úteis': 1.6, 'fácil': 1.5, 'fáceis': 1.5,
+    'rápido': 1.2, 'rápida': 1.2, 'claro': 1.0, 'clara': 1.0, 'adequado': 1.2, 'adequada': 1.2,
+    'aprovado': 1.6, 'aprovada': 1.6, 'recomendo': 2.1, 'parabéns': 2.6, 'obrigado': 1.7, 'obrigada': 1.7,
+    'conquista': 2.3, 'inovador': 1.9, 'inovadora': 1.9, 'estável': 1.0, 'correto': 1.2, 'correta': 1.2,
+    'ruim': -2.1, 'ruins': -2.1, 'péssimo': -3.1, 'péssima': -3.1, 'horrível': -3.0, 'terrível': -3.0,
+    'negativo': -2.0, 'negativa': -2.0, 'problema': -1.7, 'problemas': -1.7, 'falha': -1.9, 'falhas': -1.9,
+    'erro': -1.8, 'erros': -1.8, 'defeito': -1.9, 'defeitos': -1.9, 'fracasso': -2.7, 'prejuízo': -2.2,
+    'prejuízos': -2.2, 'perda': -1.9, 'perdas': -1.9, 'risco': -1.3, 'riscos': -1.3, 'atraso': -1.6,
+    'atrasos': -1.6, 'atrasado': -1.6, 'atrasada': -1.6, 'difícil': -1.3, 'difíceis': -1.3,
+    'lento': -1.3, 'lenta': -1.3, 'insatisfeito': -1.9, 'insatisfeita': -1.9, 'insatisfação': -2.0,
+    'triste': -2.1, 'tristeza': -2.3, 'raiva': -2.7, 'ódio': -3.2, 'odeio': -3.2, 'medo': -2.0,
+    'pior': -2.3, 'piores': -2.3, 'piorar': -1.9, 'grave': -1.9, 'graves': -1.9, 'crítico': -1.5,
+    'crítica': -1.5, 'críticas': -1.5, 'reclamação': -1.7, 'reclamações': -1.7, 'inadequado': -1.6,
+    'inadequada': -1.6, 'ineficiente': -1.8, 'ineficaz': -1.8, 'inseguro': -1.6, 'insegura': -1.6,
+    'perigoso': -2.2, 'perigosa': -2.2, 'acidente': -2.1, 'acidentes': -2.1, 'crise': -2.2,
+    'reprovado': -1.8, 'reprovada': -1.8, 'confuso': -1.4, 'confusa': -1.4, 'inaceitável': -2.6,
+    'lamentável': -2.2, 'infelizmente': -1.8, 'fraude': -2.8, 'multa': -1.5, 'multas': -1.5,
+    'dano': -2.0, 'danos': -2.0, 'dificuldade': -1.5, 'dificuldades': -1.5, 'deficiente': -1.7,
+}
+PT_NEGATIONS = {'não', 'nunca', 'jamais', 'nem', 'nenhum', 'nenhuma', 'sem'}
+# Modificadores de intensidade (incremento absoluto na valência, como no VADER)
+PT_BOOSTERS = {'muito': 0.293, 'muita': 0.293, 'muitos': 0.293, 'muitas': 0.293, 'extremamente': 0.293,
+               'bastante': 0.293, 'totalmente': 0.293, 'super': 0.293, 'pouco': -0.293, 'pouca': -0.293,
+               'levemente': -0.293, 'meio': -0.293}
+SENTIMENT_MODES = ('transformer', 'lexicon', 'tiered')
+# Faixa de incerteza do score composto do léxico; sentenças dentro dela vão para o transformer
+SENTIMENT_UNCERTAINTY_BAND = (-0.5, 0.5)
+SENTENCE_SPLIT_PATTERN = re.compile(r'(?<=[.!?;])\s+|\n+')
+
+
+@lru_cache(maxsize=None)
+def _get_sentiment_pipeline(language):
+    """
+    Carrega o pipeline de sentimento do transformers uma única vez por processo e idioma.
+    """
+    if language == 'pt':
+        return pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment")
+    return pipeline("sentiment-analysis")
+
+
+@lru_cache(maxsize=None)
+def _get_vader():
+    """
+    Carrega o analisador VADER do NLTK uma única vez por processo.
+    """
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+@lru_cache(maxsize=None)
+def _get_spellchecker(language):
+    """
+    Carrega o dicionário do corretor ortográfico uma única vez por processo e idioma.
+    """
+    return SpellChecker(language=language)
+
+
+def _lexicon_scores_pt(sentences):
+    """
+    Calcula o score composto (-1 a 1) de cada sentença com o léxico em português.
+
+    As valências das palavras são somadas com tratamento de intensificadores e de negação
+    (nas três palavras anteriores) e normalizadas como no VADER: x / sqrt(x² + 15).
+    Os tokens de todas as sentenças são processados de uma vez: o léxico é consultado só para
+    as palavras distintas, e as regras de contexto e a soma por sentença são operações vetorizadas.
+
+    Retorna:
+        tuple: (numpy.ndarray de scores, numpy.ndarray booleano indicando sentenças com palavras do léxico).
+    """
+    n = len(sentences)
+    tokenized = [re.findall(r'[^\W\d_]+', sentence.lower()) for sentence in sentences]
+    lengths = np.fromiter((len(words) for words in tokenized), dtype=np.int64, count=n)
+    if not lengths.sum():
+        return np.zeros(n), np.zeros(n, dtype=bool)
+    sentence_index = np.repeat(np.arange(n), lengths)
+    word_ids = {}
+    inverse = np.fromiter((word_ids.setdefault(w, len(word_ids)) for words in tokenized for w in words),
+                          dtype=np.int64, count=int(lengths.sum()))
+    unique_words = list(word_ids)
+    valence = np.array([PT_SENTIMENT_LEXICON.get(w, 0.0) for w in unique_words])[inverse]
+    booster = np.array([PT_BOOSTERS.get(w, 0.0) for w in unique_words])[inverse]
+    negation = np.array([w in PT_NEGATIONS for w in unique_words])[inverse]
+
+    # Contexto das três palavras anteriores, sem atravessar o limite da sentença
+    negated = np.zeros(len(valence), dtype=bool)
+    for offset in (1, 2, 3):
+        same_sentence = sentence_index[offset:] == sentence_index[:-offset]
+        negated[offset:] |= negation[:-offset] & same_sentence
+        if offset == 1:
+            valence[1:] += np.where(same_sentence, booster[:-1], 0.0) * np.sign(valence[1:])
+    valence = np.where(negated, valence * -0.74, valence)
+
+    totals = np.bincount(sentence_index, weights=valence, minlength=n)
+    has_hits = np.bincount(sentence_index, weights=valence != 0, minlength=n) > 0
+    return totals / np.sqrt(totals ** 2 + 15), has_hits
+
+
+def _lexicon_scores(sentences, language):
+    """
+    Score composto do léxico (VADER para inglês, léxico embutido para português) por sentença.
+    """
+    if language == 'en':
+        vader = _get_vader()
+        scores = np.array([vader.polarity_scores(s)['compound'] for s in sentences])
+        return scores, scores != 0
+    return _lexicon_scores_pt(sentences)
+
+
+def _transformer_polarity(result):
+    """
+    Converte a saída do pipeline do transformers em polaridade de -1 a 1.
+
+    Aceita os rótulos POSITIVE/NEGATIVE (inglês) e '1 star' a '5 stars' (modelo multilíngue).
+    """
+    label = result['label'].upper()
+    if label.startswith('POS'):
+        return result['score']
+    if label.startswith('NEG'):
+        return -result['score']
+    stars = re.match(r'(\d)', label)
+    return (int(stars.group(1)) - 3) / 2 if stars else 0.0
+
+
+def _polarity_label(score):
+    """
+    Rótulo de sentimento para uma polaridade, com os limiares usuais do VADER (±0,05).
+    """
+    if score >= 0.05:
+        return 'positive'
+    if score <= -0.05:
+        return 'negative'
+    return 'neutral'
+
+
+def _split_sentences(text):
+    """
+    Divide o texto nas sentenças usadas pela análise de sentimento.
+    """
+    return [s.strip() for s in SENTENCE_SPLIT_PATTERN.split(text) if s and s.strip()]
+
+
+def _sentence_rows(sentences, polarity, escalate):
+    """
+    Linhas do sentimento por sentença: 'text', 'score', 'label' e 'escalated'.
+    """
+    escalated = set(int(i) for i in escalate)
+    return [{'text': sentence, 'score': round(float(score), 4), 'label': _polarity_label(score),
+             'escalated': i in escalated}
+            for i, (sentence, score) in enumerate(zip(sentences, polarity))]
+
+
+def _score_sentences(text, language, mode, band, batch_size):
+    """
+    Polaridade de cada sentença pelo léxico e, no modo 'tiered', pelo transformer nas sentenças incertas.
+
+    Só as sentenças com palavras do léxico e score dentro da faixa de incerteza são reavaliadas
+    pelo transformer, em lotes.
+
+    Retorna:
+        tuple: (sentenças, polaridades, índices escalonados, concordância léxico/transformer ou None,
+        falha do escalonamento ou None). A falha é um dict com 'candidates' (sentenças que seriam
+        escalonadas) e 'error', quando o transformer não pôde ser usado.
+    """
+    sentences = _split_sentences(text)
+    if not sentences:
+        return [], np.zeros(0), [], None, None
+    scores, has_hits = _lexicon_scores(sentences, language)
+    polarity = scores.copy()
+
+    escalate = np.flatnonzero(has_hits & (scores > band[0]) & (scores < band[1])) if mode == 'tiered' else []
+    agreement = failure = None
+    if len(escalate):
+        try:
+            results = _get_sentiment_pipeline(language)([sentences[i] for i in escalate],
+                                                        batch_size=batch_size, truncation=True)
+            transformer = np.array([_transformer_polarity(r) for r in results])
+            polarity[escalate] = transformer
+            agreement = float(np.mean([_polarity_label(a) == _polarity_label(b)
+                                       for a, b in zip(scores[escalate], transformer)]))
+        except Exception as e:
+            # Sem o transformer, as sentenças incertas mantêm o score do léxico
+            logging.warning(f"Transformer indisponível, usando apenas o léxico: {str(e)}")
+            print(f"Transformer indisponível, usando apenas o léxico: {str(e)}")
+            failure = {'candidates': len(escalate), 'error': str(e)}
+            escalate = []
+    return sentences, polarity, escalate, agreement, failure
+
+
+def _tiered_sentiment(text, language, mode, band, batch_size):
+    """
+    Sentimento do documento inteiro a partir dos scores por sentença (modos 'lexicon' e 'tiered').
+
+    A polaridade do documento é a média das sentenças ponderada pelo comprimento.
+
+    Retorna:
+        tuple: (resultado do documento, linhas do sentimento por sentença).
+    """
+    sentences, polarity, escalate, agreement, failure = _score_sentences(text, language, mode, band, batch_size)
+    if not sentences:
+        return {'label': 'neutral', 'score': 0.0, 'mode': mode, 'sentences': 0}, []
+
+    weights = np.array([len(s) for s in sentences], dtype=float)
+    document_score = float(np.average(polarity, weights=weights))
+    result = {
+        'label': _polarity_label(document_score),
+        'score': round(document_score, 4),
+        'mode': mode,
+        'sentences': len(sentences),
+    }
+    if mode == 'tiered':
+        result['escalated'] = len(escalate)
+        result['escalation_rate'] = round(len(escalate) / len(sentences), 4)
+        result['agreement'] = None if agreement is None else round(agreement, 4)
+        if failure:
+            # As sentenças incertas ficaram com o score do léxico; o resultado informa a tentativa
+            result['escalation_failed'] = failure['candidates']
+            result['escalation_error'] = failure['error']
+    return result, _sentence_rows(sentences, polarity, escalate)
+
+
+def sentence_sentiments(text, language, mode='lexicon', band=SENTIMENT_UNCERTAINTY_BAND, batch_size=16):
+    """
+    Calcula o sentimento de cada sentença do texto.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        mode (str): 'lexicon' ou 'tiered' (ver sentiment_analysis).
+        band (tuple): Faixa de incerteza do score do léxico usada no modo 'tiered'.
+        batch_size (int): Tamanho dos lotes enviados ao transformer.
+
+    Retorna:
+        list: Lista de dicionários com 'text', 'score' (-1 a 1), 'label' e 'escalated' (avaliada pelo transformer).
+    """
+    try:
+        logging.info("Calculando sentimento por sentença.")
+        print("Calculando sentimento por sentença.")
+        if language not in ('en', 'pt'):
+            logging.warning("Idioma não suportado para análise de sentimento.")
+            print("Idioma não suportado para análise de sentimento.")
+            return []
+        sentences, polarity, escalate, _, _ = _score_sentences(text, language, mode, band, batch_size)
+        return _sentence_rows(sentences, polarity, escalate)
+    except Exception as e:
+        logging.error(f"Erro no sentimento por sentença: {str(e)}")
+        print(f"Erro no sentimento por sentença: {str(e)}")
+        return []
+
+
+def sentiment_analysis(text, language, mode='transformer', band=SENTIMENT_UNCERTAINTY_BAND, batch_size=16,
+                       with_sentences=False):
     """
     Realiza análise de sentimento no texto.
     
     Parâmetros:
         text (str): O texto a ser analisado.
         language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        mode (str): 'transformer' (trecho inicial do texto no modelo BERT), 'lexicon' (todas as sentenças
+            no léxico: VADER para inglês, léxico embutido para português) ou 'tiered' (léxico, com
+            escalonamento para o transformer das sentenças incertas).
+        band (tuple): Faixa de incerteza do score do léxico usada no modo 'tiered'.
+        batch_size (int): Tamanho dos lotes enviados ao transformer.
+        with_sentences (bool): Retorna também o sentimento por sentença calculado nesta mesma passagem.
     
     Retorna:
-        dict: Resultado da análise de sentimento.
+        dict: Resultado da análise de sentimento. No modo 'transformer', o rótulo e o score são os do
+            modelo; nos modos 'lexicon' e 'tiered', o rótulo é 'positive', 'negative' ou 'neutral' e o
+            score é a polaridade (-1 a 1), e o resultado inclui o número de sentenças e, no modo 'tiered',
+            a taxa de escalonamento e a concordância léxico/transformer.
+            Com with_sentences, retorna a tupla (resultado, sentenças), no formato de sentence_sentiments;
+            no modo 'transformer', que avalia só o trecho inicial, as sentenças não têm score nem rótulo.
     """
     try:
-        logging.info("Iniciando análise de sentimento.")
+        logging.info(f"Iniciando análise de sentimento (modo {mode}).")
         print("Iniciando análise de sentimento.")
-        if language == 'en':
-            sentiment_pipeline = pipeline("sentiment-analysis")
-        elif language == 'pt':
-            sentiment_pipeline = pipeline("sentiment-analysis", model="nlptown/bert-base-multilingual-uncased-sentiment")
-        else:
+        if language not in ('en', 'pt'):
             logging.warning("Idioma não suportado para análise de sentimento.")
             print("Idioma não suportado para análise de sentimento.")
-            return {'label': 'neutral', 'score': 0.0}
-        
-        sentiment = sentiment_pipeline(text[:512])[0]  # Limitar a 512 tokens para evitar erros
+            return ({'label': 'neutral', 'score': 0.0}, []) if with_sentences else {'label': 'neutral', 'score': 0.0}
+        if mode not in SENTIMENT_MODES:
+            raise ValueError(f"Modo de análise de sentimento inválido: {mode}")
+
+        if mode == 'transformer':
+            result = _get_sentiment_pipeline(language)(text[:512])[0]  # Limitar a 512 tokens para evitar erros
+            # Rótulo e confiança do próprio modelo ('POSITIVE'/'NEGATIVE' ou '1 star' a '5 stars')
+            sentiment = {'label': result['label'], 'score': result['score'], 'mode': mode}
+            sentences = [{'text': sentence, 'score': None, 'label': None, 'escalated': False}
+                         for sentence in _split_sentences(text)] if with_sentences else []
+        else:
+            sentiment, sentences = _tiered_sentiment(text, language, mode, band, batch_size)
         logging.info(f"Resultado da análise de sentimento: {sentiment}")
         print(f"Resultado da análise de sentimento: {sentiment}")
-        return sentiment
+        return (sentiment, sentences) if with_sentences else sentiment
     except Exception as e:
         logging.error(f"Erro na análise de sentimento: {str(e)}")
         print(f"Erro na análise de sentimento: {str(e)}")
-        return {'label': 'neutral', 'score': 0.0}
+        return ({'label': 'neutral', 'score': 0.0}, []) if with_sentences else {'label': 'neutral', 'score': 0.0}
+
+def sentiment_by_segment(segments, mode='transformer', band=SENTIMENT_UNCERTAINTY_BAND, batch_size=16):
+    """
+    Realiza a análise de sentimento de um documento segmentado por idioma.
+
+    Cada segmento é avaliado com o modelo ou o léxico do seu idioma. Nos modos 'lexicon' e 'tiered',
+    a polaridade do documento é a média das sentenças de todos os segmentos ponderada pelo comprimento,
+    como em um documento de um só idioma. O modo 'transformer' avalia o trecho inicial do texto, que
+    fica no primeiro segmento.
+
+    Parâmetros:
+        segments (list): Segmentos com 'text' e 'language' (ver preprocessing.segment_by_language).
+        mode (str): 'transformer', 'lexicon' ou 'tiered' (ver sentiment_analysis).
+        band (tuple): Faixa de incerteza do score do léxico usada no modo 'tiered'.
+        batch_size (int): Tamanho dos lotes enviados ao transformer.
+
+    Retorna:
+        tuple: (resultado do documento, sentenças de todos os segmentos), como sentiment_analysis
+            com with_sentences.
+    """
+    if len(segments) == 1:
+        return sentiment_analysis(segments[0]['text'], segments[0]['language'], mode, band, batch_size,
+                                  with_sentences=True)
+    try:
+        if mode == 'transformer':
+            sentiment, sentences = sentiment_analysis(segments[0]['text'], segments[0]['language'], mode, band,
+                                                      batch_size, with_sentences=True)
+            sentences = sentences + [{'text': sentence, 'score': None, 'label': None, 'escalated': False}
+                                     for segment in segments[1:] for sentence in _split_sentences(segment['text'])]
+            return sentiment, sentences
+
+        results, sentences, weights = [], [], []
+        for segment in segments:
+            result, rows = sentiment_analysis(segment['text'], segment['language'], mode, band, batch_size,
+                                              with_sentences=True)
+            results.append(result)
+            sentences.extend(rows)
+            weights.append(sum(len(row['text']) for row in rows))
+        if not sum(weights):
+            return {'label': 'neutral', 'score': 0.0, 'mode': mode, 'sentences': 0}, []
+
+        document_score = float(np.average([result['score'] for result in results], weights=weights))
+        sentiment = {
+            'label': _polarity_label(document_score),
+            'score': round(document_score, 4),
+            'mode': mode,
+            'sentences': len(sentences),
+        }
+        if mode == 'tiered':
+            escalated = sum(result.get('escalated', 0) for result in results)
+            sentiment['escalated'] = escalated
+            sentiment['escalation_rate'] = round(escalated / len(sentences), 4)
+            # Concordância dos segmentos ponderada pelo número de sentenças escalonadas em cada um
+            agreements = [(result['agreement'], result['escalated']) for result in results
+                          if result.get('agreement') is not None]
+            sentiment['agreement'] = (round(float(np.average([a for a, _ in agreements],
+                                                             weights=[n for _, n in agreements])), 4)
+                                      if agreements else None)
+            failed = [result for result in results if 'escalation_failed' in result]
+            if failed:
+                sentiment['escalation_failed'] = sum(result['escalation_failed'] for result in failed)
+                sentiment['escalation_error'] = failed[-1]['escalation_error']
+        logging.info(f"Resultado da análise de sentimento por segmento: {sentiment}")
+        print(f"Resultado da análise de sentimento por segmento: {sentiment}")
+        return sentiment, sentences
+    except Exception as e:
+        logging.error(f"Erro na análise de sentimento por segmento: {str(e)}")
+        print(f"Erro na análise de sentimento por segmento: {str(e)}")
+        return {'label': 'neutral', 'score': 0.0}, []
 
 def analyze_connectors(text, language):
     """
@@ -346,7 +915,7 @@ def spelling_correction(text, language):
     try:
         logging.info("Iniciando correção ortográfica.")
         print("Iniciando correção ortográfica.")
-        spell = SpellChecker(language=language)
+        spell = _get_spellchecker(language)
         words = word_tokenize(text, language='english' if language == 'en' else 'portuguese')
         
         # Lista de stopwords e palavras a serem ignoradas
@@ -401,6 +970,21 @@ def spelling_correction(text, language):
         print(f"Erro na correção ortográfica: {str(e)}")
         return {}
 
+def spelling_correction_by_segment(segments):
+    """
+    Corrige erros ortográficos de um documento segmentado por idioma, com o dicionário de cada segmento.
+
+    Parâmetros:
+        segments (list): Segmentos com 'text' e 'language' (ver preprocessing.segment_by_language).
+
+    Retorna:
+        dict: Dicionário com palavras incorretas e suas sugestões de correção, de todos os segmentos.
+    """
+    corrections = {}
+    for segment in segments:
+        corrections.update(spelling_correction(segment['text'], segment['language']))
+    return corrections
+
 def readability_scores(text, language):
     """
     Calcula os índices de legibilidade Flesch Reading Ease e Flesch-Kincaid Grade para inglês
@@ -474,3 +1058,431 @@ def readability_scores(text, language):
             'flesch_kincaid_grade': 0,
             'fernandez_huerta_adjusted': 0
         }
+
+# Padrões do DependencyMatcher para ações e responsáveis. Os papéis usados pelo extrator são:
+# 'action' (núcleo da ação), 'object' (complemento da ação) e 'responsible' (quem executa).
+# Rótulos de dependência: UD para o modelo em português e ClearNLP para o modelo em inglês.
+ACTION_PATTERNS = {
+    'pt': {
+        # Sujeito-verbo-objeto: "O gerente aprova o documento."
+        'svo': [
+            {'RIGHT_ID': 'action', 'RIGHT_ATTRS': {'POS': 'VERB'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'nsubj'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'object', 'RIGHT_ATTRS': {'DEP': 'obj'}},
+        ],
+        # Voz passiva com agente: "O documento é aprovado pelo gerente."
+        'passive_agent': [
+            {'RIGHT_ID': 'action', 'RIGHT_ATTRS': {'POS': 'VERB'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'object', 'RIGHT_ATTRS': {'DEP': 'nsubj:pass'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'obl:agent'}},
+        ],
+        # "O gerente é responsável pela aprovação do documento."
+        'responsible_for': [
+            {'RIGHT_ID': 'anchor', 'RIGHT_ATTRS': {'LOWER': {'IN': ['responsável', 'responsáveis']}}},
+            {'LEFT_ID': 'anchor', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'nsubj'}},
+            {'LEFT_ID': 'anchor', 'REL_OP': '>', 'RIGHT_ID': 'action',
+             'RIGHT_ATTRS': {'DEP': {'IN': ['obl', 'nmod', 'xcomp', 'advcl', 'acl']}}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'marker',
+             'RIGHT_ATTRS': {'LOWER': {'IN': ['por', 'pela', 'pelo', 'pelas', 'pelos']}}},
+        ],
+    },
+    'en': {
+        # Subject-verb-object: "The manager approves the document."
+        'svo': [
+            {'RIGHT_ID': 'action', 'RIGHT_ATTRS': {'POS': 'VERB'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'nsubj'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'object', 'RIGHT_ATTRS': {'DEP': 'dobj'}},
+        ],
+        # Passive with agent: "The document is approved by the manager."
+        'passive_agent': [
+            {'RIGHT_ID': 'action', 'RIGHT_ATTRS': {'POS': 'VERB'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'object', 'RIGHT_ATTRS': {'DEP': 'nsubjpass'}},
+            {'LEFT_ID': 'action', 'REL_OP': '>', 'RIGHT_ID': 'agent', 'RIGHT_ATTRS': {'DEP': 'agent'}},
+            {'LEFT_ID': 'agent', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'pobj'}},
+        ],
+        # "The manager is responsible for approving the budget."
+        'responsible_for': [
+            {'RIGHT_ID': 'anchor', 'RIGHT_ATTRS': {'LOWER': 'responsible'}},
+            {'LEFT_ID': 'anchor', 'REL_OP': '>', 'RIGHT_ID': 'marker', 'RIGHT_ATTRS': {'LOWER': 'for'}},
+            {'LEFT_ID': 'marker', 'REL_OP': '>', 'RIGHT_ID': 'action', 'RIGHT_ATTRS': {'DEP': {'IN': ['pobj', 'pcomp']}}},
+            {'LEFT_ID': 'anchor', 'REL_OP': '<', 'RIGHT_ID': 'copula', 'RIGHT_ATTRS': {}},
+            {'LEFT_ID': 'copula', 'REL_OP': '>', 'RIGHT_ID': 'responsible', 'RIGHT_ATTRS': {'DEP': 'nsubj'}},
+        ],
+    }
+}
+
+# Matchers compilados, indexados por (idioma, id do vocabulário); o matcher mantém a referência ao vocabulário
+_ACTION_MATCHERS = {}
+
+
+def _get_action_matcher(vocab, language):
+    """
+    Retorna o DependencyMatcher de ações do idioma, compilando-o apenas na primeira chamada.
+
+    Parâmetros:
+        vocab (spacy.vocab.Vocab): Vocabulário do modelo que produziu os Docs.
+        language (str): Idioma ('en' ou 'pt').
+
+    Retorna:
+        tuple: (DependencyMatcher, dict com os papéis de cada padrão indexados pelo match_id).
+    """
+    key = (language, id(vocab))
+    if key not in _ACTION_MATCHERS:
+        from spacy.matcher import DependencyMatcher
+        matcher = DependencyMatcher(vocab)
+        roles = {}
+        for name, pattern in ACTION_PATTERNS[language].items():
+            matcher.add(name, [pattern])
+            roles[vocab.strings[name]] = [node['RIGHT_ID'] for node in pattern]
+        _ACTION_MATCHERS[key] = (matcher, roles)
+    return _ACTION_MATCHERS[key]
+
+
+def _subtree_text(doc, token, skip=()):
+    """
+    Retorna o texto da subárvore de um token, omitindo os tokens indicados (ex.: preposições).
+    """
+    span = doc[token.left_edge.i:token.right_edge.i + 1]
+    return ''.join(t.text_with_ws for t in span if t.i not in skip).strip()
+
+
+def iter_actions_and_responsibles(doc, language):
+    """
+    Percorre um Doc já analisado e gera as ações encontradas pelos padrões de dependência.
+
+    Parâmetros:
+        doc (spacy.tokens.Doc): Documento analisado com o parser de dependências.
+        language (str): Idioma do documento ('en' ou 'pt').
+
+    Retorna:
+        generator: Dicionários com 'action', 'responsible', 'pattern', 'start' e 'end' (offsets de caracteres).
+    """
+    if language not in ACTION_PATTERNS or not doc.has_annotation("DEP"):
+        return
+    matcher, roles = _get_action_matcher(doc.vocab, language)
+    seen = set()
+    for match_id, token_ids in sorted(matcher(doc), key=lambda m: min(m[1])):
+        tokens = dict(zip(roles[match_id], (doc[i] for i in token_ids)))
+        action_token = tokens['action']
+        # Preposições que introduzem a tarefa ou o agente ("pela", "pelo") não fazem parte do texto
+        skip = {t.i for t in tokens['responsible'].children if t.dep_ == 'case'}
+        if 'marker' in tokens:
+            skip.add(tokens['marker'].i)
+        if 'object' in tokens:
+            action = f"{action_token.lemma_ or action_token.text} {_subtree_text(doc, tokens['object'])}"
+        else:
+            action = _subtree_text(doc, action_token, skip)
+        responsible = _subtree_text(doc, tokens['responsible'], skip)
+        if (action, responsible) in seen:
+            continue
+        seen.add((action, responsible))
+        span_start = min(doc[i].idx for i in token_ids)
+        span_end = max(doc[i].idx + len(doc[i]) for i in token_ids)
+        yield {
+            'action': action,
+            'responsible': responsible,
+            'pattern': doc.vocab.strings[match_id],
+            'start': span_start,
+            'end': span_end
+        }
+
+
+def extract_actions_and_responsibles(text, language, doc=None):
+    """
+    Mapeia ações e seus responsáveis a partir da análise de dependências.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
+
+    Retorna:
+        list: Lista de dicionários com 'action' e 'responsible' (além de 'pattern', 'start' e 'end').
+    """
+    try:
+        logging.info("Iniciando extração de ações e responsáveis.")
+        print("Iniciando extração de ações e responsáveis.")
+        if language not in ACTION_PATTERNS:
+            logging.warning("Idioma não suportado para extração de ações.")
+            print("Idioma não suportado para extração de ações.")
+            return []
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        actions = list(iter_actions_and_responsibles(doc, language))
+        logging.info(f"Ações extraídas: {actions[:10]}...")  # Log parcial
+        print(f"Ações extraídas: {actions[:10]}...")  # Print parcial
+        return actions
+    except Exception as e:
+        logging.error(f"Erro na extração de ações e responsáveis: {str(e)}")
+        print(f"Erro na extração de ações e responsáveis: {str(e)}")
+        return []
+
+
+def extract_actions_from_corpus(texts, language, batch_size=64, n_process=1):
+    """
+    Extrai ações e responsáveis de vários textos em uma única passada do nlp.pipe.
+
+    Parâmetros:
+        texts (iterable): Textos a serem analisados.
+        language (str): O idioma dos textos ('en' ou 'pt').
+        batch_size (int): Tamanho do lote repassado ao nlp.pipe.
+        n_process (int): Número de processos do nlp.pipe.
+
+    Retorna:
+        generator: Uma lista de ações para cada texto, na ordem de entrada.
+    """
+    nlp = load_spacy_model(language)
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield list(iter_actions_and_responsibles(doc, language))
+
+# Rótulos de sujeito nos esquemas UD (português) e ClearNLP (inglês)
+SUBJECT_DEPS = {'nsubj', 'nsubj:pass', 'nsubjpass', 'csubj'}
+# Auxiliares e cópulas que podem carregar a flexão do verbo
+FINITE_CHILD_DEPS = {'aux', 'aux:pass', 'auxpass', 'cop'}
+
+
+def _finite_verb(head):
+    """
+    Retorna o token que carrega a flexão verbal de uma oração (o próprio verbo, auxiliar ou cópula).
+
+    Parâmetros:
+        head (spacy.tokens.Token): Núcleo da oração (verbo ou predicativo).
+
+    Retorna:
+        spacy.tokens.Token or None: Token com VerbForm=Fin, ou None se não houver.
+    """
+    candidates = [head] + [child for child in head.children if child.dep_ in FINITE_CHILD_DEPS]
+    for token in candidates:
+        if 'Fin' in token.morph.get('VerbForm'):
+            return token
+    return None
+
+
+def _subject_features(subject):
+    """
+    Obtém número e pessoa gramatical de um sujeito, considerando sujeitos coordenados como plurais.
+
+    Parâmetros:
+        subject (spacy.tokens.Token): Núcleo do sujeito.
+
+    Retorna:
+        tuple: (número, pessoa), cada um podendo ser None quando não determinado.
+    """
+    number = subject.morph.get('Number')
+    number = number[0] if number else None
+    if any(child.dep_ == 'conj' for child in subject.children):
+        number = 'Plur'
+    person = subject.morph.get('Person')
+    if person:
+        person = person[0]
+    elif subject.pos_ in ('NOUN', 'PROPN'):
+        person = '3'
+    else:
+        person = None
+    return number, person
+
+
+def iter_verb_agreement_errors(doc):
+    """
+    Percorre as sentenças de um Doc analisado e gera os erros de concordância entre sujeito e verbo.
+
+    O trabalho é linear no tamanho de cada sentença: apenas os traços morfológicos
+    (token.morph Number/Person) do sujeito e do verbo flexionado são comparados.
+
+    Parâmetros:
+        doc (spacy.tokens.Doc): Documento analisado com parser e morfologia.
+
+    Retorna:
+        generator: Dicionários com 'verb', 'subject', 'error', 'start' e 'end' (offsets da sentença).
+    """
+    for sent in doc.sents:
+        for token in sent:
+            if token.dep_ not in SUBJECT_DEPS or 'Rel' in token.morph.get('PronType'):
+                continue
+            verb = _finite_verb(token.head)
+            if verb is None:
+                continue
+            subject_number, subject_person = _subject_features(token)
+            verb_number = verb.morph.get('Number')
+            verb_person = verb.morph.get('Person')
+            error = None
+            if subject_number and verb_number and subject_number != verb_number[0]:
+                error = ('Concordância incorreta para sujeito singular.' if subject_number == 'Sing'
+                         else 'Concordância incorreta para sujeito plural.')
+            elif subject_person and verb_person and subject_person != verb_person[0]:
+                error = 'Concordância incorreta de pessoa gramatical.'
+            if error:
+                yield {
+                    'verb': verb.text,
+                    'subject': token.text,
+                    'error': error,
+                    'start': sent.start_char,
+                    'end': sent.end_char
+                }
+
+
+def check_verb_agreement(text, language, doc=None):
+    """
+    Verifica a concordância verbal entre sujeitos e verbos do texto.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
+
+    Retorna:
+        list: Lista de dicionários com 'verb', 'subject', 'error', 'start' e 'end'.
+    """
+    try:
+        logging.info("Iniciando verificação de concordância verbal.")
+        print("Iniciando verificação de concordância verbal.")
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        errors = list(iter_verb_agreement_errors(doc))
+        logging.info(f"Erros de concordância encontrados: {len(errors)}")
+        print(f"Erros de concordância encontrados: {len(errors)}")
+        return errors
+    except Exception as e:
+        logging.error(f"Erro na verificação de concordância verbal: {str(e)}")
+        print(f"Erro na verificação de concordância verbal: {str(e)}")
+        return []
+
+
+def _sentence_person(sent, language):
+    """
+    Determina a pessoa gramatical predominante de uma sentença.
+
+    Considera pronomes pessoais sujeitos e, em português, verbos flexionados na 1ª ou 2ª pessoa
+    sem sujeito explícito (sujeito oculto).
+
+    Parâmetros:
+        sent (spacy.tokens.Span): Sentença analisada.
+        language (str): Idioma do texto ('en' ou 'pt').
+
+    Retorna:
+        str or None: '1', '2' ou '3', ou None se a sentença não indicar pessoa gramatical.
+    """
+    for token in sent:
+        if token.dep_ in SUBJECT_DEPS and 'Prs' in token.morph.get('PronType'):
+            person = token.morph.get('Person')
+            if person:
+                return person[0]
+    if language == 'pt':
+        root = sent.root
+        if not any(child.dep_ in SUBJECT_DEPS for child in root.children):
+            verb = _finite_verb(root)
+            person = verb.morph.get('Person') if verb is not None else []
+            if person and person[0] in ('1', '2'):
+                return person[0]
+    return None
+
+
+def iter_sentence_persons(doc, language):
+    """
+    Gera a pessoa gramatical de cada sentença de um Doc que a indique.
+
+    Parâmetros:
+        doc (spacy.tokens.Doc): Documento analisado.
+        language (str): Idioma do documento ('en' ou 'pt').
+
+    Retorna:
+        generator: Dicionários com 'person', 'start' e 'end' (offsets da sentença).
+    """
+    for sent in doc.sents:
+        person = _sentence_person(sent, language)
+        if person:
+            yield {'person': person, 'start': sent.start_char, 'end': sent.end_char}
+
+
+def iter_person_changes(doc, language, sentence_persons=None):
+    """
+    Gera as mudanças de pessoa gramatical entre sentenças consecutivas de um Doc.
+
+    Parâmetros:
+        doc (spacy.tokens.Doc): Documento analisado.
+        language (str): Idioma do documento ('en' ou 'pt').
+        sentence_persons (iterable, opcional): Resultado já calculado de iter_sentence_persons.
+
+    Retorna:
+        generator: Dicionários com 'from', 'to', 'start' e 'end' (offsets da sentença onde ocorre a mudança).
+    """
+    if sentence_persons is None:
+        sentence_persons = iter_sentence_persons(doc, language)
+    previous = None
+    for item in sentence_persons:
+        if previous is not None and item['person'] != previous:
+            yield {'from': previous, 'to': item['person'], 'start': item['start'], 'end': item['end']}
+        previous = item['person']
+
+
+def summarize_person_changes(sentence_persons):
+    """
+    Resume a pessoa gramatical das sentenças no resultado de detect_person_changes.
+
+    Parâmetros:
+        sentence_persons (iterable): Pessoas gramaticais das sentenças (ver iter_sentence_persons).
+
+    Retorna:
+        dict: 'inconsistent_person' (bool), 'persons' (contagem por pessoa) e 'changes' (lista de mudanças).
+    """
+    sentence_persons = list(sentence_persons)
+    persons = {}
+    for item in sentence_persons:
+        persons[item['person']] = persons.get(item['person'], 0) + 1
+    return {
+        'inconsistent_person': len(persons) > 1,
+        'persons': persons,
+        'changes': list(iter_person_changes(None, None, sentence_persons))
+    }
+
+
+def detect_person_changes(text, language, doc=None):
+    """
+    Detecta mudanças de pessoa gramatical ao longo do texto.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): O idioma do texto ('en' para inglês, 'pt' para português).
+        doc (spacy.tokens.Doc, opcional): Documento já analisado; evita rodar o pipeline novamente.
+
+    Retorna:
+        dict: 'inconsistent_person' (bool), 'persons' (contagem por pessoa) e 'changes' (lista de mudanças).
+    """
+    try:
+        logging.info("Iniciando detecção de mudanças de pessoa gramatical.")
+        print("Iniciando detecção de mudanças de pessoa gramatical.")
+        if doc is None:
+            nlp = load_spacy_model(language)
+            doc = nlp(text)
+        result = summarize_person_changes(iter_sentence_persons(doc, language))
+        logging.info(f"Pessoas gramaticais: {result['persons']}, mudanças: {len(result['changes'])}")
+        print(f"Pessoas gramaticais: {result['persons']}, mudanças: {len(result['changes'])}")
+        return result
+    except Exception as e:
+        logging.error(f"Erro na detecção de mudanças de pessoa gramatical: {str(e)}")
+        print(f"Erro na detecção de mudanças de pessoa gramatical: {str(e)}")
+        return {'inconsistent_person': False, 'persons': {}, 'changes': []}
+
+
+def check_grammar_corpus(texts, language, batch_size=64, n_process=1):
+    """
+    Executa as verificações gramaticais sobre vários textos em uma única passada do nlp.pipe.
+
+    Parâmetros:
+        texts (iterable): Textos a serem analisados.
+        language (str): O idioma dos textos ('en' ou 'pt').
+        batch_size (int): Tamanho do lote repassado ao nlp.pipe.
+        n_process (int): Número de processos do nlp.pipe.
+
+    Retorna:
+        generator: Para cada texto, um dicionário com 'verb_agreement_errors' (como check_verb_agreement)
+            e 'person_changes' (como detect_person_changes).
+    """
+    nlp = load_spacy_model(language)
+    for doc in nlp.pipe(texts, batch_size=batch_size, n_process=n_process):
+        yield {
+            'verb_agreement_errors': list(iter_verb_agreement_errors(doc)),
+            'person_changes': summarize_person_changes(iter_sentence_persons(doc, language))
+        }
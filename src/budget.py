@@ -0,0 +1,160 @@
+# src/budget.py
+
+import logging
+import math
+import multiprocessing
+import time
+from workers import child_process_context, process_memory
+
+# Orçamentos padrão (tempo em segundos e memória única adicional do processo, em MB) das
+# análises que podem demorar muito em documentos patológicos
+DEFAULT_BUDGETS = {
+    'spelling_correction': {'seconds': 120, 'memory_mb': 2048},
+    'lda_topic_modeling': {'seconds': 180, 'memory_mb': 2048},
+    'generate_entity_network': {'seconds': 60, 'memory_mb': 1024},
+}
+# Intervalo de verificação do tempo e da memória do processo supervisionado
+POLL_INTERVAL = 0.1
+
+
+class AnalysisCancelled(Exception):
+    """
+    Cancelamento solicitado pelo usuário durante uma análise supervisionada.
+    """
+
+
+def _run_child(conn, func, args, kwargs):
+    # Executado no processo supervisionado: envia (situação, resultado) ao processo principal
+    try:
+        conn.send(('ok', func(*args, **kwargs)))
+    except MemoryError:
+        conn.send(('memory_exceeded', None))
+    except BaseException as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
+
+
+def run_with_budget(func, args=(), kwargs=None, seconds=None, memory_mb=None, cancel_event=None):
+    """
+    Executa uma função em um processo supervisionado, encerrando-o se exceder o orçamento.
+
+    O processo é criado com fork quando o processo atual só tem uma thread (ver workers.child_process_context).
+    A memória é medida como a memória única (USS) do processo, ou seja, as páginas que ele alocou ou
+    alterou. Sem orçamento nem cancel_event, a função é executada no próprio processo, assim como em
+    processos daemon, que não podem criar filhos (os de um multiprocessing.Pool comum; os de
+    workers.PreloadedPool podem), com um aviso no log.
+
+    Parâmetros:
+        func (callable): Função a executar; o resultado deve ser serializável com pickle.
+        args (tuple): Argumentos posicionais.
+        kwargs (dict): Argumentos nomeados.
+        seconds (float): Tempo máximo. None para não limitar.
+        memory_mb (float): Memória única máxima, em MB. None para não limitar.
+        cancel_event (threading.Event): Se for definido durante a execução, o processo é encerrado.
+
+    Retorna:
+        tuple: (situação, resultado). A situação é 'ok', 'timed_out', 'memory_exceeded', 'cancelled' ou
+        'error'; o resultado é None se a situação não for 'ok'.
+    """
+    kwargs = kwargs or {}
+    if seconds is None and memory_mb is None and cancel_event is None:
+        return 'ok', func(*args, **kwargs)
+    if multiprocessing.current_process().daemon:
+        logging.warning(f"Processo daemon não pode criar processos supervisionados; "
+                        f"{getattr(func, '__name__', func)} executada sem orçamento.")
+        return 'ok', func(*args, **kwargs)
+    context = child_process_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_child, args=(sender, func, args, kwargs), daemon=True)
+    start = time.monotonic()
+    process.start()
+    sender.close()
+    status, result = None, None
+    try:
+        while status is None:
+            if receiver.poll(POLL_INTERVAL):
+                try:
+                    status, result = receiver.recv()
+                except EOFError:
+                    status, result = 'error', None
+            elif not process.is_alive():
+                # Encerrado sem resposta (ex.: pelo OOM killer ou por falha no código nativo)
+                status = 'error'
+            elif cancel_event is not None and cancel_event.is_set():
+                status = 'cancelled'
+            elif seconds is not None and time.monotonic() - start > seconds:
+                status = 'timed_out'
+            elif memory_mb is not None:
+                memory = process_memory(process.pid)
+                if memory is not None and memory['uss'] > memory_mb * 2 ** 20:
+                    status = 'memory_exceeded'
+    finally:
+        receiver.close()
+        if process.is_alive():
+            process.terminate()
+            process.join(1)
+            if process.is_alive():
+                process.kill()
+        process.join()
+    if status != 'ok':
+        result = None
+    return status, result
+
+
+def call_with_fallback(name, attempts, budgets=None, default=None, cancel_event=None):
+    """
+    Executa uma análise dentro do seu orçamento, recorrendo a modos mais baratos se ele for excedido.
+
+    Com cancel_event, a análise é sempre executada em um processo supervisionado, que é encerrado
+    assim que o cancelamento é solicitado; nesse caso, lança AnalysisCancelled.
+
+    Parâmetros:
+        name (str): Nome da análise (chave em budgets).
+        attempts (list): Tuplas (modo, função, args, kwargs), da mais completa para a mais barata.
+        budgets (dict): Orçamentos por análise: {'nome': {'seconds': ..., 'memory_mb': ...}}.
+            None usa DEFAULT_BUDGETS; análises sem orçamento são executadas diretamente.
+        default: Resultado usado quando nenhum modo cabe no orçamento.
+        cancel_event (threading.Event): Evento de cancelamento da análise (ver run_with_budget).
+
+    Retorna:
+        tuple: (resultado, modo). O modo é o da tentativa que terminou ('ok' para a primeira) ou a
+        situação da última tentativa ('timed_out', 'memory_exceeded' ou 'error').
+    """
+    budget = (DEFAULT_BUDGETS if budgets is None else budgets).get(name) or {}
+    status = 'ok'
+    for index, (mode, func, args, kwargs) in enumerate(attempts):
+        status, result = run_with_budget(func, args, kwargs, budget.get('seconds'), budget.get('memory_mb'),
+                                         cancel_event)
+        if status == 'cancelled':
+            raise AnalysisCancelled(name)
+        if status == 'ok':
+            return result, 'ok' if index == 0 else mode
+        logging.warning(f"{name} ({mode}) excedeu o orçamento {budget}: {status}.")
+        print(f"{name} ({mode}) excedeu o orçamento: {status}.")
+    return default, status
+
+
+def parse_budget(spec):
+    """
+    Converte a especificação de orçamento da linha de comando ('nome=segundos' ou
+    'nome=segundos:memória_mb') em uma entrada de orçamentos.
+
+    Retorna:
+        tuple: (nome, {'seconds': ..., 'memory_mb': ...}).
+    """
+    name, _, limits = spec.partition('=')
+    seconds, _, memory_mb = limits.partition(':')
+    return name, {'seconds': float(seconds) if seconds else None, 'memory_mb': float(memory_mb) if memory_mb else None}
+
+
+def sample_text(text, max_chars):
+    """
+    Reduz o texto a cerca de max_chars caracteres, mantendo linhas espaçadas uniformemente por todo o documento.
+    """
+    if len(text) <= max_chars:
+        return text
+    lines = text.splitlines()
+    step = math.ceil(len(text) / max_chars)
+    sample = '\n'.join(lines[::step])
+    return sample if len(sample) <= max_chars else sample[:max_chars]
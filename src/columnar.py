@@ -0,0 +1,105 @@
+# src/columnar.py
+
+import numpy as np
+
+
+class ColumnarResult:
+    """
+    Resultado tabular armazenado por colunas (arrays NumPy), com linhas materializadas sob demanda.
+
+    Colunas listadas em string_columns guardam hashes do StringStore do spaCy e só são convertidas
+    em texto quando uma linha é lida. Fatias (ex.: resultado[:20]) são visões sem cópia, de modo que
+    manter apenas o top-k de um documento grande não cria tuplas para todos os tokens.
+    """
+
+    def __init__(self, columns, strings=None, string_columns=()):
+        self.columns = dict(columns)
+        self.strings = strings
+        self.string_columns = set(string_columns)
+        lengths = {len(values) for values in self.columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("Todas as colunas devem ter o mesmo comprimento.")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def empty(cls, names, string_columns=()):
+        """
+        Resultado sem linhas com as colunas informadas (usado nos caminhos de erro dos extratores).
+        """
+        return cls({name: np.zeros(0, dtype=np.uint64) for name in names}, None, string_columns)
+
+    @property
+    def names(self):
+        return list(self.columns)
+
+    def __len__(self):
+        return self._length
+
+    def _decode(self, name, value):
+        if name in self.string_columns:
+            return self.strings[int(value)]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarResult({name: values[index] for name, values in self.columns.items()},
+                                  self.strings, self.string_columns)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("Índice fora do intervalo.")
+        return tuple(self._decode(name, values[index]) for name, values in self.columns.items())
+
+    def __iter__(self):
+        for index in range(self._length):
+            yield self[index]
+
+    def __eq__(self, other):
+        if isinstance(other, (ColumnarResult, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        preview = [self[i] for i in range(min(self._length, 10))]
+        suffix = f", ... ({self._length} linhas)" if self._length > 10 else ""
+        return f"{preview}{suffix}"
+
+    def head(self, n):
+        """
+        Visão das n primeiras linhas (sem cópia).
+        """
+        return self[:n]
+
+    def column(self, name):
+        """
+        Retorna uma coluna decodificada como lista.
+        """
+        values = self.columns[name]
+        if name in self.string_columns:
+            uniques, inverse = np.unique(values, return_inverse=True)
+            decoded = [self.strings[int(value)] for value in uniques]
+            return [decoded[i] for i in inverse]
+        return values.tolist()
+
+    def to_list(self):
+        """
+        Materializa todas as linhas como lista de tuplas.
+        """
+        return list(self)
+
+    def to_arrow(self):
+        """
+        Converte o resultado em uma pyarrow.Table. Colunas de strings viram arrays de dicionário.
+
+        Requer o pacote opcional pyarrow.
+        """
+        import pyarrow as pa
+        arrays = {}
+        for name, values in self.columns.items():
+            if name in self.string_columns:
+                uniques, inverse = np.unique(values, return_inverse=True)
+                dictionary = pa.array([self.strings[int(value)] for value in uniques], type=pa.string())
+                arrays[name] = pa.DictionaryArray.from_arrays(pa.array(inverse.astype(np.int32)), dictionary)
+            else:
+                arrays[name] = pa.array(values)
+        return pa.table(arrays)
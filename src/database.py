@@ -1,8 +1,62 @@
 # src/database.py
 
+import hashlib
 import logging
 import sqlite3
 import os
+from contextlib import contextmanager
+from datetime import datetime
+
+# Espera (em segundos) por outro processo que esteja escrevendo no índice de busca compartilhado
+SEARCH_INDEX_TIMEOUT = 60
+
+SEARCH_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        path TEXT UNIQUE,
+        content_hash TEXT NOT NULL,
+        length INTEGER,
+        indexed_at TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents (content_hash);
+    CREATE TABLE IF NOT EXISTS paragraphs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        document_id INTEGER NOT NULL REFERENCES documents (id),
+        position INTEGER,
+        text TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_paragraphs_document ON paragraphs (document_id);
+    CREATE VIRTUAL TABLE IF NOT EXISTS paragraphs_fts USING fts5 (
+        text, content='paragraphs', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS paragraphs_ai AFTER INSERT ON paragraphs BEGIN
+        INSERT INTO paragraphs_fts (rowid, text) VALUES (new.id, new.text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS paragraphs_ad AFTER DELETE ON paragraphs BEGIN
+        INSERT INTO paragraphs_fts (paragraphs_fts, rowid, text) VALUES ('delete', old.id, old.text);
+    END;
+    CREATE TABLE IF NOT EXISTS document_entities (
+        document_id INTEGER NOT NULL REFERENCES documents (id),
+        entity TEXT,
+        label TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_document_entities_label ON document_entities (label, entity);
+    CREATE INDEX IF NOT EXISTS idx_document_entities_document ON document_entities (document_id);
+    CREATE TABLE IF NOT EXISTS document_keywords (
+        document_id INTEGER NOT NULL REFERENCES documents (id),
+        keyword TEXT,
+        score REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_document_keywords_keyword ON document_keywords (keyword);
+    CREATE INDEX IF NOT EXISTS idx_document_keywords_document ON document_keywords (document_id);
+    CREATE TABLE IF NOT EXISTS document_dates (
+        document_id INTEGER NOT NULL REFERENCES documents (id),
+        text TEXT,
+        date TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_document_dates_date ON document_dates (date);
+    CREATE INDEX IF NOT EXISTS idx_document_dates_document ON document_dates (document_id);
+'''
 
 def store_data_in_database(analysis_results, output_folder):
     """
@@ -114,3 +168,227 @@ def store_data_in_database(analysis_results, output_folder):
     except Exception as e:
         logging.error(f"Erro ao armazenar dados em banco de dados: {str(e)}")
         print(f"Erro ao armazenar dados em banco de dados: {str(e)}")
+
+def _connect_search_index(db_path):
+    """
+    Abre o banco do índice de busca e cria as tabelas e o índice FTS5, se necessário.
+
+    O banco usa o journal padrão (não WAL), que funciona em sistemas de arquivos de rede, onde o
+    índice pode ser compartilhado por processos de trabalho em vários hosts; as escritas concorrentes
+    aguardam pelo timeout e usam transações BEGIN IMMEDIATE (ver _write_transaction).
+    """
+    conn = sqlite3.connect(db_path, timeout=SEARCH_INDEX_TIMEOUT, isolation_level=None)
+    if conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal':
+        # Bancos convertidos para WAL por versões anteriores voltam ao journal padrão, se ninguém os estiver usando
+        try:
+            conn.execute('PRAGMA journal_mode=DELETE')
+        except sqlite3.OperationalError:
+            pass
+    conn.executescript(SEARCH_SCHEMA)
+    return conn
+
+@contextmanager
+def _write_transaction(conn):
+    """
+    Transação de escrita que reserva o banco logo no início (BEGIN IMMEDIATE), evitando o impasse de
+    duas transações que leem e depois tentam escrever ao mesmo tempo.
+    """
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        yield conn
+    except BaseException:
+        conn.execute('ROLLBACK')
+        raise
+    conn.execute('COMMIT')
+
+def _split_paragraphs(text):
+    """
+    Divide o texto em parágrafos (linhas não vazias), que são as unidades do índice de busca.
+    """
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+def _delete_document(conn, document_id):
+    """
+    Remove um documento e todas as suas linhas associadas (o trigger atualiza o índice FTS5).
+    """
+    for table in ('paragraphs', 'document_entities', 'document_keywords', 'document_dates'):
+        conn.execute(f'DELETE FROM {table} WHERE document_id = ?', (document_id,))
+    conn.execute('DELETE FROM documents WHERE id = ?', (document_id,))
+
+def index_document(analysis_results, text, db_path, document_path=None):
+    """
+    Indexa um documento analisado para busca textual (FTS5) e por entidades, palavras-chave e datas.
+
+    A indexação é incremental: um documento cujo hash de conteúdo não mudou desde a última
+    indexação é ignorado, e um documento alterado tem suas linhas antigas substituídas.
+
+    Parâmetros:
+        analysis_results (dict): Resultados da análise ('entities', 'keywords' e 'dates').
+        text (str): Texto completo do documento.
+        db_path (str): Caminho do banco de dados SQLite do índice.
+        document_path (str): Caminho do documento. None usa analysis_results['document_path'].
+
+    Retorna:
+        int or None: Id do documento no índice, ou None em caso de erro.
+    """
+    try:
+        document_path = document_path or analysis_results.get('document_path')
+        content_hash = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        conn = _connect_search_index(db_path)
+        try:
+            with _write_transaction(conn):
+                if document_path:
+                    row = conn.execute('SELECT id, content_hash FROM documents WHERE path = ?',
+                                       (document_path,)).fetchone()
+                else:
+                    row = conn.execute('SELECT id, content_hash FROM documents WHERE path IS NULL AND content_hash = ?',
+                                       (content_hash,)).fetchone()
+                if row and row[1] == content_hash:
+                    logging.info(f"Documento já indexado e inalterado: {document_path or content_hash}")
+                    print(f"Documento já indexado e inalterado: {document_path or content_hash}")
+                    return row[0]
+                if row:
+                    _delete_document(conn, row[0])
+
+                cursor = conn.execute('''
+                    INSERT INTO documents (path, content_hash, length, indexed_at)
+                    VALUES (?, ?, ?, ?)
+                ''', (document_path, content_hash, len(text), datetime.now().isoformat(timespec='seconds')))
+                document_id = cursor.lastrowid
+                conn.executemany('INSERT INTO paragraphs (document_id, position, text) VALUES (?, ?, ?)',
+                                 ((document_id, i, p) for i, p in enumerate(_split_paragraphs(text))))
+                conn.executemany('INSERT INTO document_entities (document_id, entity, label) VALUES (?, ?, ?)',
+                                 ((document_id, entity, label)
+                                  for entity, label in analysis_results.get('entities', [])))
+                conn.executemany('INSERT INTO document_keywords (document_id, keyword, score) VALUES (?, ?, ?)',
+                                 ((document_id, keyword, float(score))
+                                  for keyword, score in analysis_results.get('keywords', [])))
+                conn.executemany('INSERT INTO document_dates (document_id, text, date) VALUES (?, ?, ?)',
+                                 ((document_id, d['text'], d['date'])
+                                  for d in analysis_results.get('dates', []) if d.get('date')))
+        finally:
+            conn.close()
+        logging.info(f"Documento indexado para busca em {db_path} (id {document_id}).")
+        print(f"Documento indexado para busca em {db_path}.")
+        return document_id
+    except Exception as e:
+        logging.error(f"Erro ao indexar documento para busca: {str(e)}")
+        print(f"Erro ao indexar documento para busca: {str(e)}")
+        return None
+
+def optimize_search_index(db_path):
+    """
+    Funde os segmentos do índice FTS5 (recomendado após grandes cargas incrementais).
+    """
+    try:
+        conn = _connect_search_index(db_path)
+        with _write_transaction(conn):
+            conn.execute("INSERT INTO paragraphs_fts (paragraphs_fts) VALUES ('optimize')")
+        conn.close()
+        logging.info(f"Índice de busca otimizado: {db_path}")
+        print(f"Índice de busca otimizado: {db_path}")
+    except Exception as e:
+        logging.error(f"Erro ao otimizar o índice de busca: {str(e)}")
+        print(f"Erro ao otimizar o índice de busca: {str(e)}")
+
+def _fts_query(query):
+    """
+    Converte uma consulta livre em uma consulta FTS5 segura (cada termo entre aspas, combinados com AND).
+    """
+    return ' '.join('"{}"'.format(term.replace('"', '""')) for term in query.split())
+
+def search_documents(db_path, query=None, label=None, entity=None, date_from=None, date_to=None,
+                     limit=10, raw_query=False):
+    """
+    Busca parágrafos no corpus indexado, ordenados por relevância (BM25), com trechos destacados.
+
+    Parâmetros:
+        db_path (str): Caminho do banco de dados SQLite do índice.
+        query (str): Termos de busca. None lista os documentos que atendem aos filtros.
+        label (str): Só documentos com alguma entidade deste rótulo (ex.: 'ORG').
+        entity (str): Só documentos que mencionam esta entidade.
+        date_from (str): Só documentos com alguma data a partir desta (AAAA-MM-DD).
+        date_to (str): Só documentos com alguma data até esta (AAAA-MM-DD).
+        limit (int): Número máximo de resultados.
+        raw_query (bool): Se True, query é repassada com a sintaxe do FTS5 (OR, NEAR, prefixo*).
+
+    Retorna:
+        list: Lista de dicionários com 'document_id', 'path', 'paragraph', 'snippet' e 'score'.
+    """
+    try:
+        filters = []
+        params = []
+        if label or entity:
+            conditions = ['e.document_id = d.id']
+            if label:
+                conditions.append('e.label = ?')
+                params.append(label)
+            if entity:
+                conditions.append('e.entity = ? COLLATE NOCASE')
+                params.append(entity)
+            filters.append(f"EXISTS (SELECT 1 FROM document_entities e WHERE {' AND '.join(conditions)})")
+        if date_from or date_to:
+            conditions = ['t.document_id = d.id']
+            if date_from:
+                conditions.append('t.date >= ?')
+                params.append(date_from)
+            if date_to:
+                conditions.append('t.date <= ?')
+                params.append(date_to)
+            filters.append(f"EXISTS (SELECT 1 FROM document_dates t WHERE {' AND '.join(conditions)})")
+
+        conn = _connect_search_index(db_path)
+        try:
+            if query:
+                where = ' AND '.join(['paragraphs_fts MATCH ?'] + filters)
+                rows = conn.execute(f'''
+                    SELECT d.id, d.path, p.position,
+                           snippet(paragraphs_fts, 0, '[', ']', '...', 16), bm25(paragraphs_fts) AS score
+                    FROM paragraphs_fts
+                    JOIN paragraphs p ON p.id = paragraphs_fts.rowid
+                    JOIN documents d ON d.id = p.document_id
+                    WHERE {where}
+                    ORDER BY score
+                    LIMIT ?
+                ''', [query if raw_query else _fts_query(query)] + params + [limit]).fetchall()
+            else:
+                where = ' AND '.join(filters) or '1'
+                rows = conn.execute(f'''
+                    SELECT d.id, d.path, NULL, NULL, NULL
+                    FROM documents d
+                    WHERE {where}
+                    ORDER BY d.path
+                    LIMIT ?
+                ''', params + [limit]).fetchall()
+        finally:
+            conn.close()
+        return [{'document_id': document_id, 'path': path, 'paragraph': position, 'snippet': snippet, 'score': score}
+                for document_id, path, position, snippet, score in rows]
+    except Exception as e:
+        logging.error(f"Erro na busca no índice: {str(e)}")
+        print(f"Erro na busca no índice: {str(e)}")
+        return []
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Busca no índice de texto completo do corpus analisado")
+    parser.add_argument('db_path', help="Caminho do banco de dados do índice.")
+    parser.add_argument('query', nargs='?', help="Termos de busca (vazio lista os documentos filtrados).")
+    parser.add_argument('--label', help="Filtra documentos com entidades deste rótulo (ex.: ORG).")
+    parser.add_argument('--entity', help="Filtra documentos que mencionam esta entidade.")
+    parser.add_argument('--date_from', help="Filtra documentos com datas a partir de AAAA-MM-DD.")
+    parser.add_argument('--date_to', help="Filtra documentos com datas até AAAA-MM-DD.")
+    parser.add_argument('--limit', type=int, default=10, help="Número máximo de resultados.")
+    parser.add_argument('--raw', action='store_true', help="Interpreta a consulta com a sintaxe do FTS5.")
+    parser.add_argument('--optimize', action='store_true', help="Otimiza o índice antes da busca.")
+    args = parser.parse_args()
+
+    if args.optimize:
+        optimize_search_index(args.db_path)
+    for result in search_documents(args.db_path, args.query, args.label, args.entity, args.date_from,
+                                   args.date_to, args.limit, args.raw):
+        if result['paragraph'] is None:
+            print(result['path'])
+        else:
+            print(f"{result['path']} (parágrafo {result['paragraph']}): {result['snippet']}")
@@ -0,0 +1,312 @@
+# src/dedup.py
+
+import hashlib
+import logging
+import re
+import sqlite3
+import zlib
+from datetime import datetime
+import numpy as np
+
+NUM_PERMUTATIONS = 128
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.8
+# Número de shingles processados por vez no cálculo da assinatura (limita a memória a ~8 MB)
+SHINGLE_CHUNK = 8192
+
+DEDUP_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS dedup_config (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS dedup_documents (
+        doc_key TEXT PRIMARY KEY,
+        path TEXT,
+        output_folder TEXT,
+        signature BLOB,
+        canonical TEXT,
+        jaccard REAL,
+        created_at TEXT,
+        analyzed INTEGER DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_dedup_documents_canonical ON dedup_documents (canonical);
+    CREATE TABLE IF NOT EXISTS dedup_buckets (
+        band INTEGER,
+        bucket TEXT,
+        doc_key TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_dedup_buckets ON dedup_buckets (band, bucket);
+    CREATE INDEX IF NOT EXISTS idx_dedup_buckets_document ON dedup_buckets (doc_key);
+'''
+
+
+def _shingle_hashes(text, shingle_size=SHINGLE_SIZE):
+    """
+    Calcula hashes estáveis de 64 bits dos shingles de palavras do texto (sem repetição).
+
+    Parâmetros:
+        text (str): Texto do documento.
+        shingle_size (int): Número de palavras por shingle.
+
+    Retorna:
+        numpy.ndarray: Array uint64 de hashes.
+    """
+    words = re.findall(r'\w+', text.lower())
+    if len(words) < shingle_size:
+        shingles = {' '.join(words)} if words else set()
+    else:
+        shingles = {' '.join(words[i:i + shingle_size]) for i in range(len(words) - shingle_size + 1)}
+    encoded = [s.encode('utf-8') for s in shingles]
+    high = np.fromiter((zlib.crc32(b) for b in encoded), dtype=np.uint64, count=len(encoded))
+    low = np.fromiter((zlib.crc32(b, 0x9E3779B9) for b in encoded), dtype=np.uint64, count=len(encoded))
+    return (high << np.uint64(32)) | low
+
+
+def _permutations(num_perm, seed):
+    """
+    Coeficientes das funções de hash (multiply-shift) que simulam as permutações do MinHash.
+    """
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+    return multipliers[:, None], offsets[:, None]
+
+
+def minhash_signature(text, num_perm=NUM_PERMUTATIONS, shingle_size=SHINGLE_SIZE, seed=1):
+    """
+    Calcula a assinatura MinHash do texto sobre shingles de palavras.
+
+    Parâmetros:
+        text (str): Texto do documento.
+        num_perm (int): Número de funções de hash (tamanho da assinatura).
+        shingle_size (int): Número de palavras por shingle.
+        seed (int): Semente das funções de hash (deve ser a mesma para assinaturas comparáveis).
+
+    Retorna:
+        numpy.ndarray: Assinatura uint32 de tamanho num_perm.
+    """
+    hashes = _shingle_hashes(text, shingle_size)
+    multipliers, offsets = _permutations(num_perm, seed)
+    signature = np.full(num_perm, np.iinfo(np.uint32).max, dtype=np.uint64)
+    with np.errstate(over='ignore'):
+        for start in range(0, len(hashes), SHINGLE_CHUNK):
+            chunk = hashes[start:start + SHINGLE_CHUNK][None, :]
+            values = (chunk * multipliers + offsets) >> np.uint64(32)
+            np.minimum(signature, values.min(axis=1), out=signature)
+    return signature.astype(np.uint32)
+
+
+def estimate_jaccard(signature_a, signature_b):
+    """
+    Estima a similaridade de Jaccard entre dois documentos pela fração de posições iguais das assinaturas.
+    """
+    return float(np.mean(signature_a == signature_b))
+
+
+def lsh_parameters(num_perm, threshold):
+    """
+    Escolhe o número de bandas e de linhas por banda do LSH para o limiar de similaridade.
+
+    O limiar efetivo do LSH é aproximadamente (1 / bandas) ** (1 / linhas); é escolhida a
+    combinação mais próxima do limiar pedido.
+
+    Retorna:
+        tuple: (bandas, linhas por banda).
+    """
+    candidates = [(bands, num_perm // bands) for bands in range(1, num_perm + 1)]
+    return min(candidates, key=lambda c: abs((1 / c[0]) ** (1 / c[1]) - threshold))
+
+
+class LSHIndex:
+    """
+    Índice LSH persistente em SQLite para assinaturas MinHash.
+
+    Cada banda da assinatura é resumida em uma chave de bucket; documentos que compartilham
+    algum bucket são candidatos e têm a similaridade confirmada pela assinatura completa.
+    """
+
+    def __init__(self, db_path, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERMUTATIONS, shingle_size=SHINGLE_SIZE):
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.bands, self.rows = lsh_parameters(num_perm, threshold)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(DEDUP_SCHEMA)
+        columns = {row[1] for row in self.conn.execute('PRAGMA table_info(dedup_documents)')}
+        if 'analyzed' not in columns:
+            # Índices criados antes da coluna: documentos já registrados são considerados analisados
+            with self.conn:
+                self.conn.execute('ALTER TABLE dedup_documents ADD COLUMN analyzed INTEGER DEFAULT 1')
+        self._check_config()
+
+    def _check_config(self):
+        # Assinaturas de configurações diferentes não são comparáveis
+        config = {'num_perm': str(self.num_perm), 'shingle_size': str(self.shingle_size),
+                  'bands': str(self.bands), 'rows': str(self.rows)}
+        stored = dict(self.conn.execute('SELECT key, value FROM dedup_config'))
+        if stored and stored != config:
+            raise ValueError(f"Índice de duplicatas criado com outra configuração: {stored}")
+        with self.conn:
+            self.conn.executemany('INSERT OR IGNORE INTO dedup_config (key, value) VALUES (?, ?)', config.items())
+
+    def close(self):
+        self.conn.close()
+
+    def signature(self, text):
+        return minhash_signature(text, self.num_perm, self.shingle_size)
+
+    def _buckets(self, signature):
+        for band in range(self.bands):
+            part = signature[band * self.rows:(band + 1) * self.rows]
+            yield band, hashlib.blake2b(part.tobytes(), digest_size=8).hexdigest()
+
+    def query(self, signature, exclude=None):
+        """
+        Retorna os documentos indexados com similaridade estimada acima do limiar.
+
+        Parâmetros:
+            signature (numpy.ndarray): Assinatura MinHash do documento.
+            exclude (str): Chave de documento a ignorar (o próprio documento).
+
+        Retorna:
+            list: Tuplas (chave, caminho, pasta de saída, canônico, jaccard), da mais similar para a menos similar.
+        """
+        candidates = set()
+        for band, bucket in self._buckets(signature):
+            candidates.update(row[0] for row in self.conn.execute(
+                'SELECT doc_key FROM dedup_buckets WHERE band = ? AND bucket = ?', (band, bucket)))
+        candidates.discard(exclude)
+        matches = []
+        for doc_key in candidates:
+            path, output_folder, stored, canonical = self.conn.execute(
+                'SELECT path, output_folder, signature, canonical FROM dedup_documents WHERE doc_key = ?',
+                (doc_key,)).fetchone()
+            jaccard = estimate_jaccard(signature, np.frombuffer(stored, dtype=np.uint32))
+            if jaccard >= self.threshold:
+                matches.append((doc_key, path, output_folder, canonical, jaccard))
+        return sorted(matches, key=lambda m: m[-1], reverse=True)
+
+    def add(self, doc_key, signature, path=None, output_folder=None, canonical=None, jaccard=None):
+        """
+        Adiciona (ou substitui) um documento no índice.
+
+        Parâmetros:
+            canonical (str): Chave do documento canônico do grupo. None indica que o documento é canônico.
+            jaccard (float): Similaridade estimada com o canônico.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM dedup_buckets WHERE doc_key = ?', (doc_key,))
+            self.conn.execute('''
+                INSERT OR REPLACE INTO dedup_documents
+                (doc_key, path, output_folder, signature, canonical, jaccard, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (doc_key, path, output_folder, signature.astype(np.uint32).tobytes(), canonical or doc_key,
+                  jaccard, datetime.now().isoformat(timespec='seconds')))
+            self.conn.executemany('INSERT INTO dedup_buckets (band, bucket, doc_key) VALUES (?, ?, ?)',
+                                  ((band, bucket, doc_key) for band, bucket in self._buckets(signature)))
+
+    def mark_analyzed(self, doc_key):
+        """
+        Registra que a análise do documento foi concluída (ver check_duplicate).
+        """
+        with self.conn:
+            self.conn.execute('UPDATE dedup_documents SET analyzed = 1 WHERE doc_key = ?', (doc_key,))
+
+
+def check_duplicate(text, document_path, db_path, output_folder=None, threshold=DEFAULT_THRESHOLD):
+    """
+    Verifica se o documento é quase duplicado de outro já visto e o registra no índice persistente.
+
+    O documento é associado ao canônico do grupo do documento mais similar; se não houver
+    nenhum acima do limiar, ele se torna o canônico de um novo grupo. O registro começa como
+    não analisado; mark_analyzed o marca quando a análise do documento termina, e só então
+    a pasta de saída do canônico pode substituir a análise de suas duplicatas.
+
+    Parâmetros:
+        text (str): Texto do documento.
+        document_path (str): Caminho do documento (chave no índice).
+        db_path (str): Banco de dados SQLite do índice de duplicatas.
+        output_folder (str): Pasta com a análise do documento.
+        threshold (float): Similaridade de Jaccard mínima para considerar duplicata.
+
+    Retorna:
+        dict: 'duplicate' (bool), 'canonical' (caminho), 'canonical_output' (pasta da análise canônica),
+        'canonical_analyzed' (bool, se a análise do canônico foi concluída) e 'jaccard'.
+    """
+    result = {'duplicate': False, 'canonical': document_path, 'canonical_output': output_folder,
+              'canonical_analyzed': False, 'jaccard': None}
+    try:
+        logging.info("Verificando documentos quase duplicados.")
+        print("Verificando documentos quase duplicados.")
+        doc_key = document_path or hashlib.sha256(text.encode('utf-8')).hexdigest()
+        index = LSHIndex(db_path, threshold)
+        try:
+            signature = index.signature(text)
+            # Duplicatas do próprio documento (reprocessado) não o tornam duplicata
+            matches = [m for m in index.query(signature, exclude=doc_key) if m[3] != doc_key]
+            if matches:
+                _, _, _, canonical, jaccard = matches[0]
+                canonical_path, canonical_output, analyzed = index.conn.execute(
+                    'SELECT path, output_folder, analyzed FROM dedup_documents WHERE doc_key = ?',
+                    (canonical,)).fetchone()
+                index.add(doc_key, signature, document_path, output_folder, canonical, jaccard)
+                result = {'duplicate': True, 'canonical': canonical_path, 'canonical_output': canonical_output,
+                          'canonical_analyzed': bool(analyzed), 'jaccard': jaccard}
+                logging.info(f"Documento quase duplicado de {canonical_path} (Jaccard estimado {jaccard:.2f}).")
+                print(f"Documento quase duplicado de {canonical_path} (Jaccard estimado {jaccard:.2f}).")
+            else:
+                index.add(doc_key, signature, document_path, output_folder)
+        finally:
+            index.close()
+        return result
+    except Exception as e:
+        logging.error(f"Erro na detecção de duplicatas: {str(e)}")
+        print(f"Erro na detecção de duplicatas: {str(e)}")
+        return result
+
+
+def mark_analyzed(text, document_path, db_path):
+    """
+    Registra no índice de duplicatas que a análise do documento foi concluída.
+
+    Parâmetros:
+        text (str): Texto do documento (usado como chave quando document_path é None).
+        document_path (str): Caminho do documento, como passado a check_duplicate.
+        db_path (str): Banco de dados SQLite do índice de duplicatas.
+    """
+    try:
+        index = LSHIndex(db_path)
+        try:
+            index.mark_analyzed(document_path or hashlib.sha256(text.encode('utf-8')).hexdigest())
+        finally:
+            index.close()
+    except Exception as e:
+        logging.error(f"Erro ao registrar a análise no índice de duplicatas: {str(e)}")
+        print(f"Erro ao registrar a análise no índice de duplicatas: {str(e)}")
+
+
+def duplicate_clusters(db_path):
+    """
+    Retorna os grupos de documentos quase duplicados registrados no índice.
+
+    Retorna:
+        dict: Caminho do documento canônico -> lista de (caminho, jaccard) dos duplicados.
+    """
+    try:
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute('''
+            SELECT c.path, d.path, d.jaccard
+            FROM dedup_documents d
+            JOIN dedup_documents c ON c.doc_key = d.canonical
+            WHERE d.canonical != d.doc_key
+            ORDER BY c.path, d.jaccard DESC
+        ''').fetchall()
+        conn.close()
+        clusters = {}
+        for canonical, path, jaccard in rows:
+            clusters.setdefault(canonical, []).append((path, jaccard))
+        return clusters
+    except Exception as e:
+        logging.error(f"Erro ao consultar grupos de duplicatas: {str(e)}")
+        print(f"Erro ao consultar grupos de duplicatas: {str(e)}")
+        return {}
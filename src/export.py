@@ -0,0 +1,296 @@
+# src/export.py
+
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime
+from functools import lru_cache
+
+# Estatísticas exportadas por documento (colunas fixas; valores ausentes ficam nulos)
+STATISTICS_INT_FIELDS = ['total_characters', 'total_words', 'total_sentences',
+                         'min_sentences_paragraph', 'max_sentences_paragraph']
+STATISTICS_FLOAT_FIELDS = ['avg_sentences_paragraph', 'avg_words_sentence']
+READABILITY_FIELDS = ['flesch_reading_ease', 'flesch_kincaid_grade', 'fernandez_huerta_adjusted']
+
+# Esquemas estáveis das tabelas exportadas: (coluna, tipo do Arrow); a coluna de partição 'language'
+# fica no caminho (estilo Hive). O pyarrow é opcional e só é importado ao exportar ou ler os datasets.
+EXPORT_SCHEMAS = {
+    'statistics': [('document_id', 'string'), ('document_path', 'string'), ('exported_at', 'timestamp[s]'),
+                   ('sentiment_label', 'string'), ('sentiment_score', 'double')]
+                  + [(name, 'int64') for name in STATISTICS_INT_FIELDS]
+                  + [(name, 'double') for name in STATISTICS_FLOAT_FIELDS + READABILITY_FIELDS],
+    'tokens': [('document_id', 'string'), ('position', 'int32'), ('token', 'string')],
+    'entities': [('document_id', 'string'), ('position', 'int32'), ('entity', 'string'), ('label', 'string')],
+    'keywords': [('document_id', 'string'), ('rank', 'int32'), ('keyword', 'string'), ('score', 'double')],
+    'topics': [('document_id', 'string'), ('topic', 'int32'), ('terms', 'string')],
+    'sentences': [('document_id', 'string'), ('position', 'int32'), ('text', 'string'),
+                  ('sentiment_score', 'double'), ('sentiment_label', 'string'), ('escalated', 'bool')],
+}
+# Arquivo de cada partição com os documentos já compactados, ordenados por document_id
+COMPACTED_FILE = 'compacted.parquet'
+COMPACTION_ROW_GROUP_SIZE = 64 * 1024
+
+
+@lru_cache(maxsize=None)
+def export_schema(table, with_partition=False):
+    """
+    Esquema pyarrow de uma tabela exportada (ver EXPORT_SCHEMAS).
+
+    Parâmetros:
+        table (str): Nome da tabela.
+        with_partition (bool): Inclui a coluna de partição 'language'.
+
+    Retorna:
+        pyarrow.Schema: Esquema da tabela.
+    """
+    import pyarrow as pa
+    columns = EXPORT_SCHEMAS[table] + ([('language', 'string')] if with_partition else [])
+    return pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in columns])
+
+
+def _table_columns(analysis_results, document_id, exported_at):
+    """
+    Converte os resultados da análise de um documento nas colunas de cada tabela exportada.
+    """
+    statistics = analysis_results.get('text_statistics') or {}
+    readability = analysis_results.get('readability') or {}
+    sentiment = analysis_results.get('sentiment') or {}
+    columns = {
+        'statistics': {
+            'document_id': [document_id],
+            'document_path': [analysis_results.get('document_path')],
+            'exported_at': [exported_at],
+            'sentiment_label': [sentiment.get('label')],
+            'sentiment_score': [sentiment.get('score')],
+        },
+    }
+    for name in STATISTICS_INT_FIELDS + STATISTICS_FLOAT_FIELDS:
+        columns['statistics'][name] = [statistics.get(name)]
+    for name in READABILITY_FIELDS:
+        columns['statistics'][name] = [readability.get(name)]
+
+    tokens = list(analysis_results.get('tokens', []))
+    columns['tokens'] = {'position': list(range(len(tokens))), 'token': tokens}
+    entities = list(analysis_results.get('entities', []))
+    columns['entities'] = {'position': list(range(len(entities))),
+                           'entity': [entity for entity, _ in entities], 'label': [label for _, label in entities]}
+    keywords = list(analysis_results.get('keywords', []))
+    columns['keywords'] = {'rank': list(range(len(keywords))), 'keyword': [keyword for keyword, _ in keywords],
+                           'score': [float(score) for _, score in keywords]}
+    topics = list(analysis_results.get('topics', []))
+    columns['topics'] = {'topic': [int(topic) for topic, _ in topics], 'terms': [str(terms) for _, terms in topics]}
+    sentences = list(analysis_results.get('sentences', []))
+    columns['sentences'] = {'position': list(range(len(sentences))),
+                            'text': [s['text'] for s in sentences],
+                            'sentiment_score': [s.get('score') for s in sentences],
+                            'sentiment_label': [s.get('label') for s in sentences],
+                            'escalated': [bool(s.get('escalated')) for s in sentences]}
+    for name, table_columns in columns.items():
+        if name != 'statistics':
+            length = len(next(iter(table_columns.values())))
+            table_columns['document_id'] = [document_id] * length
+    return columns
+
+
+def _write_parquet(table, path, row_group_size=None):
+    """
+    Grava a tabela em Parquet com escrita atômica (arquivo temporário + os.replace).
+    """
+    import pyarrow.parquet as pq
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path, compression='zstd', row_group_size=row_group_size)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _partition_dirs(table_root):
+    """
+    Pastas das partições (language=<idioma>) de uma tabela exportada.
+    """
+    if not os.path.isdir(table_root):
+        return []
+    return [os.path.join(table_root, name) for name in sorted(os.listdir(table_root)) if name.startswith('language=')]
+
+
+def _document_files(table_root):
+    """
+    Arquivos por documento (não compactados) de uma tabela, por partição.
+
+    Retorna:
+        dict: {pasta da partição: [caminhos dos arquivos]}.
+    """
+    return {partition: sorted(os.path.join(partition, name) for name in os.listdir(partition)
+                              if name.endswith('.parquet') and name != COMPACTED_FILE)
+            for partition in _partition_dirs(table_root)}
+
+
+def _document_id(path):
+    return os.path.basename(path)[:-len('.parquet')]
+
+
+def _remove_stale_files(table_root, document_id, current_path):
+    """
+    Apaga o arquivo do documento em outras partições (exportação anterior com outro idioma).
+
+    Os arquivos compactados não são alterados aqui: as linhas compactadas de um documento que
+    tem arquivo próprio são ignoradas na leitura (read_export) e descartadas em compact_export.
+    """
+    for partition in _partition_dirs(table_root):
+        path = os.path.join(partition, f"{document_id}.parquet")
+        if path != current_path and os.path.exists(path):
+            os.unlink(path)
+
+
+def export_analysis_results(analysis_results, root, document_id=None, language=None):
+    """
+    Exporta os resultados da análise de um documento para datasets Parquet particionados por idioma.
+
+    Cada tabela (statistics, tokens, entities, keywords, topics, sentences) é um dataset em
+    <raiz>/<tabela>/language=<idioma>/<document_id>.parquet, com esquema fixo (EXPORT_SCHEMAS).
+    Incluir um documento apenas grava arquivos novos, e reexportá-lo substitui os seus arquivos (inclusive
+    em outras partições); o arquivo novo prevalece sobre as linhas já compactadas (ver compact_export).
+
+    Parâmetros:
+        analysis_results (dict): Resultados da análise; também são lidos 'tokens' e 'sentences', se presentes.
+        root (str): Pasta raiz dos datasets.
+        document_id (str): Identificador do documento. None usa o hash do caminho do documento.
+        language (str): Idioma do documento (partição).
+
+    Retorna:
+        str or None: Pasta raiz dos datasets, ou None em caso de erro.
+    """
+    try:
+        import pyarrow as pa
+        logging.info("Exportando resultados para Parquet.")
+        print("Exportando resultados para Parquet.")
+        document_id = document_id or hashlib.sha256(
+            str(analysis_results.get('document_path')).encode('utf-8')).hexdigest()
+        exported_at = datetime.now().replace(microsecond=0)
+        for name, columns in _table_columns(analysis_results, document_id, exported_at).items():
+            table = pa.Table.from_pydict(columns, schema=export_schema(name))
+            path = os.path.join(root, name, f"language={language or 'unknown'}", f"{document_id}.parquet")
+            _write_parquet(table, path)
+            _remove_stale_files(os.path.join(root, name), document_id, path)
+        logging.info(f"Resultados exportados para {root} (documento {document_id}).")
+        print(f"Resultados exportados para {root}.")
+        return root
+    except Exception as e:
+        logging.error(f"Erro ao exportar resultados para Parquet: {str(e)}")
+        print(f"Erro ao exportar resultados para Parquet: {str(e)}")
+        return None
+
+
+def compact_export(root, tables=None, row_group_size=COMPACTION_ROW_GROUP_SIZE):
+    """
+    Junta os arquivos por documento de cada partição em um único arquivo Parquet.
+
+    A exportação grava um arquivo por documento e por tabela; em lotes grandes, a leitura passa a ser
+    dominada pela abertura de arquivos e pelos metadados. A compactação reescreve cada partição em
+    <partição>/compacted.parquet, ordenado por document_id e em grupos de row_group_size linhas, e
+    apaga os arquivos por documento incorporados. Documentos exportados depois ficam em arquivos
+    próprios até a próxima compactação; as linhas compactadas de documentos reexportados (em qualquer
+    partição) são descartadas. Não deve ser executada junto com exportações no mesmo dataset.
+
+    Parâmetros:
+        root (str): Pasta raiz dos datasets.
+        tables (list): Tabelas a compactar. None compacta todas.
+        row_group_size (int): Linhas por grupo de linhas do arquivo compactado.
+
+    Retorna:
+        int: Número de arquivos por documento incorporados, ou None em caso de erro.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        logging.info(f"Compactando datasets exportados em {root}.")
+        print("Compactando datasets exportados.")
+        merged = 0
+        for name in tables or EXPORT_SCHEMAS:
+            schema = export_schema(name)
+            document_files = _document_files(os.path.join(root, name))
+            # Os arquivos por documento são mais recentes que as linhas já compactadas do mesmo documento
+            superseded = ds.field('document_id').isin(pa.array(
+                [_document_id(path) for files in document_files.values() for path in files], pa.string()))
+            for partition, files in document_files.items():
+                parts = [ds.dataset(files, schema=schema, format='parquet').to_table()] if files else []
+                compacted = os.path.join(partition, COMPACTED_FILE)
+                if os.path.exists(compacted):
+                    dataset = ds.dataset(compacted, schema=schema, format='parquet')
+                    if not files and not dataset.count_rows(filter=superseded):
+                        continue
+                    parts.append(dataset.to_table(filter=~superseded))
+                if not parts:
+                    continue
+                _write_parquet(pa.concat_tables(parts).sort_by('document_id'), compacted, row_group_size)
+                for path in files:
+                    os.unlink(path)
+                merged += len(files)
+        logging.info(f"{merged} arquivo(s) por documento compactados em {root}.")
+        print(f"{merged} arquivo(s) por documento compactados.")
+        return merged
+    except Exception as e:
+        logging.error(f"Erro ao compactar datasets exportados: {str(e)}")
+        print(f"Erro ao compactar datasets exportados: {str(e)}")
+        return None
+
+
+def open_export_dataset(root, table):
+    """
+    Abre um dataset exportado, com leitura por mapeamento de memória.
+
+    O dataset inclui as linhas compactadas de documentos reexportados desde a última compactação;
+    read_export as descarta.
+
+    Retorna:
+        pyarrow.dataset.Dataset: Dataset com a coluna de partição 'language'.
+    """
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    from pyarrow import fs
+    partitioning = ds.partitioning(pa.schema([('language', pa.string())]), flavor='hive')
+    return ds.dataset(os.path.join(root, table), schema=export_schema(table, True), format='parquet',
+                      partitioning=partitioning, filesystem=fs.LocalFileSystem(use_mmap=True))
+
+
+def read_export(root, table, columns=None, language=None):
+    """
+    Lê uma tabela exportada, carregando apenas as colunas e partições pedidas.
+
+    Parâmetros:
+        root (str): Pasta raiz dos datasets.
+        table (str): Nome da tabela (ver EXPORT_SCHEMAS).
+        columns (list): Colunas a ler. None lê todas.
+        language (str): Lê só a partição deste idioma.
+
+    Retorna:
+        pyarrow.Table: Tabela lida (use .to_pandas() para um DataFrame), ou None em caso de erro.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        dataset = open_export_dataset(root, table)
+        filter_expression = ds.field('language') == language if language else None
+        document_ids = [_document_id(path) for files in _document_files(os.path.join(root, table)).values()
+                        for path in files]
+        compacted = [path for path in dataset.files if os.path.basename(path) == COMPACTED_FILE]
+        if not (compacted and document_ids):
+            return dataset.to_table(columns=columns, filter=filter_expression)
+        # Linhas compactadas de documentos que já têm arquivo próprio (reexportados) foram substituídas
+        superseded = ds.field('document_id').isin(pa.array(document_ids, pa.string()))
+        current = ~superseded if filter_expression is None else filter_expression & ~superseded
+        loose = [path for path in dataset.files if os.path.basename(path) != COMPACTED_FILE]
+        tables = [ds.dataset(files, schema=dataset.schema, format='parquet', partitioning=dataset.partitioning,
+                             partition_base_dir=os.path.join(root, table), filesystem=dataset.filesystem)
+                  .to_table(columns=columns, filter=condition)
+                  for files, condition in ((loose, filter_expression), (compacted, current))]
+        return pa.concat_tables(tables)
+    except Exception as e:
+        logging.error(f"Erro ao ler dataset exportado: {str(e)}")
+        print(f"Erro ao ler dataset exportado: {str(e)}")
+        return None
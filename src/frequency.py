@@ -0,0 +1,306 @@
+# src/frequency.py
+
+import heapq
+import logging
+import zlib
+from collections import Counter
+import numpy as np
+
+# Sementes fixas: sketches criados em processos diferentes usam as mesmas funções de hash e podem ser combinados
+HASH_SEED = 0x5EED
+SECOND_HASH_SEED = 0x9E3779B9
+
+
+def _hash_tokens(tokens):
+    """
+    Calcula um hash estável de 64 bits para cada token (duas CRC32 com sementes diferentes).
+
+    Ao contrário de hash(), o resultado não depende de PYTHONHASHSEED e é igual em todos os processos.
+
+    Parâmetros:
+        tokens (iterable): Tokens (str).
+
+    Retorna:
+        numpy.ndarray: Array uint64 de hashes.
+    """
+    encoded = [token.encode('utf-8') for token in tokens]
+    high = np.fromiter((zlib.crc32(b, HASH_SEED) for b in encoded), dtype=np.uint64, count=len(encoded))
+    low = np.fromiter((zlib.crc32(b, SECOND_HASH_SEED) for b in encoded), dtype=np.uint64, count=len(encoded))
+    return (high << np.uint64(32)) | low
+
+
+class CountMinSketch:
+    """
+    Count-Min Sketch: contagens aproximadas (nunca subestimadas) com memória fixa depth x width.
+
+    As linhas usam hashing multiply-shift sobre o hash estável de 64 bits do token, e as
+    atualizações são feitas em lote com np.bincount.
+    """
+
+    def __init__(self, width=2 ** 18, depth=4, seed=0):
+        if width & (width - 1):
+            raise ValueError("width deve ser uma potência de 2.")
+        self.width = width
+        self.depth = depth
+        self.seed = seed
+        self.total = 0
+        self.table = np.zeros((depth, width), dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        # Multiplicadores ímpares para o hashing multiply-shift
+        self._multipliers = rng.integers(1, 2 ** 63, size=depth, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._shift = np.uint64(64 - int(width).bit_length() + 1)
+
+    def _indexes(self, hashes):
+        with np.errstate(over='ignore'):
+            return [(hashes * multiplier) >> self._shift for multiplier in self._multipliers]
+
+    def update(self, tokens, counts=None):
+        """
+        Adiciona ocorrências de tokens ao sketch.
+
+        Parâmetros:
+            tokens (list): Tokens (str).
+            counts (list): Contagem de cada token. None conta uma ocorrência por token.
+        """
+        if not tokens:
+            return
+        weights = None if counts is None else np.asarray(counts, dtype=np.int64)
+        for row, indexes in enumerate(self._indexes(_hash_tokens(tokens))):
+            self.table[row] += np.bincount(indexes.astype(np.int64), weights=weights,
+                                           minlength=self.width).astype(np.int64)
+        self.total += len(tokens) if weights is None else int(weights.sum())
+
+    def estimate(self, tokens):
+        """
+        Estima a contagem de cada token (mínimo entre as linhas).
+
+        Retorna:
+            numpy.ndarray: Contagens estimadas, na ordem dos tokens.
+        """
+        if not tokens:
+            return np.zeros(0, dtype=np.int64)
+        rows = [self.table[row, indexes.astype(np.int64)]
+                for row, indexes in enumerate(self._indexes(_hash_tokens(tokens)))]
+        return np.min(rows, axis=0)
+
+    def merge(self, other):
+        """
+        Soma outro sketch com as mesmas dimensões e semente a este.
+        """
+        if (self.width, self.depth, self.seed) != (other.width, other.depth, other.seed):
+            raise ValueError("Só é possível combinar sketches com mesma largura, profundidade e semente.")
+        self.table += other.table
+        self.total += other.total
+        return self
+
+
+class SpaceSaving:
+    """
+    Resumo Space-Saving dos itens mais frequentes (heavy hitters) com no máximo capacity contadores.
+
+    Cada contador guarda a contagem estimada (que pode superestimar) e o erro máximo associado.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counts = {}
+        self.errors = {}
+        self._heap = []
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _minimum(self):
+        # Descarta entradas desatualizadas do heap (contagens que já foram incrementadas)
+        while self._heap:
+            count, item = self._heap[0]
+            if self.counts.get(item) == count:
+                return count, item
+            heapq.heappop(self._heap)
+        return 0, None
+
+    def update(self, item, count=1):
+        """
+        Adiciona count ocorrências de um item ao resumo.
+        """
+        if item in self.counts:
+            self.counts[item] += count
+        elif len(self.counts) < self.capacity:
+            self.counts[item] = count
+            self.errors[item] = 0
+        else:
+            minimum, evicted = self._minimum()
+            heapq.heappop(self._heap)
+            del self.counts[evicted]
+            del self.errors[evicted]
+            self.counts[item] = minimum + count
+            self.errors[item] = minimum
+        heapq.heappush(self._heap, (self.counts[item], item))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, i) for i, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def minimum_count(self):
+        """
+        Menor contagem monitorada quando o resumo está cheio (0 caso contrário).
+        """
+        return self._minimum()[0] if len(self.counts) >= self.capacity else 0
+
+    def merge(self, other):
+        """
+        Combina outro resumo a este (resumos Space-Saving são combináveis).
+
+        Itens ausentes em um dos resumos recebem a contagem mínima dele como limite superior.
+        """
+        own_minimum, other_minimum = self.minimum_count(), other.minimum_count()
+        merged = {}
+        for item in set(self.counts) | set(other.counts):
+            count = self.counts.get(item, own_minimum) + other.counts.get(item, other_minimum)
+            error = (self.errors.get(item, own_minimum) + other.errors.get(item, other_minimum))
+            merged[item] = (count, error)
+        top = heapq.nlargest(self.capacity, merged.items(), key=lambda entry: entry[1][0])
+        self.counts = {item: count for item, (count, _) in top}
+        self.errors = {item: error for item, (_, error) in top}
+        self._heap = [(c, i) for i, c in self.counts.items()]
+        heapq.heapify(self._heap)
+        return self
+
+    def top(self, n):
+        """
+        Retorna os n itens com maior contagem estimada, como tuplas (item, contagem).
+        """
+        return heapq.nlargest(n, self.counts.items(), key=lambda entry: entry[1])
+
+
+class WordFrequencyCounter:
+    """
+    Contador de frequência de palavras em streaming, com modo exato ou aproximado.
+
+    No modo 'exact', as contagens são mantidas em um Counter. No modo 'approximate', a memória é
+    fixa: um Space-Saving acompanha os candidatos a top-k e um Count-Min Sketch fornece as
+    contagens estimadas. Os contadores de processos diferentes podem ser combinados com merge().
+
+    O sketch só é alocado quando o número de palavras distintas excede a capacidade do Space-Saving;
+    até lá as contagens do Space-Saving são exatas e documentos pequenos não pagam pela tabela
+    depth x width.
+    """
+
+    MODES = ('exact', 'approximate')
+
+    def __init__(self, mode='exact', k=20, capacity=None, width=2 ** 18, depth=4, seed=0):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de contagem inválido: {mode}")
+        self.mode = mode
+        self.k = k
+        self.total = 0
+        if mode == 'exact':
+            self.counter = Counter()
+        else:
+            self.heavy_hitters = SpaceSaving(capacity or max(10 * k, 1000))
+            self.sketch_shape = (width, depth, seed)
+            self.sketch = None
+
+    def _seeded_sketch(self):
+        # Enquanto não houve descarte no Space-Saving, suas contagens são exatas e podem semear o sketch
+        sketch = CountMinSketch(*self.sketch_shape)
+        items = list(self.heavy_hitters.counts)
+        sketch.update(items, [self.heavy_hitters.counts[item] for item in items])
+        return sketch
+
+    def update(self, tokens):
+        """
+        Adiciona um lote de tokens (ex.: um documento ou um trecho dele).
+        """
+        batch = Counter(tokens)
+        self.total += sum(batch.values())
+        if self.mode == 'exact':
+            self.counter.update(batch)
+            return
+        items = list(batch)
+        if self.sketch is None:
+            new_items = sum(1 for item in items if item not in self.heavy_hitters.counts)
+            if len(self.heavy_hitters) + new_items > self.heavy_hitters.capacity:
+                self.sketch = self._seeded_sketch()
+        if self.sketch is not None:
+            self.sketch.update(items, [batch[item] for item in items])
+        for item in items:
+            self.heavy_hitters.update(item, batch[item])
+
+    def merge(self, other):
+        """
+        Combina outro contador do mesmo modo (ex.: de outro processo) a este.
+        """
+        if other.mode != self.mode:
+            raise ValueError("Só é possível combinar contadores do mesmo modo.")
+        self.total += other.total
+        if self.mode == 'exact':
+            self.counter.update(other.counter)
+            return self
+        distinct = set(self.heavy_hitters.counts) | set(other.heavy_hitters.counts)
+        if self.sketch is not None or other.sketch is not None or len(distinct) > self.heavy_hitters.capacity:
+            if self.sketch is None:
+                self.sketch = self._seeded_sketch()
+            self.sketch.merge(other.sketch if other.sketch is not None else other._seeded_sketch())
+        self.heavy_hitters.merge(other.heavy_hitters)
+        return self
+
+    def count(self, word):
+        """
+        Retorna a contagem (exata ou estimada) de uma palavra.
+        """
+        if self.mode == 'exact':
+            return self.counter[word]
+        if self.sketch is None:
+            return self.heavy_hitters.counts.get(word, 0)
+        return int(self.sketch.estimate([word])[0])
+
+    def top_k(self, n=None):
+        """
+        Retorna as n palavras mais frequentes em ordem decrescente.
+
+        No modo aproximado, a contagem informada é o menor valor entre a estimativa do
+        Count-Min Sketch e a do Space-Saving (ambas são limites superiores).
+
+        Parâmetros:
+            n (int): Número de palavras. None usa o k do contador.
+
+        Retorna:
+            list: Lista de tuplas (palavra, contagem).
+        """
+        n = n or self.k
+        if self.mode == 'exact':
+            return self.counter.most_common(n)
+        if self.sketch is None:
+            return self.heavy_hitters.top(n)
+        candidates = list(self.heavy_hitters.counts)
+        estimates = self.sketch.estimate(candidates)
+        counts = {word: min(int(estimate), self.heavy_hitters.counts[word])
+                  for word, estimate in zip(candidates, estimates)}
+        return heapq.nlargest(n, counts.items(), key=lambda entry: entry[1])
+
+
+def count_word_frequencies(token_batches, mode='exact', k=20):
+    """
+    Conta a frequência de palavras sobre um fluxo de lotes de tokens.
+
+    Parâmetros:
+        token_batches (iterable): Lotes de tokens (ex.: um por documento).
+        mode (str): 'exact' ou 'approximate' (memória fixa).
+        k (int): Número de palavras mais frequentes a retornar.
+
+    Retorna:
+        WordFrequencyCounter: Contador com as frequências acumuladas.
+    """
+    try:
+        logging.info(f"Contando frequência de palavras (modo {mode}).")
+        print(f"Contando frequência de palavras (modo {mode}).")
+        counter = WordFrequencyCounter(mode=mode, k=k)
+        for tokens in token_batches:
+            counter.update(tokens)
+        logging.info(f"Frequências contadas sobre {counter.total} tokens.")
+        print(f"Frequências contadas sobre {counter.total} tokens.")
+        return counter
+    except Exception as e:
+        logging.error(f"Erro na contagem de frequência de palavras: {str(e)}")
+        print(f"Erro na contagem de frequência de palavras: {str(e)}")
+        return WordFrequencyCounter(mode=mode, k=k)
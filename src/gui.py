@@ -1,18 +1,44 @@
 # src/gui.py
 
 import tkinter as tk
-from tkinter import filedialog, messagebox
+from tkinter import filedialog, messagebox, ttk
 import logging
 import os
+import queue
+import threading
+
+# Intervalo, em milissegundos, entre as leituras dos eventos de progresso da análise
+PROGRESS_POLL_MS = 100
+# Largura máxima da prévia da nuvem de palavras, em pixels
+PREVIEW_WIDTH = 400
+# Número de palavras-chave exibidas na prévia
+PREVIEW_KEYWORDS = 10
 
 class TextMiningGUI:
 
-    def __init__(self, master):
+    def __init__(self, master, run_analysis=None, stages=()):
+        """
+        Parâmetros:
+            master (tk.Tk): Janela principal.
+            run_analysis (callable): Função run_analysis(input_file, output_folder, progress, cancel_event)
+                executada em segundo plano; progress recebe os eventos de cada etapa (ver main.run_pipeline).
+                None mantém o comportamento anterior: a janela fecha e devolve os caminhos selecionados.
+            stages (list): Nomes das etapas da análise, para a barra de progresso.
+        """
         self.master = master
         master.title("Advanced Text Mining Toolkit")
 
         self.input_file = None
         self.output_folder = None
+        self.run_analysis = run_analysis
+        self.stages = list(stages)
+        self.result = None
+        self.events = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.worker = None
+        self.closing = False
+        # Referência mantida para que o Tk não descarte a imagem exibida
+        self.word_cloud_image = None
 
         # Botão para selecionar arquivo de entrada
         self.select_input_button = tk.Button(master, text="Selecionar Arquivo de Entrada", command=self.select_input_file)
@@ -26,6 +52,28 @@ class TextMiningGUI:
         self.start_button = tk.Button(master, text="Iniciar Análise", command=self.start_analysis)
         self.start_button.pack(pady=20)
 
+        if run_analysis is not None:
+            # Botão para cancelar a análise em andamento (entre etapas)
+            self.cancel_button = tk.Button(master, text="Cancelar", command=self.cancel_analysis, state=tk.DISABLED)
+            self.cancel_button.pack(pady=5)
+
+            self.status_label = tk.Label(master, text="Selecione o arquivo e a pasta de saída.")
+            self.status_label.pack(pady=5)
+            self.progress_bar = ttk.Progressbar(master, maximum=max(len(self.stages), 1), length=PREVIEW_WIDTH)
+            self.progress_bar.pack(pady=5)
+
+            # Tempo de cada etapa, à medida que terminam
+            self.timings_list = tk.Listbox(master, height=max(len(self.stages), 5), width=60)
+            self.timings_list.pack(pady=5)
+
+            # Resultados parciais: palavras-chave e nuvem de palavras
+            self.keywords_list = tk.Listbox(master, height=PREVIEW_KEYWORDS, width=60)
+            self.keywords_list.pack(pady=5)
+            self.word_cloud_label = tk.Label(master)
+            self.word_cloud_label.pack(pady=5)
+
+            master.protocol("WM_DELETE_WINDOW", self.close)
+
     def select_input_file(self):
         self.input_file = filedialog.askopenfilename(
             title="Selecionar Arquivo",
@@ -54,5 +102,107 @@ class TextMiningGUI:
         if not self.input_file or not self.output_folder:
             messagebox.showerror("Erro", "Por favor, selecione um arquivo de entrada e uma pasta de saída.")
             return
-        # Fecha a janela GUI e retorna os caminhos selecionados
-        self.master.quit()
+        if self.run_analysis is None:
+            # Fecha a janela GUI e retorna os caminhos selecionados
+            self.master.quit()
+            return
+
+        # Executa a análise em segundo plano; a janela continua respondendo e recebe o progresso pela fila
+        for button in (self.select_input_button, self.select_output_button, self.start_button):
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.cancel_event.clear()
+        self.progress_bar['value'] = 0
+        self.timings_list.delete(0, tk.END)
+        self.keywords_list.delete(0, tk.END)
+        self.status_label.config(text="Iniciando análise...")
+        self.worker = threading.Thread(target=self._run_worker, args=(self.input_file, self.output_folder),
+                                       daemon=True)
+        self.worker.start()
+        self.master.after(PROGRESS_POLL_MS, self._poll_events)
+
+    def _run_worker(self, input_file, output_folder):
+        # Executado na thread de análise: não acessa os widgets, apenas publica eventos na fila
+        result = False
+        try:
+            result = self.run_analysis(input_file, output_folder, self.events.put, self.cancel_event)
+        except Exception as e:
+            logging.error(f"Erro durante a análise: {str(e)}")
+        finally:
+            self.events.put({'event': 'done', 'result': result})
+
+    def _poll_events(self):
+        # Executado na thread do Tk a cada PROGRESS_POLL_MS enquanto a análise está em andamento
+        while True:
+            try:
+                event = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if event['event'] == 'done':
+                self._finish(event['result'])
+                return
+            self._handle_event(event)
+        self.master.after(PROGRESS_POLL_MS, self._poll_events)
+
+    def _handle_event(self, event):
+        stage = event.get('stage')
+        if event['event'] == 'started':
+            self.status_label.config(text=f"Executando etapa '{stage}'...")
+        elif event['event'] == 'finished':
+            self.progress_bar['value'] = self.progress_bar['value'] + 1
+            origin = " (checkpoint)" if event.get('cached') else ""
+            self.timings_list.insert(tk.END, f"{stage}: {event['seconds']:.2f} s{origin}")
+            self._show_partial_results(event.get('values') or {})
+        elif event['event'] == 'cancelled':
+            self.status_label.config(text=f"Análise cancelada na etapa '{stage}'.")
+
+    def _show_partial_results(self, values):
+        """
+        Exibe os resultados de uma etapa assim que ela termina (palavras-chave e nuvem de palavras).
+        """
+        if values.get('keywords'):
+            self.keywords_list.delete(0, tk.END)
+            for keyword, score in values['keywords'][:PREVIEW_KEYWORDS]:
+                self.keywords_list.insert(tk.END, f"{keyword} ({score:.3f})")
+        path = values.get('word_cloud_path')
+        if path and os.path.exists(path):
+            try:
+                image = tk.PhotoImage(file=path)
+                factor = max(1, -(-image.width() // PREVIEW_WIDTH))
+                self.word_cloud_image = image.subsample(factor)
+                self.word_cloud_label.config(image=self.word_cloud_image)
+            except tk.TclError as e:
+                logging.warning(f"Não foi possível exibir a nuvem de palavras: {str(e)}")
+
+    def _finish(self, result):
+        self.result = result
+        self.worker = None
+        self.cancel_button.config(state=tk.DISABLED)
+        for button in (self.select_input_button, self.select_output_button, self.start_button):
+            button.config(state=tk.NORMAL)
+        if self.cancel_event.is_set():
+            self.status_label.config(text="Análise cancelada. As etapas concluídas ficam disponíveis.")
+        elif result:
+            self.status_label.config(text="Análise concluída. Os resultados foram salvos na pasta selecionada.")
+        else:
+            self.status_label.config(text="A análise falhou; consulte o log na pasta de saída.")
+        if self.closing:
+            self.master.quit()
+
+    def cancel_analysis(self):
+        """
+        Solicita o cancelamento; a análise para ao fim da etapa em andamento, ou imediatamente durante
+        uma análise supervisionada (correção ortográfica, tópicos, rede de entidades).
+        """
+        if self.worker is not None:
+            self.cancel_event.set()
+            self.cancel_button.config(state=tk.DISABLED)
+            self.status_label.config(text="Cancelando...")
+
+    def close(self):
+        # Fechar a janela durante a análise cancela-a e aguarda o fim da etapa atual
+        if self.worker is not None:
+            self.closing = True
+            self.cancel_analysis()
+        else:
+            self.master.quit()
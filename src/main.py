@@ -1,12 +1,22 @@
 # src/main.py
 
+import functools
 import os
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
 import subprocess
+import time
 import sys
 import logging
 from importlib import metadata
 
-from preprocessing import preprocess_text, text_statistics, count_syllables_pt
+from preprocessing import (
+    preprocess_text,
+    text_statistics,
+    count_syllables_pt,
+    language_profile,
+    segment_by_language
+)
 from analysis import (
     extract_entities,
     extract_pos_tags,
@@ -14,14 +24,15 @@ from analysis import (
     keyword_extraction,
     extract_relationships,
     lda_topic_modeling,
-    sentiment_analysis,
     analyze_connectors,
-    spelling_correction,
     readability_scores,
     extract_dates,
     extract_actions_and_responsibles,
     check_verb_agreement,
-    detect_person_changes
+    iter_sentence_persons,
+    summarize_person_changes,
+    sentiment_by_segment,
+    spelling_correction_by_segment
 )
 from visualization import (
     generate_word_cloud,
@@ -30,9 +41,20 @@ from visualization import (
     generate_topic_visualization,
     generate_action_flow
 )
-from database import store_data_in_database
+from database import store_data_in_database, index_document
+from report import generate_abnt_report
+from readers import iter_pdf_pages, iter_docx_paragraphs, iter_pptx_slides
+from token_corpus import build_token_corpus
+from frequency import count_word_frequencies
+from dedup import check_duplicate, mark_analyzed
+from parse_store import load_or_parse, content_hash
+from export import compact_export, export_analysis_results
+from work_queue import WorkQueue, job_output_folder, run_worker
+from manifest import RunManifest, file_fingerprint, load_checkpoint
+from budget import DEFAULT_BUDGETS, AnalysisCancelled, call_with_fallback, parse_budget, sample_text
+from workers import PRELOADABLE_MODELS, PreloadedPool
 from gui import TextMiningGUI
-from utils import download_nltk_packages, load_spacy_model
+from utils import download_nltk_packages
 
 import tkinter as tk
 from tkinter import filedialog, messagebox
@@ -40,6 +62,18 @@ from tkinter import filedialog, messagebox
 from datetime import datetime
 import logging
 
+# Número máximo de palavras da nuvem de palavras (padrão do WordCloud)
+WORD_CLOUD_MAX_WORDS = 200
+# Extensões aceitas por read_document (usadas para expandir pastas na fila de documentos)
+SUPPORTED_EXTENSIONS = ('.txt', '.docx', '.pdf', '.xlsx', '.xls', '.csv', '.pptx', '.html', '.htm')
+# Modos mais baratos usados quando uma análise excede o orçamento (ver budget.DEFAULT_BUDGETS)
+SPELLING_SAMPLE_CHARS = 20000
+LDA_FALLBACK_PASSES = 1
+ENTITY_NETWORK_FALLBACK_ENTITIES = 50
+# Banco de quase duplicatas e de busca compartilhado pelos documentos de um lote ou de uma fila,
+# na raiz das saídas (sem --index_path, cada documento teria o seu e nunca seria comparado aos demais)
+CORPUS_INDEX_DB = 'corpus_index.db'
+
 def setup_logging(output_folder):
     """
     Configura o logging para o projeto.
@@ -156,30 +190,37 @@ def read_docx(file_path):
         str: Conteúdo do arquivo ou string vazia em caso de erro.
     """
     try:
-        import docx2txt
         logging.info(f"Lendo arquivo DOCX: {file_path}")
         print(f"Lendo arquivo DOCX: {file_path}")
-        return docx2txt.process(file_path)
+        return '\n'.join(iter_docx_paragraphs(file_path))
     except Exception as e:
         logging.error(f"Erro ao ler arquivo DOCX: {str(e)}")
         print(f"Erro ao ler arquivo DOCX: {str(e)}")
         return ""
 
-def read_pdf(file_path):
+def read_pdf(file_path, page_range=None, max_pages=None, workers=None):
     """
-    Lê arquivos PDF (.pdf).
+    Lê arquivos PDF (.pdf), extraindo as páginas em paralelo.
+
+    As análises do pipeline operam sobre o texto completo do documento, por isso as páginas são
+    concatenadas aqui e o pico de memória continua proporcional ao documento; consumidores que
+    processam página a página devem usar readers.iter_pdf_pages diretamente.
     
     Parâmetros:
         file_path (str): Caminho para o arquivo .pdf.
+        page_range (tuple): Intervalo (primeira, última) de páginas, base 1 e inclusivo. None para todas.
+        max_pages (int): Número máximo de páginas a extrair. None para não limitar.
+        workers (int): Número de processos de extração. None usa o número de CPUs, ou um único
+            processo quando a leitura já ocorre em um processo de trabalho (ver readers.iter_pdf_pages).
     
     Retorna:
         str: Conteúdo do arquivo ou string vazia em caso de erro.
     """
     try:
-        from pdfminer.high_level import extract_text
         logging.info(f"Lendo arquivo PDF: {file_path}")
         print(f"Lendo arquivo PDF: {file_path}")
-        return extract_text(file_path)
+        pages = iter_pdf_pages(file_path, page_range=page_range, max_pages=max_pages, workers=workers)
+        return ''.join(text for _, text in pages)
     except Exception as e:
         logging.error(f"Erro ao ler arquivo PDF: {str(e)}")
         print(f"Erro ao ler arquivo PDF: {str(e)}")
@@ -238,16 +279,9 @@ def read_pptx(file_path):
         str: Conteúdo das apresentações ou string vazia em caso de erro.
     """
     try:
-        from pptx import Presentation
         logging.info(f"Lendo arquivo PPTX: {file_path}")
         print(f"Lendo arquivo PPTX: {file_path}")
-        prs = Presentation(file_path)
-        text_runs = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
-                if hasattr(shape, "text"):
-                    text_runs.append(shape.text)
-        return ' '.join(text_runs)
+        return '\n'.join(text for _, text in iter_pptx_slides(file_path))
     except Exception as e:
         logging.error(f"Erro ao ler arquivo PPTX: {str(e)}")
         print(f"Erro ao ler arquivo PPTX: {str(e)}")
@@ -275,157 +309,605 @@ def read_html(file_path):
         print(f"Erro ao ler arquivo HTML: {str(e)}")
         return ""
 
-def main(input_file=None, output_folder=None):
+def _stage_read(state):
+    """
+    Etapa 'read': extrai o texto do documento.
+    """
+    print("Lendo e processando o documento...")
+    text = read_document(state['input_file'])
+    if not text:
+        raise ValueError("O documento está vazio ou não pôde ser lido.")
+    return {'text': text}, []
+
+def _stage_dedup(state):
+    """
+    Etapa 'dedup': registra o documento no índice de quase duplicatas; com dedup_mode='skip', encerra o pipeline
+    se ele for duplicata.
+    """
+    index_db = state['index_path'] or os.path.join(state['output_folder'], 'analysis_results.db')
+    skip = False
+    if state['dedup_mode'] != 'off':
+        duplicate = check_duplicate(state['text'], state['input_file'], index_db, state['output_folder'])
+        if duplicate['duplicate'] and state['dedup_mode'] == 'skip':
+            if duplicate['canonical_analyzed']:
+                logging.info(f"Análise ignorada: quase duplicata de {duplicate['canonical']}, "
+                             f"analisado em {duplicate['canonical_output']}.")
+                print(f"Análise ignorada: quase duplicata de {duplicate['canonical']}, "
+                      f"analisado em {duplicate['canonical_output']}.")
+                skip = True
+            else:
+                # A análise do canônico não foi concluída (em andamento ou com falha): este documento é analisado
+                logging.info(f"Quase duplicata de {duplicate['canonical']}, cuja análise não foi concluída; "
+                             "o documento será analisado.")
+    return {'index_db': index_db, 'skip': skip}, []
+
+def _stage_preprocess(state):
+    """
+    Etapa 'preprocess': detecta o idioma, segmenta o texto por idioma e gera os tokens pré-processados.
+    """
+    text = state['text']
+    profile = language_profile(text)
+    language = profile['language']
+    logging.info(f"Idioma detectado: {language}")
+    print(f"Idioma detectado: {language}")
+
+    # Só documentos cujas amostras indicaram idiomas diferentes são segmentados por parágrafo;
+    # cada segmento é pré-processado com o modelo e as stopwords do seu próprio idioma
+    if profile['mixed']:
+        segments = segment_by_language(text, language)
+    else:
+        segments = [{'language': language, 'text': text, 'start': 0, 'end': len(text)}]
+    tokens = []
+    for segment in segments:
+        tokens.extend(preprocess_text(segment['text'], segment['language']))
+    return {'language': language, 'segments': segments, 'tokens': tokens}, []
+
+def _shift_offsets(rows, offset):
+    """
+    Desloca os offsets 'start'/'end' de linhas calculadas sobre um segmento para o texto inteiro.
+    """
+    return [dict(row, start=row['start'] + offset, end=row['end'] + offset) for row in rows]
+
+def _parsed_analyses(segments, parse_store):
+    """
+    Executa os extratores baseados na análise sintática, segmento a segmento, com o modelo de cada idioma.
+
+    Um documento de um só idioma tem um único segmento com o texto inteiro. Os offsets de ações, erros
+    de concordância e mudanças de pessoa são relativos ao texto inteiro; as mudanças de pessoa são
+    detectadas sobre a sequência das sentenças de todos os segmentos.
+    """
+    results = {'entities': [], 'pos_tags': [], 'dependencies': [], 'relationships': [], 'actions': [],
+               'verb_agreement_errors': []}
+    sentence_persons = []
+    for segment in segments:
+        text, language, offset = segment['text'], segment['language'], segment['start']
+        # Análise sintática compartilhada pelos extratores baseados em dependências
+        try:
+            doc = load_or_parse(text, language, parse_store)
+        except Exception as e:
+            # Sem o Doc compartilhado (modelo ausente, DocBin corrompido), cada extrator tenta a própria análise
+            # e recorre ao seu resultado vazio, como antes do armazenamento de análises
+            logging.error(f"Erro na análise sintática compartilhada: {str(e)}")
+            print(f"Erro na análise sintática compartilhada: {str(e)}")
+            doc = None
+        results['entities'].extend(extract_entities(text, language, doc=doc))
+        # Só as 20 primeiras linhas vão para o relatório; materializá-las evita levar o StringStore ao checkpoint
+        results['pos_tags'].extend(extract_pos_tags(text, language, doc=doc)[:20].to_list())
+        results['dependencies'].extend(dependency_parsing(text, language, doc=doc)[:20].to_list())
+        # Poucas linhas por documento: a lista completa é materializada pelo mesmo motivo
+        results['relationships'].extend(extract_relationships(text, language, doc=doc).to_list())
+        results['actions'].extend(_shift_offsets(extract_actions_and_responsibles(text, language, doc=doc), offset))
+        results['verb_agreement_errors'].extend(
+            _shift_offsets(check_verb_agreement(text, language, doc=doc), offset))
+        # O modelo do idioma não carregou: o segmento não contribui com pessoas gramaticais
+        if doc is not None:
+            sentence_persons.extend(_shift_offsets(iter_sentence_persons(doc, language), offset))
+    results['pos_tags'] = results['pos_tags'][:20]
+    results['dependencies'] = results['dependencies'][:20]
+    results['person_changes'] = summarize_person_changes(sentence_persons)
+    return results
+
+def _stage_analysis(state):
+    """
+    Etapa 'analysis': executa as análises linguísticas sobre o texto e os tokens.
+
+    Em documentos mistos, as análises que dependem do idioma (entidades, extratores sintáticos,
+    ortografia e sentimento) rodam em cada segmento com o modelo do seu idioma e seus resultados
+    são concatenados; as demais usam o idioma predominante do documento.
+    """
+    text, language, segments, tokens = state['text'], state['language'], state['segments'], state['tokens']
+    print("Realizando análises...")
+    token_corpus = build_token_corpus([tokens])
+    # A nuvem de palavras usa no máximo WORD_CLOUD_MAX_WORDS palavras; só esse top-k é mantido
+    word_freq = dict(count_word_frequencies([tokens], state['frequency_mode'], k=WORD_CLOUD_MAX_WORDS).top_k())
+    parsed = _parsed_analyses(segments, state['parse_store'])
+    budgets, cancel_event = state['budgets'], state['cancel_event']
+    # A amostra do modo reduzido é repartida entre os segmentos
+    sampled_segments = [dict(segment, text=sample_text(segment['text'], SPELLING_SAMPLE_CHARS // len(segments)))
+                        for segment in segments]
+    spelling, spelling_mode = call_with_fallback('spelling_correction', [
+        ('full', spelling_correction_by_segment, (segments,), {}),
+        ('sampled', spelling_correction_by_segment, (sampled_segments,), {}),
+    ], budgets, default={}, cancel_event=cancel_event)
+    topics, topics_mode = call_with_fallback('lda_topic_modeling', [
+        ('full', lda_topic_modeling, (tokens, language), {'token_corpus': token_corpus}),
+        (f"passes={LDA_FALLBACK_PASSES}", lda_topic_modeling, (tokens, language),
+         {'token_corpus': token_corpus, 'passes': LDA_FALLBACK_PASSES}),
+    ], budgets, default=[], cancel_event=cancel_event)
+    modes = {'spelling_correction': spelling_mode, 'lda_topic_modeling': topics_mode}
+    # O sentimento por sentença sai da mesma passagem (e do mesmo modo) que o do documento
+    sentiment, sentences = sentiment_by_segment(segments, state['sentiment_mode'])
+    results = dict(parsed, **{
+        'degraded_analyses': {name: mode for name, mode in modes.items() if mode != 'ok'},
+        'word_freq': word_freq,
+        'keywords': keyword_extraction(text, language),
+        'topics': topics,
+        'sentiment': sentiment,
+        'sentences': sentences,
+        'stats': text_statistics(text),
+        'connectives': analyze_connectors(text, language),
+        'spelling': spelling,
+        'readability': readability_scores(text, language),
+        'dates': extract_dates(text, language),
+    })
+    return results, []
+
+def _stage_visualizations(state):
+    """
+    Etapa 'visualizations': gera as imagens do relatório.
+    """
+    print("Gerando visualizações...")
+    output_folder = state['output_folder']
+    paths = {
+        'word_cloud_path': os.path.join(output_folder, 'word_cloud.png'),
+        'entity_network_path': os.path.join(output_folder, 'entity_network.png'),
+        'dense_pixel_path': os.path.join(output_folder, 'dense_pixel_display.png'),
+        'topic_visualization_path': os.path.join(output_folder, 'topic_visualization.png'),
+        'action_flow_path': os.path.join(output_folder, 'action_flow.png'),
+    }
+    generate_word_cloud(state['word_freq'], paths['word_cloud_path'])
+    _, network_mode = call_with_fallback('generate_entity_network', [
+        ('spring', generate_entity_network, (state['entities'], paths['entity_network_path']), {}),
+        ('circular', generate_entity_network, (state['entities'], paths['entity_network_path']),
+         {'layout': 'circular', 'max_entities': ENTITY_NETWORK_FALLBACK_ENTITIES}),
+    ], state['budgets'], cancel_event=state['cancel_event'])
+    generate_dense_pixel_display(state['text'], paths['dense_pixel_path'])
+    generate_topic_visualization(state['topics'], paths['topic_visualization_path'])
+    generate_action_flow(state['actions'], paths['action_flow_path'])
+    degraded = dict(state['degraded_analyses'])
+    if network_mode != 'ok':
+        degraded['generate_entity_network'] = network_mode
+    return dict(paths, degraded_analyses=degraded), list(paths.values())
+
+def _method_explanations():
+    """
+    Gera as explicações detalhadas de cada seção do relatório.
+    """
+    sections = {
+        "Conectores e Preposições Mais Utilizados": "Análise das palavras que conectam ideias e estabelecem relações entre as partes do texto.",
+        "Sugestões de Correção Ortográfica": "Identificação de possíveis erros ortográficos e apresentação de sugestões de correção.",
+        "Avaliação de Legibilidade": "Utilização de índices de legibilidade para determinar a facilidade de leitura e compreensão do texto.",
+        "Frequência de Palavras": "Análise das palavras mais frequentes no texto para identificar os temas centrais.",
+        "Nuvem de Palavras": "Visualização gráfica das palavras mais frequentes, onde o tamanho de cada palavra é proporcional à sua frequência no texto.",
+        "Entidades Nomeadas": "Processo de identificação e classificação de elementos importantes no texto, como pessoas, organizações e locais.",
+        "Rede de Entidades": "Visualização que mostra as relações entre as entidades nomeadas identificadas no texto.",
+        "Modelagem de Tópicos": "Utilização de técnicas de modelagem de tópicos para identificar os principais assuntos discutidos no documento.",
+        "Visualização de Tópicos": "Representação gráfica dos tópicos identificados e sua relevância no texto.",
+        "Análise de Sentimento": "Avaliação da polaridade emocional do texto para determinar se é positivo, negativo ou neutro.",
+        "Dense Pixel Display": "Visualização que representa a intensidade e distribuição das palavras ao longo do texto, permitindo identificar padrões de uso e áreas com maior densidade de informação.",
+        "Extração de Datas": "Identificação de datas relevantes no documento.",
+        "Extração de Ações e Responsáveis": "Mapeamento das ações e seus responsáveis.",
+        "Verificação de Concordância Verbal": "Análise da concordância entre sujeito e verbo.",
+        "Detecção de Mudanças de Pessoa Gramatical": "Verificação da consistência na pessoa gramatical utilizada.",
+        "Fluxo de Ações": "Visualização do encadeamento lógico das ações.",
+        "Armazenamento de Dados": "Estruturação das informações em banco de dados.",
+        "Part-of-Speech Tagging": "Identificação das classes gramaticais das palavras no texto.",
+        "Análise de Dependências": "Análise das relações gramaticais entre as palavras.",
+        "Extração de Palavras-Chave": "Identificação das palavras mais relevantes no texto.",
+        "Extração de Relações": "Identificação de relações semânticas entre entidades.",
+    }
+    method_explanations = {}
+    for section, description in sections.items():
+        explanation = generate_method_explanation(section, description)
+        method_explanations[section] = explanation
+    return method_explanations
+
+def _analysis_results(state):
+    """
+    Monta o dicionário de resultados usado pelo banco de dados, pelo índice, pela exportação e pelo relatório.
+    """
+    return {
+        'document_path': state['input_file'],
+        'word_frequency': dict(list(state['word_freq'].items())[:20]),  # Top 20 palavras
+        'entities': state['entities'][:20],
+        'pos_tags': state['pos_tags'][:20],
+        'dependencies': state['dependencies'][:20],
+        'keywords': state['keywords'],
+        'relationships': state['relationships'][:20],
+        'topics': state['topics'][:5],
+        'sentiment': state['sentiment'],
+        'word_cloud_path': state['word_cloud_path'],
+        'entity_network_path': state['entity_network_path'],
+        'dense_pixel_path': state['dense_pixel_path'],
+        'topic_visualization_path': state['topic_visualization_path'],
+        'action_flow_path': state['action_flow_path'],
+        'text_statistics': state['stats'],
+        'connectives': state['connectives'],
+        'spelling_corrections': state['spelling'],
+        'readability': state['readability'],
+        'dates': state['dates'][:10],
+        'actions': state['actions'][:10],
+        'verb_agreement_errors': state['verb_agreement_errors'],
+        'person_changes': state['person_changes'],
+        # Análises que excederam o orçamento: modo mais barato usado, ou 'timed_out'/'memory_exceeded'
+        'degraded_analyses': state['degraded_analyses'],
+        'method_explanations': _method_explanations()
+    }
+
+def _stage_database(state):
+    """
+    Etapa 'database': armazena os resultados no banco de dados da pasta de saída.
+    """
+    print("Armazenando dados em banco de dados...")
+    store_data_in_database(_analysis_results(state), state['output_folder'])
+    return {}, [os.path.join(state['output_folder'], 'analysis_results.db')]
+
+def _stage_index(state):
+    """
+    Etapa 'index': indexa o documento no índice de busca.
+    """
+    # O índice de busca recebe as listas completas de entidades e datas, não só as exibidas no relatório
+    index_document(dict(_analysis_results(state), entities=state['entities'], dates=state['dates']),
+                   state['text'], state['index_db'], state['input_file'])
+    return {}, [state['index_db']]
+
+def _stage_export(state):
+    """
+    Etapa 'export': exporta os resultados para os datasets Parquet.
+    """
+    export_folder = state['export_folder'] or os.path.join(state['output_folder'], 'dataset')
+    # Exportação colunar com as listas completas, o texto pré-processado e o sentimento por sentença
+    export_analysis_results(
+        dict(_analysis_results(state), entities=state['entities'], keywords=state['keywords'],
+             tokens=state['tokens'], sentences=state['sentences']),
+        export_folder, content_hash(state['text']), state['language'])
+    return {}, [export_folder]
+
+def _stage_report(state):
+    """
+    Etapa 'report': gera o relatório ABNT.
+    """
+    print("Gerando relatório...")
+    report_extensions = {'pdf': '.pdf', 'html': '.html', 'markdown': '.md'}
+    report_format = state['report_format']
+    report_path = os.path.join(state['output_folder'],
+                               'relatorio_analise_abnt' + report_extensions.get(report_format, '.pdf'))
+    generate_abnt_report(_analysis_results(state), report_path, report_format)
+    return {'report_path': report_path}, [report_path]
+
+# Etapas do pipeline, na ordem de execução; com um manifesto, cada etapa concluída é gravada em checkpoint
+PIPELINE_STAGES = {
+    'read': _stage_read,
+    'dedup': _stage_dedup,
+    'preprocess': _stage_preprocess,
+    'analysis': _stage_analysis,
+    'visualizations': _stage_visualizations,
+    'database': _stage_database,
+    'index': _stage_index,
+    'export': _stage_export,
+    'report': _stage_report,
+}
+
+def _cancel_run(run_manifest, document, stage, progress):
+    """
+    Registra o cancelamento da análise no manifesto e no progresso.
+    """
+    if run_manifest:
+        run_manifest.cancel(document)
+    if progress:
+        progress({'stage': stage, 'event': 'cancelled'})
+    return False
+
+def run_pipeline(input_file, output_folder, report_format='pdf', frequency_mode='exact', index_path=None,
+                 dedup_mode='link', sentiment_mode='transformer', parse_store=None, export_folder=None,
+                 manifest=None, budgets=None, progress=None, cancel_event=None):
+    """
+    Executa as etapas da análise (PIPELINE_STAGES) sobre um documento.
+
+    Com um manifesto de execução, cada etapa concluída grava um checkpoint; se a execução for
+    interrompida, a próxima ignora o documento (se concluído) ou retoma a partir da primeira
+    etapa não concluída. Documentos que falham repetidamente vão para a quarentena.
+
+    Parâmetros:
+        input_file (str): Caminho para o arquivo de entrada.
+        output_folder (str): Caminho para a pasta de saída.
+        manifest (str): Banco SQLite do manifesto da execução (ver manifest.RunManifest). None para não
+            gravar checkpoints.
+        budgets (dict): Orçamentos de tempo e memória por análise (ver budget.call_with_fallback).
+            None usa budget.DEFAULT_BUDGETS; {} desativa a supervisão.
+        progress (callable): Recebe um dict por evento: {'stage', 'event': 'started'}, {'stage', 'event': 'finished',
+            'seconds', 'cached', 'values'} (resultado da etapa) e {'stage', 'event': 'cancelled'}.
+        cancel_event (threading.Event): Se definido, a análise para antes da próxima etapa, ou durante a etapa
+            se uma análise supervisionada (ver budget.call_with_fallback) estiver em andamento; com um
+            manifesto, as etapas concluídas são retomadas na próxima execução.
+        Demais parâmetros: ver main.
+
+    Retorna:
+        bool: True se a análise foi concluída (ou ignorada como duplicata), False em caso de erro, cancelamento
+        ou quarentena.
+    """
+    options = {'report_format': report_format, 'frequency_mode': frequency_mode, 'index_path': index_path,
+               'dedup_mode': dedup_mode, 'sentiment_mode': sentiment_mode, 'parse_store': parse_store,
+               'export_folder': export_folder, 'budgets': budgets}
+    state = dict(options, input_file=input_file, output_folder=output_folder, cancel_event=cancel_event)
+    document = os.path.abspath(input_file)
+    run_manifest = RunManifest(manifest) if manifest else None
+    completed = {}
+    if run_manifest:
+        fingerprint = file_fingerprint(input_file) if os.path.exists(input_file) else None
+        run = run_manifest.start(document, output_folder, fingerprint, options)
+        if run['status'] != 'running':
+            message = ("já concluído" if run['status'] == 'done'
+                       else f"em quarentena após {run['failures']} falha(s)")
+            logging.info(f"Documento {input_file} ignorado: {message}.")
+            print(f"Documento {input_file} ignorado: {message}.")
+            return run['status'] == 'done'
+        completed = run['stages']
+
+    try:
+        print("Baixando recursos necessários...")
+        download_nltk_packages()
+
+        for stage, run_stage in PIPELINE_STAGES.items():
+            if cancel_event is not None and cancel_event.is_set():
+                logging.info(f"Análise cancelada antes da etapa '{stage}'.")
+                print(f"Análise cancelada antes da etapa '{stage}'.")
+                return _cancel_run(run_manifest, document, stage, progress)
+            if progress:
+                progress({'stage': stage, 'event': 'started'})
+            start = time.perf_counter()
+            values = load_checkpoint(completed[stage]) if stage in completed else None
+            cached = values is not None
+            if cached:
+                logging.info(f"Etapa '{stage}' já concluída; resultado carregado do checkpoint.")
+                print(f"Etapa '{stage}' já concluída.")
+            else:
+                try:
+                    values, outputs = run_stage(state)
+                except AnalysisCancelled as e:
+                    # O processo supervisionado foi encerrado; a etapa não gera checkpoint
+                    logging.info(f"Análise cancelada durante a etapa '{stage}' ({e}).")
+                    print(f"Análise cancelada durante a etapa '{stage}'.")
+                    return _cancel_run(run_manifest, document, stage, progress)
+                if run_manifest:
+                    run_manifest.complete_stage(document, output_folder, stage, values, outputs)
+            state.update(values)
+            if progress:
+                progress({'stage': stage, 'event': 'finished', 'seconds': time.perf_counter() - start,
+                          'cached': cached, 'values': values})
+            if state.get('skip'):
+                break
+
+        if state['dedup_mode'] != 'off' and not state.get('skip'):
+            mark_analyzed(state['text'], input_file, state['index_db'])
+        if run_manifest:
+            run_manifest.finish(document)
+        logging.info("Análise concluída com sucesso")
+        print("Análise concluída. Os resultados foram salvos na pasta selecionada.")
+        logging.info("advanced_text_mining_toolkit_with_LMs - GPT v15.py")
+        return True
+    except Exception as e:
+        logging.error(f"Erro durante a análise: {str(e)}")
+        print(f"Ocorreu um erro durante a análise: {str(e)}")
+        if run_manifest:
+            run_manifest.finish(document, e)
+        return False
+
+def main(input_file=None, output_folder=None, report_format='pdf', frequency_mode='exact', index_path=None,
+         dedup_mode='link', sentiment_mode='transformer', parse_store=None,
+         export_folder=None, manifest=None, budgets=None):
     """
     Função principal que coordena a análise de text mining.
     
     Parâmetros:
         input_file (str): Caminho para o arquivo de entrada.
         output_folder (str): Caminho para a pasta de saída.
+        report_format (str): Formato do relatório ('pdf', 'html' ou 'markdown').
+        frequency_mode (str): Contagem de frequência de palavras 'exact' ou 'approximate' (memória fixa).
+        index_path (str): Banco do índice de busca compartilhado pelo corpus. None usa analysis_results.db
+            (em lotes e filas, o padrão é o corpus_index.db da raiz das saídas; ver run_batch).
+        dedup_mode (str): Tratamento de quase duplicatas: 'off', 'link' (registra o grupo e analisa)
+            ou 'skip' (registra o grupo e não analisa).
+        sentiment_mode (str): Análise de sentimento 'transformer', 'lexicon' ou 'tiered' (léxico com
+            escalonamento das sentenças incertas para o transformer).
+        parse_store (str): Pasta do armazenamento de análises spaCy (DocBin). Documentos já analisados com
+            o mesmo modelo são carregados sem nova análise sintática.
+        export_folder (str): Pasta dos datasets Parquet compartilhados pelo corpus. None usa <output_folder>/dataset.
+        manifest (str): Banco do manifesto da execução, para retomar execuções interrompidas (ver run_pipeline).
+        budgets (dict): Orçamentos de tempo e memória por análise. None usa os padrões; {} desativa.
     
     Retorna:
-        None
+        bool: True se a análise foi concluída (ou ignorada como duplicata), False em caso de erro ou cancelamento.
     """
+    options = {'report_format': report_format, 'frequency_mode': frequency_mode, 'index_path': index_path,
+               'dedup_mode': dedup_mode, 'sentiment_mode': sentiment_mode, 'parse_store': parse_store,
+               'export_folder': export_folder, 'manifest': manifest, 'budgets': budgets}
     if not input_file or not output_folder:
+        # A análise é executada em segundo plano pela interface, que exibe o progresso e permite cancelar
         root = tk.Tk()
-        gui = TextMiningGUI(root)
+        gui = TextMiningGUI(root, functools.partial(_start_analysis, **options), list(PIPELINE_STAGES))
         root.mainloop()
-        input_file = gui.input_file
-        output_folder = gui.output_folder
+        root.destroy()
+        if gui.result is None:
+            print("Análise cancelada. Nenhum arquivo ou pasta de saída selecionado.")
+            return False
+        return gui.result
 
-    if not input_file or not output_folder:
-        print("Análise cancelada. Nenhum arquivo ou pasta de saída selecionado.")
-        return
+    return _start_analysis(input_file, output_folder, **options)
 
+def _start_analysis(input_file, output_folder, progress=None, cancel_event=None, **options):
+    """
+    Configura o logging na pasta de saída e executa o pipeline (a partir da linha de comando ou da interface).
+    """
     setup_logging(output_folder)
 
     logging.info("Iniciando análise de text mining avançada")
     print("Iniciando análise de text mining avançada")
 
-    try:
-        print("Baixando recursos necessários...")
-        download_nltk_packages()
+    return run_pipeline(input_file, output_folder, progress=progress, cancel_event=cancel_event, **options)
 
-        print("Lendo e processando o documento...")
-        # Ler e processar o documento
-        text = read_document(input_file)
-        if not text:
-            raise ValueError("O documento está vazio ou não pôde ser lido.")
-
-        from langdetect import detect
-        language = detect(text)
-        language = 'pt' if language.startswith('pt') else 'en'
-        logging.info(f"Idioma detectado: {language}")
-        print(f"Idioma detectado: {language}")
-
-        tokens = preprocess_text(text, language)
-
-        # Realizar análises
-        print("Realizando análises...")
-        word_freq = dict(pd.Series(tokens).value_counts())
-        entities = extract_entities(text, language)
-        pos_tags = extract_pos_tags(text, language)
-        dependencies = dependency_parsing(text, language)
-        keywords = keyword_extraction(text, language)
-        relationships = extract_relationships(text, language)
-        topics = lda_topic_modeling(tokens, language)
-        sentiment = sentiment_analysis(text, language)
-        stats = text_statistics(text)
-        connectives = analyze_connectors(text, language)
-        spelling = spelling_correction(text, language)
-        readability = readability_scores(text, language)
-        dates = extract_dates(text)
-        actions = extract_actions_and_responsibles(text, language)
-        verb_agreement_errors = check_verb_agreement(text, language)
-        person_changes = detect_person_changes(text, language)
-
-        # Gerar visualizações
-        print("Gerando visualizações...")
-        word_cloud_path = os.path.join(output_folder, 'word_cloud.png')
-        generate_word_cloud(word_freq, word_cloud_path)
-
-        entity_network_path = os.path.join(output_folder, 'entity_network.png')
-        generate_entity_network(entities, entity_network_path)
-
-        dense_pixel_path = os.path.join(output_folder, 'dense_pixel_display.png')
-        generate_dense_pixel_display(text, dense_pixel_path)
-
-        topic_visualization_path = os.path.join(output_folder, 'topic_visualization.png')
-        generate_topic_visualization(topics, topic_visualization_path)
-
-        action_flow_path = os.path.join(output_folder, 'action_flow.png')
-        generate_action_flow(actions, action_flow_path)
-
-        # Gerar explicações detalhadas para cada seção
-        method_explanations = {}
-        sections = {
-            "Conectores e Preposições Mais Utilizados": "Análise das palavras que conectam ideias e estabelecem relações entre as partes do texto.",
-            "Sugestões de Correção Ortográfica": "Identificação de possíveis erros ortográficos e apresentação de sugestões de correção.",
-            "Avaliação de Legibilidade": "Utilização de índices de legibilidade para determinar a facilidade de leitura e compreensão do texto.",
-            "Frequência de Palavras": "Análise das palavras mais frequentes no texto para identificar os temas centrais.",
-            "Nuvem de Palavras": "Visualização gráfica das palavras mais frequentes, onde o tamanho de cada palavra é proporcional à sua frequência no texto.",
-            "Entidades Nomeadas": "Processo de identificação e classificação de elementos importantes no texto, como pessoas, organizações e locais.",
-            "Rede de Entidades": "Visualização que mostra as relações entre as entidades nomeadas identificadas no texto.",
-            "Modelagem de Tópicos": "Utilização de técnicas de modelagem de tópicos para identificar os principais assuntos discutidos no documento.",
-            "Visualização de Tópicos": "Representação gráfica dos tópicos identificados e sua relevância no texto.",
-            "Análise de Sentimento": "Avaliação da polaridade emocional do texto para determinar se é positivo, negativo ou neutro.",
-            "Dense Pixel Display": "Visualização que representa a intensidade e distribuição das palavras ao longo do texto, permitindo identificar padrões de uso e áreas com maior densidade de informação.",
-            "Extração de Datas": "Identificação de datas relevantes no documento.",
-            "Extração de Ações e Responsáveis": "Mapeamento das ações e seus responsáveis.",
-            "Verificação de Concordância Verbal": "Análise da concordância entre sujeito e verbo.",
-            "Detecção de Mudanças de Pessoa Gramatical": "Verificação da consistência na pessoa gramatical utilizada.",
-            "Fluxo de Ações": "Visualização do encadeamento lógico das ações.",
-            "Armazenamento de Dados": "Estruturação das informações em banco de dados.",
-            "Part-of-Speech Tagging": "Identificação das classes gramaticais das palavras no texto.",
-            "Análise de Dependências": "Análise das relações gramaticais entre as palavras.",
-            "Extração de Palavras-Chave": "Identificação das palavras mais relevantes no texto.",
-            "Extração de Relações": "Identificação de relações semânticas entre entidades.",
-        }
-        for section, description in sections.items():
-            explanation = generate_method_explanation(section, description)
-            method_explanations[section] = explanation
-
-        # Preparar resultados
-        analysis_results = {
-            'word_frequency': dict(list(word_freq.items())[:20]),  # Top 20 palavras
-            'entities': entities[:20],
-            'pos_tags': pos_tags[:20],
-            'dependencies': dependencies[:20],
-            'keywords': keywords,
-            'relationships': relationships[:20],
-            'topics': topics[:5],
-            'sentiment': sentiment,
-            'word_cloud_path': word_cloud_path,
-            'entity_network_path': entity_network_path,
-            'dense_pixel_path': dense_pixel_path,
-            'topic_visualization_path': topic_visualization_path,
-            'action_flow_path': action_flow_path,
-            'text_statistics': stats,
-            'connectives': connectives,
-            'spelling_corrections': spelling,
-            'readability': readability,
-            'dates': dates[:10],
-            'actions': actions[:10],
-            'verb_agreement_errors': verb_agreement_errors,
-            'person_changes': person_changes,
-            'method_explanations': method_explanations
-        }
+def _run_batch_document(task):
+    """
+    Analisa um documento do lote (executada nos processos do PreloadedPool).
+    """
+    input_file, output_folder, manifest, options = task
+    return run_pipeline(input_file, job_output_folder(output_folder, input_file), manifest=manifest, **options)
+
+def _run_batch_in_pool(tasks, processes, manifest, models):
+    """
+    Analisa os documentos do lote em um PreloadedPool.
 
-        # Armazenar dados em banco de dados
-        print("Armazenando dados em banco de dados...")
-        store_data_in_database(analysis_results, output_folder)
+    Se um processo de trabalho morrer (OOM killer, falha no código nativo, SIGKILL), o pool falha com
+    BrokenProcessPool e não se sabe qual documento o derrubou; os documentos afetados são então
+    analisados de novo, um por vez, cada um em um pool de um só processo. O documento que derrubar
+    também esse processo tem a falha registrada no manifesto (e vai para a quarentena ao atingir o
+    limite de falhas).
 
-        # Gerar relatório ABNT
-        print("Gerando relatório...")
-        report_path = os.path.join(output_folder, 'relatorio_analise_abnt.pdf')
-        generate_abnt_report(analysis_results, report_path)
+    Retorna:
+        list: Resultado (True/False) de cada documento.
+    """
+    results, broken = [], []
+    with PreloadedPool(processes, models=models) as pool:
+        pool.memory_report()
+        futures = {pool.submit(_run_batch_document, task): task for task in tasks}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except BrokenProcessPool:
+                broken.append(futures[future])
+        if not broken:
+            pool.memory_report()
+    if broken:
+        logging.warning(f"Um processo de trabalho foi encerrado; {len(broken)} documento(s) serão analisados "
+                        f"isoladamente.")
+        print(f"Um processo de trabalho foi encerrado; {len(broken)} documento(s) serão analisados isoladamente.")
+    for task in broken:
+        with PreloadedPool(1, models=models) as pool:
+            try:
+                results.append(pool.submit(_run_batch_document, task).result())
+            except BrokenProcessPool:
+                error = "O processo de trabalho foi encerrado durante a análise."
+                logging.error(f"{task[0]}: {error}")
+                print(f"{task[0]}: {error}")
+                RunManifest(manifest).finish(os.path.abspath(task[0]), error)
+                results.append(False)
+    return results
+
+def run_batch(paths, output_folder, manifest=None, processes=1, **options):
+    """
+    Analisa vários documentos, com checkpoints no manifesto da execução.
 
-        logging.info("Análise concluída com sucesso")
-        print("Análise concluída. Os resultados foram salvos na pasta selecionada.")
-        logging.info("advanced_text_mining_toolkit_with_LMs - GPT v15.py")
-    except Exception as e:
-        logging.error(f"Erro durante a análise: {str(e)}")
-        print(f"Ocorreu um erro durante a análise: {str(e)}")
+    Com processes > 1, os documentos são distribuídos entre os processos de um PreloadedPool, que
+    compartilham os modelos carregados uma única vez no processo principal; os orçamentos das
+    análises continuam valendo dentro dos processos de trabalho, e a memória única (USS) de cada
+    processo é registrada após o pré-carregamento e ao final do lote.
+
+    Ao executar de novo o mesmo lote após uma interrupção, os documentos concluídos são ignorados
+    e só o documento em andamento é retomado (a partir da etapa interrompida). Com uma pasta de
+    exportação compartilhada (export_folder), os arquivos Parquet do lote são compactados ao final.
+
+    Parâmetros:
+        paths (list): Documentos e/ou pastas de documentos.
+        output_folder (str): Pasta raiz das saídas; cada documento recebe uma subpasta.
+        manifest (str): Banco do manifesto. None usa <output_folder>/run_manifest.db.
+        processes (int): Número de processos de trabalho. 1 analisa os documentos no próprio processo.
+        options: Demais argumentos de run_pipeline. Sem index_path, o lote usa <output_folder>/corpus_index.db.
+
+    Retorna:
+        dict: Número de documentos concluídos ('done') e não concluídos ('failed').
+    """
+    setup_logging(output_folder)
+    manifest = manifest or os.path.join(output_folder, 'run_manifest.db')
+    options = dict(options, index_path=options.get('index_path') or os.path.join(output_folder, CORPUS_INDEX_DB))
+    processed = {'done': 0, 'failed': 0}
+    tasks = [(input_file, output_folder, manifest, options) for input_file in expand_input_paths(paths)]
+    if processes > 1 and len(tasks) > 1:
+        # O transformer de sentimento só é pré-carregado se o modo de sentimento puder usá-lo
+        models = tuple(name for name in PRELOADABLE_MODELS
+                       if name != 'sentiment' or options.get('sentiment_mode', 'transformer') != 'lexicon')
+        results = _run_batch_in_pool(tasks, min(processes, len(tasks)), manifest, models)
+    else:
+        results = map(_run_batch_document, tasks)
+    for succeeded in results:
+        processed['done' if succeeded else 'failed'] += 1
+    if options.get('export_folder'):
+        compact_export(options['export_folder'])
+    quarantined = RunManifest(manifest).quarantined()
+    logging.info(f"Lote finalizado: {processed}; {len(quarantined)} documento(s) em quarentena.")
+    print(f"Lote finalizado: {processed['done']} concluído(s), {processed['failed']} não concluído(s).")
+    for document, failures, error in quarantined:
+        print(f"Em quarentena após {failures} falha(s): {document}: {error}")
+    return processed
+
+def expand_input_paths(paths):
+    """
+    Expande pastas nos documentos de formatos suportados que elas contêm (recursivamente).
+
+    Parâmetros:
+        paths (list): Caminhos de documentos e/ou pastas.
+
+    Retorna:
+        list: Caminhos dos documentos, em ordem.
+    """
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in sorted(os.walk(path)):
+                files.extend(os.path.join(folder, name) for name in sorted(names)
+                             if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS)
+        else:
+            files.append(path)
+    return files
+
+def enqueue_documents(queue_path, paths, output_folder, options=None, max_attempts=3):
+    """
+    Adiciona documentos à fila compartilhada (modo coordenador).
+
+    Parâmetros:
+        queue_path (str): Banco SQLite da fila (em um sistema de arquivos acessível a todos os hosts).
+        paths (list): Documentos e/ou pastas de documentos.
+        output_folder (str): Pasta raiz das saídas; cada documento recebe uma subpasta.
+        options (dict): Argumentos de main repassados aos processos de trabalho (ex.: report_format).
+            Sem index_path, os documentos da fila usam <output_folder>/corpus_index.db.
+        max_attempts (int): Tentativas por documento antes de marcá-lo como falho.
+
+    Retorna:
+        int: Número de documentos adicionados.
+    """
+    files = expand_input_paths(paths)
+    options = dict(options or {})
+    options['index_path'] = options.get('index_path') or os.path.join(os.path.abspath(output_folder), CORPUS_INDEX_DB)
+    added = WorkQueue(queue_path, max_attempts=max_attempts).enqueue(files, output_folder, options)
+    logging.info(f"{added} de {len(files)} documento(s) adicionados à fila {queue_path}.")
+    print(f"{added} de {len(files)} documento(s) adicionados à fila.")
+    return added
+
+def _process_job(job):
+    """
+    Analisa um documento reservado da fila.
+    """
+    return main(job['input_file'], job['output_folder'], **job['options'])
+
+def run_queue_worker(queue_path, lease_seconds=300, wait=False):
+    """
+    Processa documentos da fila compartilhada até ela esvaziar (modo de trabalho).
+
+    Vários processos, em um ou mais hosts, podem executar esta função sobre a mesma fila.
+
+    Retorna:
+        dict: Número de documentos concluídos e com falha por este processo.
+    """
+    return run_worker(queue_path, _process_job, lease_seconds=lease_seconds, wait=wait)
 
 def generate_method_explanation(section, description):
     """
@@ -445,9 +927,50 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Advanced Text Mining Analysis Toolkit")
     parser.add_argument('--test', action='store_true', help="Executa os testes internos.")
-    parser.add_argument('--input_file', type=str, help="Caminho para o arquivo de entrada.")
+    parser.add_argument('--input_file', type=str, help="Caminho para o arquivo de entrada (ou pasta, para um lote).")
     parser.add_argument('--output_folder', type=str, help="Caminho para a pasta de saída.")
+    parser.add_argument('--report_format', type=str, default='pdf', choices=['pdf', 'html', 'markdown'],
+                        help="Formato do relatório (html e markdown são mais leves para execuções em lote).")
+    parser.add_argument('--frequency_mode', type=str, default='exact', choices=['exact', 'approximate'],
+                        help="Contagem de frequência de palavras exata ou aproximada (memória fixa).")
+    parser.add_argument('--index_path', type=str, default=None,
+                        help="Banco do índice de busca compartilhado entre execuções (consulte com python src/database.py); "
+                             "em pastas e filas, o padrão é <output_folder>/corpus_index.db.")
+    parser.add_argument('--dedup', type=str, default='link', choices=['off', 'link', 'skip'],
+                        help="Quase duplicatas: registrar o grupo e analisar (link) ou não analisar (skip).")
+    parser.add_argument('--sentiment_mode', type=str, default='transformer', choices=['transformer', 'lexicon', 'tiered'],
+                        help="Sentimento pelo transformer, pelo léxico ou em camadas (léxico + transformer nas sentenças incertas).")
+    parser.add_argument('--parse_store', type=str, default=None,
+                        help="Pasta para armazenar e reaproveitar as análises sintáticas (DocBin do spaCy).")
+    parser.add_argument('--export_folder', type=str, default=None,
+                        help="Pasta dos datasets Parquet (compartilhe entre execuções para análises do corpus).")
+    parser.add_argument('--compact_export', action='store_true',
+                        help="Compacta os arquivos por documento de --export_folder (use quando não houver exportações em andamento).")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Processos de trabalho para analisar uma pasta (os modelos são carregados uma vez e compartilhados).")
+    parser.add_argument('--manifest', type=str, default=None,
+                        help="Manifesto da execução: documentos e etapas concluídos são ignorados ao reiniciar "
+                             "(padrão para pastas: <output_folder>/run_manifest.db).")
+    parser.add_argument('--budget', type=str, action='append', default=None, metavar='ANALISE=SEGUNDOS[:MB]',
+                        help="Orçamento de tempo (e memória) de uma análise, ex.: spelling_correction=60:1024. "
+                             "Pode ser repetido; substitui o orçamento padrão da análise.")
+    parser.add_argument('--no_budgets', action='store_true',
+                        help="Executa as análises sem supervisão de tempo e memória.")
+    parser.add_argument('--queue', type=str, default=None,
+                        help="Banco SQLite da fila de documentos compartilhada entre processos e hosts.")
+    parser.add_argument('--enqueue', type=str, nargs='+', default=None,
+                        help="Documentos ou pastas a adicionar à fila (as saídas ficam em subpastas de --output_folder).")
+    parser.add_argument('--worker', action='store_true',
+                        help="Processa documentos da fila até ela esvaziar.")
+    parser.add_argument('--wait', action='store_true',
+                        help="Com --worker, continua aguardando novos documentos quando a fila esvazia.")
+    parser.add_argument('--lease_seconds', type=float, default=300,
+                        help="Prazo da reserva de um documento; reservas vencidas voltam para a fila.")
+    parser.add_argument('--max_attempts', type=int, default=3,
+                        help="Tentativas por documento antes de marcá-lo como falho.")
     args = parser.parse_args()
+    budgets = {} if args.no_budgets else (dict(DEFAULT_BUDGETS, **dict(map(parse_budget, args.budget)))
+                                          if args.budget else None)
 
     if args.test:
         from tests.test_preprocessing import TestPreprocessing
@@ -464,5 +987,30 @@ if __name__ == "__main__":
 
         print("Todos os testes internos foram executados.")
         logging.info("Todos os testes internos foram executados.")
+    elif args.compact_export:
+        if not args.export_folder:
+            parser.error("--compact_export requer --export_folder.")
+        compact_export(args.export_folder)
+    elif args.queue:
+        if args.enqueue:
+            if not args.output_folder:
+                parser.error("--enqueue requer --output_folder.")
+            options = {'report_format': args.report_format, 'frequency_mode': args.frequency_mode,
+                       'index_path': args.index_path, 'dedup_mode': args.dedup, 'sentiment_mode': args.sentiment_mode,
+                       'parse_store': args.parse_store, 'export_folder': args.export_folder,
+                       'manifest': args.manifest, 'budgets': budgets}
+            enqueue_documents(args.queue, args.enqueue, args.output_folder, options, args.max_attempts)
+        if args.worker:
+            run_queue_worker(args.queue, args.lease_seconds, args.wait)
+        queue = WorkQueue(args.queue)
+        print(f"Situação da fila: {queue.counts()}")
+        for input_file, attempts, error in queue.failures():
+            print(f"Falhou após {attempts} tentativa(s): {input_file}: {error}")
+    elif args.input_file and os.path.isdir(args.input_file) and args.output_folder:
+        run_batch([args.input_file], args.output_folder, args.manifest, args.processes,
+                  report_format=args.report_format, frequency_mode=args.frequency_mode, index_path=args.index_path,
+                  dedup_mode=args.dedup, sentiment_mode=args.sentiment_mode, parse_store=args.parse_store,
+                  export_folder=args.export_folder, budgets=budgets)
     else:
-        main(args.input_file, args.output_folder)
+        main(args.input_file, args.output_folder, args.report_format, args.frequency_mode, args.index_path,
+             args.dedup, args.sentiment_mode, args.parse_store, args.export_folder, args.manifest, budgets)
@@ -0,0 +1,244 @@
+# src/manifest.py
+
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime
+
+# Falhas (processo interrompido ou erro) de um documento antes de ele ser colocado em quarentena
+DEFAULT_MAX_FAILURES = 3
+CHECKPOINT_FOLDER = '.checkpoints'
+
+MANIFEST_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS manifest_documents (
+        document TEXT PRIMARY KEY,
+        output_folder TEXT,
+        fingerprint TEXT,
+        options TEXT,
+        status TEXT,
+        failures INTEGER DEFAULT 0,
+        started_at TEXT,
+        finished_at TEXT,
+        error TEXT
+    );
+    CREATE TABLE IF NOT EXISTS manifest_stages (
+        document TEXT,
+        stage TEXT,
+        checkpoint TEXT,
+        outputs TEXT,
+        finished_at TEXT,
+        PRIMARY KEY (document, stage)
+    );
+'''
+
+
+def file_fingerprint(path):
+    """
+    Identifica a versão de um arquivo pelo tamanho e pela data de modificação, sem lê-lo.
+    """
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def save_checkpoint(values, path):
+    """
+    Grava o resultado de uma etapa com pickle (escrita atômica).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(values, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return path
+
+
+def load_checkpoint(path):
+    """
+    Carrega o resultado gravado de uma etapa, ou None se o arquivo não existir ou estiver corrompido.
+    """
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        logging.warning(f"Checkpoint inválido {path}: {str(e)}")
+        return None
+
+
+class RunManifest:
+    """
+    Manifesto de uma execução sobre um corpus, em um banco SQLite.
+
+    Registra, por documento, a situação ('running', 'done', 'failed', 'cancelled', 'quarantined'),
+    as etapas concluídas, o checkpoint e os arquivos gerados por cada etapa. Ao reiniciar a execução,
+    documentos concluídos são ignorados e, nos demais, as etapas concluídas são carregadas dos
+    checkpoints. Um documento que ainda consta como 'running' ao ser iniciado de novo derrubou
+    (ou estava em andamento quando caiu) o processo anterior e conta como falha; após
+    max_failures falhas ele vai para a quarentena e não é mais processado.
+    """
+
+    def __init__(self, db_path, max_failures=DEFAULT_MAX_FAILURES):
+        self.db_path = db_path
+        self.max_failures = max_failures
+        conn = self._connect()
+        try:
+            conn.executescript(MANIFEST_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=60, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def start(self, document, output_folder, fingerprint=None, options=None):
+        """
+        Registra o início do processamento de um documento.
+
+        Se o arquivo ou as opções da análise mudaram desde a execução anterior, as etapas
+        concluídas são descartadas.
+
+        Parâmetros:
+            document (str): Caminho do documento.
+            output_folder (str): Pasta de saída do documento.
+            fingerprint (str): Versão do arquivo (ver file_fingerprint).
+            options (dict): Opções da análise.
+
+        Retorna:
+            dict: 'status' ('running', 'done' ou 'quarantined'), 'failures' e 'stages'
+            (etapa -> caminho do checkpoint) das etapas já concluídas.
+        """
+        options = json.dumps(options or {}, sort_keys=True)
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._transaction() as conn:
+            row = conn.execute('SELECT fingerprint, options, status, failures FROM manifest_documents '
+                               'WHERE document = ?', (document,)).fetchone()
+            if row is None or row[:2] != (fingerprint, options):
+                conn.execute('DELETE FROM manifest_stages WHERE document = ?', (document,))
+                status, failures = None, 0
+            else:
+                status, failures = row[2], row[3]
+            if status == 'running':
+                failures += 1
+                logging.warning(f"O processamento anterior de {document} foi interrompido ({failures} falha(s)).")
+            if status not in ('done', 'quarantined'):
+                status = 'quarantined' if failures >= self.max_failures else 'running'
+                conn.execute('''
+                    INSERT OR REPLACE INTO manifest_documents
+                    (document, output_folder, fingerprint, options, status, failures, started_at, error)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, (SELECT error FROM manifest_documents WHERE document = ?))
+                ''', (document, output_folder, fingerprint, options, status, failures, now, document))
+            stages = dict(conn.execute('SELECT stage, checkpoint FROM manifest_stages WHERE document = ?',
+                                       (document,)))
+        return {'status': status, 'failures': failures, 'stages': stages}
+
+    def checkpoint_path(self, output_folder, stage):
+        return os.path.join(output_folder, CHECKPOINT_FOLDER, f"{stage}.pkl")
+
+    def complete_stage(self, document, output_folder, stage, values, outputs=None):
+        """
+        Grava o checkpoint da etapa e a registra como concluída.
+
+        Parâmetros:
+            values (dict): Resultado da etapa, usado pelas etapas seguintes.
+            outputs (list): Arquivos ou pastas gerados pela etapa.
+
+        Retorna:
+            str: Caminho do checkpoint.
+        """
+        path = save_checkpoint(values, self.checkpoint_path(output_folder, stage))
+        with self._transaction() as conn:
+            conn.execute('INSERT OR REPLACE INTO manifest_stages (document, stage, checkpoint, outputs, finished_at) '
+                         'VALUES (?, ?, ?, ?, ?)',
+                         (document, stage, path, json.dumps(outputs or []),
+                          datetime.now().isoformat(timespec='seconds')))
+        return path
+
+    def finish(self, document, error=None):
+        """
+        Registra o fim do processamento: 'done' se não houve erro; caso contrário 'failed' (ou
+        'quarantined' ao atingir max_failures), e o documento é tentado de novo na próxima execução.
+        """
+        with self._transaction() as conn:
+            if error is None:
+                conn.execute("UPDATE manifest_documents SET status = 'done', finished_at = ?, error = NULL "
+                             "WHERE document = ?", (datetime.now().isoformat(timespec='seconds'), document))
+            else:
+                conn.execute('''
+                    UPDATE manifest_documents
+                    SET failures = failures + 1, finished_at = ?, error = ?,
+                        status = CASE WHEN failures + 1 >= ? THEN 'quarantined' ELSE 'failed' END
+                    WHERE document = ?
+                ''', (datetime.now().isoformat(timespec='seconds'), str(error), self.max_failures, document))
+
+    def cancel(self, document):
+        """
+        Registra o cancelamento pelo usuário: não conta como falha, e as etapas concluídas são retomadas.
+        """
+        with self._transaction() as conn:
+            conn.execute("UPDATE manifest_documents SET status = 'cancelled' WHERE document = ?", (document,))
+
+    def release(self, document):
+        """
+        Libera da quarentena um documento (ex.: após corrigir o arquivo), zerando suas falhas.
+        """
+        with self._transaction() as conn:
+            conn.execute("UPDATE manifest_documents SET status = 'failed', failures = 0 WHERE document = ?",
+                         (document,))
+
+    def outputs(self, document):
+        """
+        Arquivos gerados por etapa para o documento.
+
+        Retorna:
+            dict: Etapa -> lista de arquivos ou pastas.
+        """
+        conn = self._connect()
+        try:
+            return {stage: json.loads(outputs) for stage, outputs in conn.execute(
+                'SELECT stage, outputs FROM manifest_stages WHERE document = ?', (document,))}
+        finally:
+            conn.close()
+
+    def summary(self):
+        """
+        Número de documentos por situação.
+        """
+        conn = self._connect()
+        try:
+            return dict(conn.execute('SELECT status, COUNT(*) FROM manifest_documents GROUP BY status'))
+        finally:
+            conn.close()
+
+    def quarantined(self):
+        """
+        Documentos em quarentena.
+
+        Retorna:
+            list: Tuplas (caminho, falhas, último erro).
+        """
+        conn = self._connect()
+        try:
+            return conn.execute("SELECT document, failures, error FROM manifest_documents "
+                                "WHERE status = 'quarantined' ORDER BY document").fetchall()
+        finally:
+            conn.close()
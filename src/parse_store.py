@@ -0,0 +1,128 @@
+# src/parse_store.py
+
+import hashlib
+import logging
+import os
+import tempfile
+from utils import load_spacy_model
+
+
+def content_hash(text):
+    """
+    Hash SHA-256 do texto, usado como chave do documento no armazenamento.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def model_id(nlp):
+    """
+    Identificador do modelo spaCy (idioma, nome e versão); análises de modelos diferentes não se misturam.
+    """
+    return f"{nlp.meta.get('lang', nlp.lang)}_{nlp.meta.get('name', 'model')}-{nlp.meta.get('version', '0')}"
+
+
+class ParseStore:
+    """
+    Armazenamento em disco de documentos spaCy já analisados, em arquivos DocBin.
+
+    Cada Doc (tokens, tags, morfologia, lemas, dependências e entidades) é gravado em
+    <raiz>/<modelo>/<hash[:2]>/<hash>.spacy, de modo que uma nova análise do mesmo texto com o
+    mesmo modelo é apenas desserializada, sem executar o pipeline.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.hits = 0
+        self.misses = 0
+
+    def path(self, text_hash, nlp):
+        return os.path.join(self.root, model_id(nlp), text_hash[:2], f"{text_hash}.spacy")
+
+    def get(self, text, nlp):
+        """
+        Carrega o Doc armazenado para o texto, ou None se ele ainda não foi analisado com este modelo.
+        """
+        from spacy.tokens import DocBin
+        path = self.path(content_hash(text), nlp)
+        if not os.path.exists(path):
+            return None
+        docs = list(DocBin().from_disk(path).get_docs(nlp.vocab))
+        # Protege contra arquivos corrompidos ou colisões de hash
+        if len(docs) != 1 or docs[0].text != text:
+            return None
+        return docs[0]
+
+    def put(self, doc, nlp):
+        """
+        Grava o Doc no armazenamento (escrita atômica, segura entre processos).
+        """
+        from spacy.tokens import DocBin
+        path = self.path(content_hash(doc.text), nlp)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        doc_bin = DocBin(store_user_data=False)
+        doc_bin.add(doc)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(doc_bin.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return path
+
+    def parse(self, text, nlp):
+        """
+        Retorna o Doc do texto, carregando-o do armazenamento ou analisando e gravando-o.
+        """
+        doc = self.get(text, nlp)
+        if doc is not None:
+            self.hits += 1
+            return doc
+        self.misses += 1
+        doc = nlp(text)
+        self.put(doc, nlp)
+        return doc
+
+    def parse_corpus(self, texts, nlp, batch_size=64, n_process=1):
+        """
+        Gera os Docs de um corpus na ordem original; só os textos ausentes passam pelo nlp.pipe.
+        """
+        texts = list(texts)
+        docs = [self.get(text, nlp) for text in texts]
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+        parsed = nlp.pipe((texts[i] for i in missing), batch_size=batch_size, n_process=n_process)
+        for i, doc in zip(missing, parsed):
+            self.put(doc, nlp)
+            docs[i] = doc
+        return docs
+
+
+def load_or_parse(text, language, store_path=None):
+    """
+    Analisa o texto com o modelo spaCy do idioma, reaproveitando o armazenamento de análises se informado.
+
+    Parâmetros:
+        text (str): O texto a ser analisado.
+        language (str): O idioma do texto ('en' ou 'pt').
+        store_path (str): Pasta do armazenamento DocBin. None analisa sem armazenar.
+
+    Retorna:
+        spacy.tokens.Doc: Documento analisado.
+    """
+    nlp = load_spacy_model(language)
+    if not store_path:
+        return nlp(text)
+    try:
+        store = ParseStore(store_path)
+        doc = store.parse(text, nlp)
+        origin = 'carregada do armazenamento' if store.hits else 'executada e armazenada'
+        logging.info(f"Análise sintática {origin} em {store_path}.")
+        print(f"Análise sintática {origin}.")
+        return doc
+    except Exception as e:
+        logging.error(f"Erro no armazenamento de análises: {str(e)}")
+        print(f"Erro no armazenamento de análises: {str(e)}")
+        return nlp(text)
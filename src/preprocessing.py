@@ -6,8 +6,206 @@ import pandas as pd
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.stem import WordNetLemmatizer
+from functools import lru_cache
 from utils import load_spacy_model
 
+# Tamanho máximo do cache de lemas (token, classe gramatical) -> lema
+LEMMA_CACHE_SIZE = 65536
+# Componentes do spaCy necessários para classes gramaticais e lemas
+TAGGING_COMPONENTS = {'tok2vec', 'tagger', 'morphologizer', 'attribute_ruler', 'lemmatizer'}
+# Classes gramaticais mantidas (substantivos, verbos, adjetivos, advérbios)
+ALLOWED_POS = {
+    'en': {'NN', 'NNS', 'NNP', 'NNPS', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ',
+           'JJ', 'JJR', 'JJS', 'RB', 'RBR', 'RBS'},
+    'pt': {'NOUN', 'PROPN', 'VERB', 'ADJ', 'ADV'},
+}
+
+_wordnet_lemmatizer = WordNetLemmatizer()
+
+def _language_votes(text, seed):
+    """
+    Retorna as probabilidades de idioma do langdetect para um trecho, com semente fixa.
+
+    Parâmetros:
+        text (str): Trecho a ser identificado.
+        seed (int): Semente do detector, para resultados determinísticos.
+
+    Retorna:
+        list: Lista de objetos Language (lang, prob); vazia se o trecho não tiver traços de idioma.
+    """
+    from langdetect import DetectorFactory, detect_langs
+    from langdetect.lang_detect_exception import LangDetectException
+    DetectorFactory.seed = seed
+    try:
+        return detect_langs(text)
+    except LangDetectException:
+        return []
+
+# Códigos do langdetect mapeados para os idiomas suportados; espanhol e galego são confusões
+# frequentes do detector em textos em português
+LANGUAGE_CODES = {'pt': 'pt', 'es': 'pt', 'gl': 'pt', 'en': 'en'}
+
+def _normalize_language(code):
+    """
+    Mapeia o código do langdetect para os idiomas suportados pelo toolkit ('pt' ou 'en').
+
+    Retorna:
+        str or None: 'pt', 'en' ou None para idiomas sem correspondência (o chamador mantém o idioma padrão).
+    """
+    return LANGUAGE_CODES.get(code.split('-')[0])
+
+def language_profile(text, sample_size=1000, max_samples=8, seed=0):
+    """
+    Identifica o idioma predominante do texto a partir de amostras de tamanho fixo.
+
+    Em vez de submeter o documento inteiro ao langdetect, até max_samples trechos de
+    sample_size caracteres, igualmente espaçados, são identificados com semente fixa
+    e os votos (ponderados pela probabilidade) são agregados.
+
+    Parâmetros:
+        text (str): O texto a ser identificado.
+        sample_size (int): Tamanho de cada amostra em caracteres.
+        max_samples (int): Número máximo de amostras.
+        seed (int): Semente do detector.
+
+    Retorna:
+        dict: 'language' ('pt' ou 'en'), 'votes' (peso por idioma) e 'mixed' (True se amostras
+        diferentes indicaram idiomas diferentes, caso em que vale segmentar o texto por idioma).
+    """
+    try:
+        logging.info("Detectando idioma do texto por amostragem.")
+        print("Detectando idioma do texto por amostragem.")
+        if len(text) <= sample_size * max_samples:
+            samples = [text[i:i + sample_size] for i in range(0, len(text), sample_size)][:max_samples]
+        else:
+            step = (len(text) - sample_size) // (max_samples - 1) if max_samples > 1 else 0
+            samples = []
+            for i in range(max_samples):
+                start = i * step
+                # Ajusta o início para a próxima fronteira de palavra
+                if start:
+                    space = text.find(' ', start, start + 50)
+                    start = space + 1 if space != -1 else start
+                samples.append(text[start:start + sample_size])
+        votes = {}
+        winners = set()
+        for sample in samples:
+            sample_votes = {}
+            for candidate in _language_votes(sample, seed):
+                language = _normalize_language(candidate.lang)
+                if language:
+                    sample_votes[language] = sample_votes.get(language, 0.0) + candidate.prob
+            for language, prob in sample_votes.items():
+                votes[language] = votes.get(language, 0.0) + prob
+            if sample_votes:
+                winners.add(max(sample_votes, key=sample_votes.get))
+        language = max(votes, key=votes.get) if votes else 'en'
+        logging.info(f"Idioma detectado: {language} (votos: {votes})")
+        print(f"Idioma detectado: {language}")
+        return {'language': language, 'votes': votes, 'mixed': len(winners) > 1}
+    except Exception as e:
+        logging.error(f"Erro na detecção de idioma: {str(e)}")
+        print(f"Erro na detecção de idioma: {str(e)}")
+        return {'language': 'en', 'votes': {}, 'mixed': False}
+
+def detect_language(text, sample_size=1000, max_samples=8, seed=0):
+    """
+    Identifica o idioma predominante do texto por amostragem (ver language_profile).
+
+    Retorna:
+        str: 'pt' ou 'en'.
+    """
+    return language_profile(text, sample_size, max_samples, seed)['language']
+
+def segment_by_language(text, default_language, min_length=80, seed=0):
+    """
+    Rotula cada parágrafo com seu idioma e agrupa parágrafos consecutivos do mesmo idioma.
+
+    Parágrafos curtos demais para uma identificação confiável herdam o idioma do segmento anterior
+    (ou default_language, no início do texto).
+
+    Parâmetros:
+        text (str): O texto a ser segmentado.
+        default_language (str): Idioma predominante do documento ('pt' ou 'en').
+        min_length (int): Tamanho mínimo, em caracteres, para identificar o idioma de um parágrafo.
+        seed (int): Semente do detector.
+
+    Retorna:
+        list: Lista de dicionários com 'language', 'text', 'start' e 'end' (offsets de caracteres).
+    """
+    try:
+        logging.info("Segmentando o texto por idioma.")
+        print("Segmentando o texto por idioma.")
+        segments = []
+        current_language = default_language
+        for match in re.finditer(r'[^\n]+', text):
+            paragraph = match.group()
+            if not paragraph.strip():
+                continue
+            if len(paragraph) >= min_length:
+                votes = _language_votes(paragraph, seed)
+                if votes:
+                    current_language = _normalize_language(votes[0].lang) or default_language
+            if segments and segments[-1]['language'] == current_language:
+                segments[-1]['end'] = match.end()
+            else:
+                segments.append({'language': current_language, 'start': match.start(), 'end': match.end()})
+        for segment in segments:
+            segment['text'] = text[segment['start']:segment['end']]
+        languages = sorted({segment['language'] for segment in segments})
+        logging.info(f"Segmentos por idioma: {len(segments)} ({languages})")
+        print(f"Segmentos por idioma: {len(segments)} ({languages})")
+        return segments
+    except Exception as e:
+        logging.error(f"Erro na segmentação por idioma: {str(e)}")
+        print(f"Erro na segmentação por idioma: {str(e)}")
+        return [{'language': default_language, 'text': text, 'start': 0, 'end': len(text)}]
+
+@lru_cache(maxsize=LEMMA_CACHE_SIZE)
+def _lemmatize_en(token, wordnet_pos):
+    """
+    Lematiza um token em inglês com o WordNet, memorizando o resultado por (token, classe gramatical).
+    """
+    return _wordnet_lemmatizer.lemmatize(token, wordnet_pos)
+
+def _wordnet_pos(tag):
+    """
+    Converte uma tag Penn Treebank na classe gramatical do WordNet ('n', 'v', 'a' ou 'r').
+    """
+    return {'J': 'a', 'V': 'v', 'R': 'r'}.get(tag[:1], 'n')
+
+def tag_and_lemmatize(tokens, language):
+    """
+    Atribui classe gramatical e lema a cada token em uma única passagem.
+
+    Para inglês, usa o tagger do NLTK e o WordNet com cache LRU de (token, classe) -> lema. Para
+    português, executa apenas os componentes de etiquetagem e lematização do spaCy (parser e NER
+    não são executados) sobre um Doc construído com os próprios tokens.
+
+    Parâmetros:
+        tokens (list): Lista de tokens.
+        language (str): Idioma do texto ('en' ou 'pt').
+
+    Retorna:
+        list: Lista de tuplas (token, classe gramatical, lema), alinhada com tokens.
+    """
+    if not tokens:
+        return []
+    if language == 'en':
+        import nltk
+        return [(token, tag, _lemmatize_en(token, _wordnet_pos(tag))) for token, tag in nltk.pos_tag(tokens)]
+    if language == 'pt':
+        from spacy.tokens import Doc
+        nlp = load_spacy_model(language)
+        doc = Doc(nlp.vocab, words=tokens)
+        for name, component in nlp.pipeline:
+            if name in TAGGING_COMPONENTS:
+                doc = component(doc)
+        return [(token.text, token.pos_, token.lemma_) for token in doc]
+    logging.warning("Idioma não suportado para POS tagging.")
+    print("Idioma não suportado para POS tagging.")
+    return [(token, None, token) for token in tokens]
+
 def filter_pos_tags(tokens, language):
     """
     Filtra tokens com base em suas classes gramaticais para evitar incluir preposições, artigos, etc.
@@ -22,24 +220,13 @@ def filter_pos_tags(tokens, language):
     try:
         logging.info("Filtrando tokens com base nas classes gramaticais.")
         print("Filtrando tokens com base nas classes gramaticais.")
-        if language == 'en':
-            import nltk
-            pos_tags = nltk.pos_tag(tokens)
-            # Definir quais POS tags incluir (substantivos, verbos, adjetivos, advérbios)
-            allowed_tags = {'NN', 'NNS', 'NNP', 'NNPS', 'VB', 'VBD', 'VBG', 'VBN', 'VBP', 'VBZ',
-                            'JJ', 'JJR', 'JJS', 'RB', 'RBR', 'RBS'}
-        elif language == 'pt':
-            nlp = load_spacy_model(language)
-            doc = nlp(' '.join(tokens))
-            allowed_tags = {'NOUN', 'PROPN', 'VERB', 'ADJ', 'ADV'}
-            pos_tags = [(token.text, token.pos_) for token in doc]
-        else:
+        if language not in ALLOWED_POS:
             logging.warning("Idioma não suportado para POS tagging.")
             print("Idioma não suportado para POS tagging.")
             return tokens  # Retorna sem filtrar
         
         # Filtrar tokens com base nas tags permitidas
-        filtered_tokens = [word for word, pos in pos_tags if pos in allowed_tags]
+        filtered_tokens = [word for word, pos, _ in tag_and_lemmatize(tokens, language) if pos in ALLOWED_POS[language]]
         logging.info(f"Tokens após filtragem: {filtered_tokens}")
         print(f"Tokens após filtragem: {filtered_tokens}")
         return filtered_tokens
@@ -87,22 +274,12 @@ def preprocess_text(text, language):
         logging.info("Remoção de stopwords concluída.")
         print("Remoção de stopwords concluída.")
 
-        # Filtrar tokens com base nas classes gramaticais
-        tokens = filter_pos_tags(tokens, language)
-
-        # Lematização
-        if language == 'en':
-            lemmatizer = WordNetLemmatizer()
-            tokens = [lemmatizer.lemmatize(token) for token in tokens]
-            logging.info("Lematização para inglês concluída.")
-            print("Lematização para inglês concluída.")
-        else:
-            # Para português, usando spaCy
-            nlp = load_spacy_model(language)
-            doc = nlp(' '.join(tokens))
-            tokens = [token.lemma_ for token in doc]
-            logging.info("Lematização para português concluída.")
-            print("Lematização para português concluída.")
+        # Filtrar tokens com base nas classes gramaticais e lematizar, em uma única passagem
+        tagged = tag_and_lemmatize(tokens, language)
+        allowed_tags = ALLOWED_POS.get(language)
+        tokens = [lemma for _, pos, lemma in tagged if allowed_tags is None or pos in allowed_tags]
+        logging.info(f"Filtragem gramatical e lematização concluídas ({_lemmatize_en.cache_info()}).")
+        print("Filtragem gramatical e lematização concluídas.")
 
         logging.info("Pré-processamento do texto finalizado com sucesso.")
         print("Pré-processamento do texto finalizado com sucesso.")
@@ -0,0 +1,231 @@
+# src/readers.py
+
+import logging
+import multiprocessing
+import os
+import posixpath
+import re
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from xml.etree import ElementTree
+from workers import child_process_context
+
+# Namespaces dos formatos Office Open XML
+WORDML_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+DRAWINGML_NS = '{http://schemas.openxmlformats.org/drawingml/2006/main}'
+PRESENTATIONML_NS = '{http://schemas.openxmlformats.org/presentationml/2006/main}'
+RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PACKAGE_RELATIONSHIPS_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+def count_pdf_pages(file_path):
+    """
+    Conta as páginas de um PDF lendo apenas a árvore de páginas, sem interpretar o conteúdo.
+
+    Parâmetros:
+        file_path (str): Caminho para o arquivo .pdf.
+
+    Retorna:
+        int: Número de páginas.
+    """
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+    from pdfminer.pdftypes import resolve1
+
+    with open(file_path, 'rb') as fp:
+        document = PDFDocument(PDFParser(fp))
+        try:
+            return int(resolve1(document.catalog['Pages'])['Count'])
+        except (KeyError, TypeError, ValueError):
+            return sum(1 for _ in PDFPage.create_pages(document))
+
+def _extract_pdf_pages(file_path, page_numbers):
+    """
+    Extrai o texto de um bloco de páginas de um PDF (executado nos processos de trabalho).
+
+    Parâmetros:
+        file_path (str): Caminho para o arquivo .pdf.
+        page_numbers (list): Números das páginas (base 1), em ordem crescente.
+
+    Retorna:
+        list: Lista de tuplas (número da página, texto).
+    """
+    from io import StringIO
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    resource_manager = PDFResourceManager(caching=True)
+    laparams = LAParams()
+    pages = []
+    with open(file_path, 'rb') as fp:
+        pdf_pages = PDFPage.get_pages(fp, pagenos={n - 1 for n in page_numbers})
+        for page_number, page in zip(page_numbers, pdf_pages):
+            output = StringIO()
+            device = TextConverter(resource_manager, output, laparams=laparams)
+            PDFPageInterpreter(resource_manager, device).process_page(page)
+            device.close()
+            pages.append((page_number, output.getvalue()))
+    return pages
+
+def iter_pdf_pages(file_path, page_range=None, max_pages=None, workers=None, chunk_size=8):
+    """
+    Extrai as páginas de um PDF em paralelo e as entrega em ordem, à medida que ficam prontas.
+
+    As páginas são divididas em blocos processados por um pool de processos. No máximo
+    2 * workers blocos ficam em andamento, de modo que o consumidor pode começar a trabalhar
+    antes da extração da última página e a memória não cresce com o tamanho do documento.
+    Em um processo filho (ex.: um processo de trabalho de workers.PreloadedPool, que já divide as
+    CPUs com os demais), a extração é feita no próprio processo; com outras threads ativas, o pool
+    não é criado com fork (ver workers.child_process_context).
+
+    Parâmetros:
+        file_path (str): Caminho para o arquivo .pdf.
+        page_range (tuple): Intervalo (primeira, última) de páginas, base 1 e inclusivo. None para todas.
+        max_pages (int): Número máximo de páginas a extrair. None para não limitar.
+        workers (int): Número de processos. None usa o número de CPUs (1 em processos filhos);
+            1 extrai no processo atual.
+        chunk_size (int): Número de páginas por bloco enviado a cada processo.
+
+    Retorna:
+        generator: Tuplas (número da página, texto) em ordem crescente de página.
+    """
+    total_pages = count_pdf_pages(file_path)
+    first, last = page_range if page_range else (1, total_pages)
+    first, last = max(first, 1), min(last, total_pages)
+    page_numbers = list(range(first, last + 1))
+    if max_pages is not None:
+        page_numbers = page_numbers[:max_pages]
+    chunks = [page_numbers[i:i + chunk_size] for i in range(0, len(page_numbers), chunk_size)]
+    if workers is None:
+        workers = 1 if multiprocessing.parent_process() is not None else os.cpu_count() or 1
+    workers = min(workers, len(chunks))
+    logging.info(f"Extraindo {len(page_numbers)} de {total_pages} páginas de {file_path} com {workers} processo(s).")
+    print(f"Extraindo {len(page_numbers)} de {total_pages} páginas com {workers} processo(s).")
+
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _extract_pdf_pages(file_path, chunk)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=child_process_context())
+    try:
+        pending = deque()
+        remaining = iter(chunks)
+        for chunk in remaining:
+            pending.append(executor.submit(_extract_pdf_pages, file_path, chunk))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            pages = pending.popleft().result()
+            next_chunk = next(remaining, None)
+            if next_chunk is not None:
+                pending.append(executor.submit(_extract_pdf_pages, file_path, next_chunk))
+            yield from pages
+    finally:
+        # Se o consumidor interromper a leitura, blocos ainda não iniciados são descartados
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def _iter_xml_paragraphs(part, paragraph_tag, text_tag, break_tags=(), tab_tags=()):
+    """
+    Percorre uma parte XML de forma incremental e gera o texto de cada parágrafo.
+
+    Os elementos já processados são descartados durante a leitura, de modo que a memória
+    usada não depende do tamanho da parte. Parágrafos aninhados (caixas de texto) são
+    gerados separadamente.
+
+    Parâmetros:
+        part (file): Arquivo da parte XML aberto em modo binário.
+        paragraph_tag (str): Tag qualificada do parágrafo.
+        text_tag (str): Tag qualificada dos trechos de texto.
+        break_tags (tuple): Tags convertidas em quebra de linha.
+        tab_tags (tuple): Tags convertidas em tabulação.
+
+    Retorna:
+        generator: Texto de cada parágrafo, na ordem do documento.
+    """
+    stack = []
+    open_elements = []
+    for event, elem in ElementTree.iterparse(part, events=('start', 'end')):
+        if event == 'start':
+            open_elements.append(elem)
+            if elem.tag == paragraph_tag:
+                stack.append([])
+            continue
+        open_elements.pop()
+        if not stack:
+            continue
+        if elem.tag == text_tag:
+            stack[-1].append(elem.text or '')
+        elif elem.tag in break_tags:
+            stack[-1].append('\n')
+        elif elem.tag in tab_tags:
+            stack[-1].append('\t')
+        elif elem.tag == paragraph_tag:
+            yield ''.join(stack.pop())
+            if not stack and open_elements:
+                # Todos os irmãos anteriores já foram processados: libera-os da árvore
+                open_elements[-1].clear()
+
+def iter_docx_paragraphs(file_path):
+    """
+    Lê um arquivo .docx diretamente do pacote zip, gerando o texto parágrafo a parágrafo.
+
+    Apenas a parte word/document.xml é lida; imagens e demais mídias não são extraídas.
+
+    Parâmetros:
+        file_path (str): Caminho para o arquivo .docx.
+
+    Retorna:
+        generator: Texto de cada parágrafo (inclusive os de tabelas), na ordem do documento.
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open('word/document.xml') as part:
+        yield from _iter_xml_paragraphs(
+            part, WORDML_NS + 'p', WORDML_NS + 't',
+            break_tags=(WORDML_NS + 'br', WORDML_NS + 'cr'), tab_tags=(WORDML_NS + 'tab',)
+        )
+
+def _pptx_slide_parts(archive):
+    """
+    Lista as partes XML dos slides na ordem da apresentação.
+
+    Parâmetros:
+        archive (zipfile.ZipFile): Pacote .pptx aberto.
+
+    Retorna:
+        list: Nomes das partes dos slides (ex.: 'ppt/slides/slide1.xml').
+    """
+    try:
+        rels = ElementTree.fromstring(archive.read('ppt/_rels/presentation.xml.rels'))
+        targets = {rel.get('Id'): rel.get('Target') for rel in rels.iter(PACKAGE_RELATIONSHIPS_NS + 'Relationship')}
+        presentation = ElementTree.fromstring(archive.read('ppt/presentation.xml'))
+        parts = []
+        for slide_id in presentation.iter(PRESENTATIONML_NS + 'sldId'):
+            target = targets[slide_id.get(RELATIONSHIPS_NS + 'id')]
+            parts.append(target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('ppt', target)))
+        return parts
+    except KeyError:
+        # Pacote sem a lista de slides: usa a numeração dos arquivos
+        names = [n for n in archive.namelist() if re.fullmatch(r'ppt/slides/slide\d+\.xml', n)]
+        return sorted(names, key=lambda n: int(re.search(r'(\d+)\.xml$', n).group(1)))
+
+def iter_pptx_slides(file_path):
+    """
+    Lê um arquivo .pptx diretamente do pacote zip, gerando o texto slide a slide.
+
+    Apenas as partes XML dos slides são lidas; imagens e demais mídias não são extraídas.
+
+    Parâmetros:
+        file_path (str): Caminho para o arquivo .pptx.
+
+    Retorna:
+        generator: Tuplas (número do slide, texto), com os parágrafos do slide separados por quebra de linha.
+    """
+    with zipfile.ZipFile(file_path) as archive:
+        for number, name in enumerate(_pptx_slide_parts(archive), start=1):
+            with archive.open(name) as part:
+                paragraphs = _iter_xml_paragraphs(part, DRAWINGML_NS + 'p', DRAWINGML_NS + 't',
+                                                  break_tags=(DRAWINGML_NS + 'br',))
+                yield number, '\n'.join(p for p in paragraphs if p)
@@ -0,0 +1,422 @@
+# src/report.py
+
+import logging
+import os
+import struct
+from datetime import datetime
+from html import escape
+
+# Seções do relatório, na ordem de apresentação. Cada seção indica a chave da explicação
+# em 'method_explanations', a chave do resultado em 'analysis_results' e como exibi-lo.
+REPORT_SECTIONS = [
+    {'title': 'Estatísticas do Texto', 'key': 'text_statistics', 'headers': ('Métrica', 'Valor')},
+    {'title': 'Avaliação de Legibilidade', 'key': 'readability', 'headers': ('Índice', 'Valor')},
+    {'title': 'Frequência de Palavras', 'key': 'word_frequency', 'headers': ('Palavra', 'Frequência')},
+    {'title': 'Nuvem de Palavras', 'figure': 'word_cloud_path'},
+    {'title': 'Extração de Palavras-Chave', 'key': 'keywords', 'headers': ('Palavra-chave', 'TF-IDF')},
+    {'title': 'Entidades Nomeadas', 'key': 'entities', 'headers': ('Entidade', 'Rótulo')},
+    {'title': 'Rede de Entidades', 'figure': 'entity_network_path'},
+    {'title': 'Extração de Relações', 'key': 'relationships', 'headers': ('Entidade', 'Relação', 'Entidade')},
+    {'title': 'Part-of-Speech Tagging', 'key': 'pos_tags', 'headers': ('Token', 'Classe')},
+    {'title': 'Análise de Dependências', 'key': 'dependencies', 'headers': ('Token', 'Relação', 'Núcleo')},
+    {'title': 'Modelagem de Tópicos', 'key': 'topics', 'headers': ('Tópico', 'Termos')},
+    {'title': 'Visualização de Tópicos', 'figure': 'topic_visualization_path', 'per_topic': True},
+    {'title': 'Análise de Sentimento', 'key': 'sentiment', 'headers': ('Medida', 'Valor')},
+    {'title': 'Dense Pixel Display', 'figure': 'dense_pixel_path'},
+    {'title': 'Conectores e Preposições Mais Utilizados', 'key': 'connectives', 'headers': ('Categoria', 'Ocorrências')},
+    {'title': 'Sugestões de Correção Ortográfica', 'key': 'spelling_corrections', 'headers': ('Palavra', 'Sugestões')},
+    {'title': 'Extração de Datas', 'key': 'dates', 'headers': ('Data', 'Trecho'), 'fields': ('date', 'text')},
+    {'title': 'Extração de Ações e Responsáveis', 'key': 'actions', 'headers': ('Responsável', 'Ação'),
+     'fields': ('responsible', 'action')},
+    {'title': 'Fluxo de Ações', 'figure': 'action_flow_path'},
+    {'title': 'Verificação de Concordância Verbal', 'key': 'verb_agreement_errors',
+     'headers': ('Sujeito', 'Verbo', 'Erro'), 'fields': ('subject', 'verb', 'error')},
+    {'title': 'Detecção de Mudanças de Pessoa Gramatical', 'key': 'person_changes', 'subkey': 'changes',
+     'headers': ('De', 'Para', 'Início', 'Fim'), 'fields': ('from', 'to', 'start', 'end')},
+    {'title': 'Análises Limitadas por Orçamento', 'key': 'degraded_analyses', 'headers': ('Análise', 'Modo'),
+     'optional': True},
+]
+
+# Formatação ABNT (NBR 14724): margens superior/esquerda de 3 cm e inferior/direita de 2 cm,
+# fonte tamanho 12, espaçamento 1,5 e numeração no canto superior direito
+ABNT_MARGINS_CM = {'top': 3, 'left': 3, 'bottom': 2, 'right': 2}
+ABNT_FONT_SIZE = 12
+ABNT_LEADING = 18
+
+REPORT_FORMATS = {'.pdf': 'pdf', '.html': 'html', '.htm': 'html', '.md': 'markdown'}
+
+
+def _format_cell(value):
+    """
+    Converte um valor de resultado em texto para uma célula de tabela.
+    """
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    if isinstance(value, (list, tuple, set)):
+        return ', '.join(_format_cell(v) for v in value)
+    return str(value)
+
+
+def _section_rows(section, analysis_results):
+    """
+    Extrai as linhas de tabela de uma seção a partir dos resultados da análise.
+
+    Parâmetros:
+        section (dict): Definição da seção em REPORT_SECTIONS.
+        analysis_results (dict): Resultados da análise de um documento.
+
+    Retorna:
+        list: Lista de tuplas de strings (uma por linha).
+    """
+    value = analysis_results.get(section['key'])
+    if section.get('subkey') and isinstance(value, dict):
+        value = value.get(section['subkey'])
+    if not value:
+        return []
+    if isinstance(value, dict):
+        items = value.items()
+    else:
+        items = value
+    fields = section.get('fields')
+    rows = []
+    for item in items:
+        if isinstance(item, dict):
+            item = tuple(item.get(field, '') for field in fields)
+        rows.append(tuple(_format_cell(cell) for cell in item))
+    return rows
+
+
+def _section_figures(section, analysis_results):
+    """
+    Lista as imagens já geradas de uma seção (caminho e legenda), ignorando arquivos inexistentes.
+    """
+    path = analysis_results.get(section['figure'])
+    if not path:
+        return []
+    if section.get('per_topic'):
+        figures = [(f"{path[:-4]}_topic_{idx + 1}.png", f"{section['title']} - Tópico {idx + 1}")
+                   for idx in range(len(analysis_results.get('topics', [])))]
+    else:
+        figures = [(path, section['title'])]
+    return [(p, caption) for p, caption in figures if os.path.exists(p)]
+
+
+def iter_report_blocks(analysis_results):
+    """
+    Gera os blocos de conteúdo do relatório de um ou mais documentos, sem materializá-los.
+
+    Parâmetros:
+        analysis_results (dict or iterable): Resultados de um documento ou iterável de resultados (corpus).
+
+    Retorna:
+        generator: Tuplas ('document', título), ('heading', número, título), ('paragraph', texto com marcação
+        <b>), ('table', cabeçalhos, linhas), ('figure', caminho, legenda) e ('page_break',).
+    """
+    documents = [analysis_results] if isinstance(analysis_results, dict) else analysis_results
+    figure_number = 0
+    for doc_index, results in enumerate(documents):
+        if doc_index > 0:
+            yield ('page_break',)
+        document_path = results.get('document_path')
+        if document_path:
+            yield ('document', os.path.basename(document_path))
+        explanations = results.get('method_explanations', {})
+        section_number = 0
+        for section in REPORT_SECTIONS:
+            if 'figure' in section:
+                figures = _section_figures(section, results)
+                rows = None
+                if not figures:
+                    continue
+            else:
+                figures = []
+                rows = _section_rows(section, results)
+                if not rows and section.get('optional'):
+                    continue
+            section_number += 1
+            yield ('heading', section_number, section['title'])
+            explanation = explanations.get(section['title'])
+            if explanation:
+                yield ('paragraph', explanation.strip())
+            if rows is not None:
+                if rows:
+                    yield ('table', section['headers'], rows)
+                else:
+                    yield ('paragraph', 'Nenhum resultado encontrado.')
+            for path, caption in figures:
+                figure_number += 1
+                yield ('figure', path, f"Figura {figure_number} – {caption}")
+
+
+def _png_size(path):
+    """
+    Lê largura e altura de um PNG diretamente do cabeçalho IHDR, sem decodificar a imagem.
+
+    Parâmetros:
+        path (str): Caminho do arquivo PNG.
+
+    Retorna:
+        tuple or None: (largura, altura) em pixels, ou None se o arquivo não for PNG.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if len(header) < 24 or header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+class _FlowableStream(list):
+    """
+    Lista de flowables preenchida sob demanda a partir de um gerador.
+
+    O laço de BaseDocTemplate.build consome a lista pela frente; mantendo apenas uma pequena
+    janela em memória, flowables de páginas já diagramadas são descartados durante a geração.
+    """
+
+    def __init__(self, source, lookahead=32):
+        super().__init__()
+        self._source = iter(source)
+        self._lookahead = lookahead
+        self._fill()
+
+    def _fill(self):
+        while self._source is not None and list.__len__(self) < self._lookahead:
+            try:
+                self.append(next(self._source))
+            except StopIteration:
+                self._source = None
+
+    def __len__(self):
+        self._fill()
+        return list.__len__(self)
+
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def _pdf_styles():
+    """
+    Cria os estilos de parágrafo ABNT usados no relatório PDF.
+    """
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import cm
+
+    body = ParagraphStyle('ABNTBody', fontName='Times-Roman', fontSize=ABNT_FONT_SIZE, leading=ABNT_LEADING,
+                          alignment=TA_JUSTIFY, firstLineIndent=1.25 * cm, spaceAfter=6)
+    return {
+        'body': body,
+        'title': ParagraphStyle('ABNTTitle', parent=body, fontName='Times-Bold', alignment=TA_CENTER,
+                                firstLineIndent=0, spaceBefore=6 * cm, spaceAfter=2 * cm),
+        'document': ParagraphStyle('ABNTDocument', parent=body, fontName='Times-Bold', alignment=TA_CENTER,
+                                   firstLineIndent=0, spaceAfter=12),
+        'heading': ParagraphStyle('ABNTHeading', parent=body, fontName='Times-Bold', firstLineIndent=0,
+                                  spaceBefore=12, spaceAfter=6, keepWithNext=1),
+        'caption': ParagraphStyle('ABNTCaption', parent=body, fontSize=10, leading=12, alignment=TA_CENTER,
+                                  firstLineIndent=0),
+        'cell': ParagraphStyle('ABNTCell', parent=body, fontSize=10, leading=12, firstLineIndent=0,
+                               alignment=0, spaceAfter=0),
+    }
+
+
+def _escape_inline(text):
+    """
+    Escapa o texto para HTML (e para a marcação do reportlab), preservando apenas o negrito <b> das explicações.
+    """
+    return escape(text, quote=False).replace('&lt;b&gt;', '<b>').replace('&lt;/b&gt;', '</b>')
+
+
+def _iter_pdf_flowables(blocks, styles, frame_width):
+    """
+    Converte blocos do relatório em flowables do reportlab, um bloco por vez.
+
+    Parâmetros:
+        blocks (iterable): Blocos gerados por iter_report_blocks.
+        styles (dict): Estilos criados por _pdf_styles.
+        frame_width (float): Largura útil da página em pontos.
+
+    Retorna:
+        generator: Flowables do platypus.
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import Image, PageBreak, Paragraph, Spacer, Table, TableStyle
+
+    table_style = TableStyle([
+        ('FONT', (0, 0), (-1, 0), 'Times-Bold', 10),
+        ('LINEABOVE', (0, 0), (-1, 0), 0.75, colors.black),
+        ('LINEBELOW', (0, 0), (-1, 0), 0.5, colors.black),
+        ('LINEBELOW', (0, -1), (-1, -1), 0.75, colors.black),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ])
+    yield Paragraph('RELATÓRIO DE ANÁLISE DE TEXTO', styles['title'])
+    yield Paragraph(datetime.now().strftime('%d/%m/%Y'), styles['caption'])
+    yield PageBreak()
+    for block in blocks:
+        kind = block[0]
+        if kind == 'page_break':
+            yield PageBreak()
+        elif kind == 'document':
+            yield Paragraph(escape(block[1]).upper(), styles['document'])
+        elif kind == 'heading':
+            yield Paragraph(f"{block[1]} {escape(block[2]).upper()}", styles['heading'])
+        elif kind == 'paragraph':
+            yield Paragraph(_escape_inline(block[1]).replace('\n', '<br/>'), styles['body'])
+        elif kind == 'table':
+            headers, rows = block[1], block[2]
+            data = [list(headers)] + [[Paragraph(escape(cell), styles['cell']) for cell in row] for row in rows]
+            col_width = frame_width / len(headers)
+            table = Table(data, colWidths=[col_width] * len(headers), repeatRows=1)
+            table.setStyle(table_style)
+            yield table
+        elif kind == 'figure':
+            path, caption = block[1], block[2]
+            size = _png_size(path)
+            if size:
+                width, height = size
+                scale = min(1.0, frame_width / width, (frame_width * 0.75) / height)
+                # Dimensões fornecidas e lazy=2: o arquivo só é aberto no momento do desenho
+                yield Image(path, width=width * scale, height=height * scale, lazy=2)
+            else:
+                yield Image(path, width=frame_width, height=frame_width * 0.5, kind='bound', lazy=2)
+            yield Paragraph(escape(caption), styles['caption'])
+            yield Paragraph('Fonte: elaborado pelo autor.', styles['caption'])
+            yield Spacer(1, 12)
+
+
+def _write_pdf_report(analysis_results, report_path):
+    """
+    Gera o relatório PDF no formato ABNT consumindo os flowables sob demanda.
+    """
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate
+
+    def draw_page_number(canvas, doc):
+        # A capa não é numerada; as demais páginas recebem o número no canto superior direito
+        if doc.page > 1:
+            canvas.saveState()
+            canvas.setFont('Times-Roman', 10)
+            canvas.drawRightString(A4[0] - ABNT_MARGINS_CM['right'] * cm, A4[1] - 2 * cm, str(doc.page))
+            canvas.restoreState()
+
+    doc = SimpleDocTemplate(
+        report_path, pagesize=A4, pageCompression=1,
+        topMargin=ABNT_MARGINS_CM['top'] * cm, leftMargin=ABNT_MARGINS_CM['left'] * cm,
+        bottomMargin=ABNT_MARGINS_CM['bottom'] * cm, rightMargin=ABNT_MARGINS_CM['right'] * cm,
+        title='Relatório de Análise de Texto'
+    )
+    flowables = _iter_pdf_flowables(iter_report_blocks(analysis_results), _pdf_styles(), doc.width)
+    doc.build(_FlowableStream(flowables), onFirstPage=draw_page_number, onLaterPages=draw_page_number)
+
+
+def _markdown_inline(text):
+    """
+    Converte a marcação <b> das explicações em negrito Markdown.
+    """
+    return text.replace('<b>', '**').replace('</b>', '**')
+
+
+def _write_markdown_report(analysis_results, report_path):
+    """
+    Gera o relatório em Markdown, gravando cada bloco assim que é produzido.
+    """
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write(f"# RELATÓRIO DE ANÁLISE DE TEXTO\n\n{datetime.now().strftime('%d/%m/%Y')}\n\n")
+        for block in iter_report_blocks(analysis_results):
+            kind = block[0]
+            if kind == 'page_break':
+                f.write('\n---\n\n')
+            elif kind == 'document':
+                f.write(f"## {block[1]}\n\n")
+            elif kind == 'heading':
+                f.write(f"### {block[1]} {block[2].upper()}\n\n")
+            elif kind == 'paragraph':
+                f.write(f"{_markdown_inline(block[1])}\n\n")
+            elif kind == 'table':
+                headers, rows = block[1], block[2]
+                f.write('| ' + ' | '.join(headers) + ' |\n')
+                f.write('|' + '---|' * len(headers) + '\n')
+                for row in rows:
+                    f.write('| ' + ' | '.join(cell.replace('|', '\\|') for cell in row) + ' |\n')
+                f.write('\n')
+            elif kind == 'figure':
+                path = os.path.relpath(block[1], os.path.dirname(os.path.abspath(report_path)))
+                f.write(f"![{block[2]}]({path})\n\n*{block[2]}. Fonte: elaborado pelo autor.*\n\n")
+
+
+def _write_html_report(analysis_results, report_path):
+    """
+    Gera o relatório em HTML, gravando cada bloco assim que é produzido.
+    """
+    with open(report_path, 'w', encoding='utf-8') as f:
+        f.write('<!DOCTYPE html>\n<html lang="pt-BR">\n<head>\n<meta charset="utf-8">\n'
+                '<title>Relatório de Análise de Texto</title>\n<style>\n'
+                'body { font-family: "Times New Roman", serif; font-size: 12pt; line-height: 1.5; '
+                'margin: 3cm 2cm 2cm 3cm; text-align: justify; }\n'
+                'table { border-collapse: collapse; margin: 1em 0; }\n'
+                'th, td { border-bottom: 1px solid #000; padding: 2px 8px; font-size: 10pt; }\n'
+                'figure { text-align: center; } figcaption { font-size: 10pt; }\n'
+                '</style>\n</head>\n<body>\n')
+        f.write(f"<h1>RELATÓRIO DE ANÁLISE DE TEXTO</h1>\n<p>{datetime.now().strftime('%d/%m/%Y')}</p>\n")
+        for block in iter_report_blocks(analysis_results):
+            kind = block[0]
+            if kind == 'page_break':
+                f.write('<hr>\n')
+            elif kind == 'document':
+                f.write(f"<h2>{escape(block[1])}</h2>\n")
+            elif kind == 'heading':
+                f.write(f"<h3>{block[1]} {escape(block[2]).upper()}</h3>\n")
+            elif kind == 'paragraph':
+                f.write(f"<p>{_escape_inline(block[1])}</p>\n")
+            elif kind == 'table':
+                headers, rows = block[1], block[2]
+                f.write('<table>\n<tr>' + ''.join(f"<th>{escape(h)}</th>" for h in headers) + '</tr>\n')
+                for row in rows:
+                    f.write('<tr>' + ''.join(f"<td>{escape(cell)}</td>" for cell in row) + '</tr>\n')
+                f.write('</table>\n')
+            elif kind == 'figure':
+                path = os.path.relpath(block[1], os.path.dirname(os.path.abspath(report_path)))
+                f.write(f'<figure><img src="{escape(path)}" alt="{escape(block[2])}" style="max-width: 100%">'
+                        f"<figcaption>{escape(block[2])}<br>Fonte: elaborado pelo autor.</figcaption></figure>\n")
+        f.write('</body>\n</html>\n')
+
+
+def generate_abnt_report(analysis_results, report_path, output_format=None):
+    """
+    Gera o relatório da análise no formato ABNT.
+
+    Os blocos do relatório são produzidos sob demanda e gravados à medida que são diagramados,
+    de modo que relatórios de corpus com centenas de documentos mantêm o uso de memória estável.
+    As imagens já geradas são referenciadas pelo caminho, sem nova decodificação para a diagramação.
+
+    Parâmetros:
+        analysis_results (dict or iterable): Resultados de um documento ou iterável de resultados (corpus).
+        report_path (str): Caminho do arquivo de relatório.
+        output_format (str): 'pdf', 'html' ou 'markdown'. Se None, é inferido pela extensão do arquivo.
+
+    Retorna:
+        str: Caminho do relatório gerado, ou None em caso de erro.
+    """
+    try:
+        if output_format is None:
+            output_format = REPORT_FORMATS.get(os.path.splitext(report_path)[1].lower(), 'pdf')
+        logging.info(f"Gerando relatório ABNT ({output_format}).")
+        print(f"Gerando relatório ABNT ({output_format}).")
+        writers = {
+            'pdf': _write_pdf_report,
+            'html': _write_html_report,
+            'markdown': _write_markdown_report
+        }
+        if output_format not in writers:
+            logging.error(f"Formato de relatório não suportado: {output_format}")
+            print(f"Formato de relatório não suportado: {output_format}")
+            return None
+        writers[output_format](analysis_results, report_path)
+        logging.info(f"Relatório salvo em: {report_path}")
+        print(f"Relatório salvo em: {report_path}")
+        return report_path
+    except Exception as e:
+        logging.error(f"Erro ao gerar relatório: {str(e)}")
+        print(f"Erro ao gerar relatório: {str(e)}")
+        return None
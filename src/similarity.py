@@ -0,0 +1,318 @@
+# src/similarity.py
+
+import json
+import logging
+import os
+import shutil
+import numpy as np
+from token_corpus import TokenCorpus, Vocabulary
+
+DEFAULT_COMPONENTS = 256
+# Acima deste número de documentos o índice é particionado (IVF): a consulta compara o vetor com os
+# centroides das partições e calcula a similaridade apenas com os documentos das mais próximas
+PARTITION_THRESHOLD = 50000
+DEFAULT_PROBES = 8
+
+# Arquivos do índice
+META_FILE = 'meta.json'
+VECTORS_FILE = 'vectors.float32'
+IDS_FILE = 'ids.txt'
+VOCABULARY_FILE = 'vocabulary.txt'
+MODEL_FILE = 'model.npz'
+CENTROIDS_FILE = 'centroids.float32'
+PARTITIONS_FILE = 'partitions.int64'
+
+
+def _normalize_rows(matrix):
+    """
+    Normaliza as linhas (norma L2 = 1) e converte para float32; linhas nulas permanecem nulas.
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return matrix / norms
+
+
+def _tfidf(counts, idf):
+    """
+    Pondera a matriz de contagens por TF-IDF e normaliza as linhas, como o TfidfTransformer do scikit-learn.
+    """
+    from sklearn.preprocessing import normalize
+    return normalize(counts.multiply(idf).tocsr())
+
+
+def _top_k(scores, k):
+    """
+    Índices dos k maiores scores, em ordem decrescente (seleção parcial com argpartition, sem ordenar tudo).
+    """
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind='stable')]
+
+
+def _write_lines(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+
+def _read_lines(path):
+    with open(path, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def build_similarity_index(corpus, document_ids, path, n_components=DEFAULT_COMPONENTS,
+                           partition_threshold=PARTITION_THRESHOLD, n_partitions=None, seed=0):
+    """
+    Constrói o índice de similaridade LSA (TF-IDF seguido de SVD truncada) de um corpus e o grava em disco.
+
+    Os vetores dos documentos são normalizados, de modo que o produto escalar é a similaridade de
+    cosseno, e gravados como uma matriz float32 lida por mapeamento de memória. Corpora com mais de
+    partition_threshold documentos são agrupados em partições (k-means sobre os vetores), gravadas
+    de forma contígua.
+
+    Parâmetros:
+        corpus (TokenCorpus): Corpus de ids de tokens (em memória ou MappedTokenCorpus).
+        document_ids (list): Identificador de cada documento do corpus, na mesma ordem.
+        path (str): Pasta do índice (substituída se existir).
+        n_components (int): Dimensão dos vetores LSA.
+        partition_threshold (int): Número de documentos a partir do qual o índice é particionado.
+        n_partitions (int): Número de partições. None usa a raiz quadrada do número de documentos.
+        seed (int): Semente da SVD e do k-means.
+
+    Retorna:
+        SimilarityIndex: Índice aberto, ou None em caso de erro.
+    """
+    try:
+        from sklearn.decomposition import TruncatedSVD
+        from sklearn.feature_extraction.text import TfidfTransformer
+
+        logging.info("Construindo índice de similaridade de documentos.")
+        print("Construindo índice de similaridade de documentos.")
+        document_ids = [str(document_id) for document_id in document_ids]
+        if len(document_ids) != len(corpus):
+            raise ValueError("O número de identificadores difere do número de documentos do corpus.")
+        counts = corpus.to_csr()
+        tfidf = TfidfTransformer().fit(counts)
+        matrix = tfidf.transform(counts)
+        n_components = min(n_components, matrix.shape[1] - 1, matrix.shape[0])
+        if n_components < 1:
+            raise ValueError("Corpus pequeno demais para o índice de similaridade.")
+        svd = TruncatedSVD(n_components, random_state=seed).fit(matrix)
+        vectors = _normalize_rows(svd.transform(matrix))
+
+        meta = {'documents': len(document_ids), 'dimensions': n_components, 'partitions': 0}
+        centroids = offsets = None
+        if len(document_ids) > partition_threshold:
+            from sklearn.cluster import MiniBatchKMeans
+            n_partitions = n_partitions or int(np.sqrt(len(document_ids)))
+            kmeans = MiniBatchKMeans(n_partitions, random_state=seed, n_init=3, batch_size=4096).fit(vectors)
+            # Documentos de uma mesma partição ficam contíguos; cada partição é uma fatia da matriz
+            order = np.argsort(kmeans.labels_, kind='stable')
+            vectors = vectors[order]
+            document_ids = [document_ids[i] for i in order]
+            sizes = np.bincount(kmeans.labels_, minlength=n_partitions)
+            offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+            centroids = _normalize_rows(kmeans.cluster_centers_)
+            meta['partitions'] = n_partitions
+
+        tmp_path = f"{path.rstrip(os.sep)}.tmp"
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        os.makedirs(tmp_path)
+        vectors.tofile(os.path.join(tmp_path, VECTORS_FILE))
+        _write_lines(os.path.join(tmp_path, IDS_FILE), document_ids)
+        _write_lines(os.path.join(tmp_path, VOCABULARY_FILE), corpus.vocabulary.words)
+        np.savez(os.path.join(tmp_path, MODEL_FILE), idf=tfidf.idf_.astype(np.float32),
+                 components=svd.components_.astype(np.float32))
+        if centroids is not None:
+            centroids.tofile(os.path.join(tmp_path, CENTROIDS_FILE))
+            offsets.tofile(os.path.join(tmp_path, PARTITIONS_FILE))
+        with open(os.path.join(tmp_path, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+        logging.info(f"Índice de similaridade: {meta['documents']} documento(s), {n_components} dimensões, "
+                     f"{meta['partitions']} partição(ões), variância explicada "
+                     f"{svd.explained_variance_ratio_.sum():.2f}.")
+        print(f"Índice de similaridade gravado em {path}.")
+        return SimilarityIndex(path)
+    except Exception as e:
+        logging.error(f"Erro ao construir o índice de similaridade: {str(e)}")
+        print(f"Erro ao construir o índice de similaridade: {str(e)}")
+        return None
+
+
+class SimilarityIndex:
+    """
+    Índice de similaridade de documentos gravado por build_similarity_index.
+
+    A matriz de vetores é aberta com np.memmap e as consultas são produtos matriz-vetor do NumPy
+    sobre ela (ou sobre as partições mais próximas, em índices particionados).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, META_FILE)) as f:
+            self.meta = json.load(f)
+        shape = (self.meta['documents'], self.meta['dimensions'])
+        self.vectors = np.memmap(os.path.join(path, VECTORS_FILE), dtype=np.float32, mode='r', shape=shape)
+        self.ids = _read_lines(os.path.join(path, IDS_FILE))
+        self._positions = None
+        self._vocabulary = None
+        self._model = None
+        self.centroids = self.offsets = None
+        if self.meta['partitions']:
+            self.centroids = np.fromfile(os.path.join(path, CENTROIDS_FILE), dtype=np.float32).reshape(
+                self.meta['partitions'], self.meta['dimensions'])
+            self.offsets = np.fromfile(os.path.join(path, PARTITIONS_FILE), dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def position(self, document_id):
+        """
+        Linha do documento na matriz de vetores.
+        """
+        if self._positions is None:
+            self._positions = {document_id: i for i, document_id in enumerate(self.ids)}
+        return self._positions[str(document_id)]
+
+    def vector(self, document_id):
+        return np.array(self.vectors[self.position(document_id)])
+
+    def transform(self, token_lists):
+        """
+        Projeta novos documentos (listas de tokens) no espaço LSA do índice; palavras fora do vocabulário são ignoradas.
+
+        Retorna:
+            numpy.ndarray: Matriz float32 normalizada (documentos x dimensões).
+        """
+        if self._model is None:
+            self._vocabulary = Vocabulary(_read_lines(os.path.join(self.path, VOCABULARY_FILE)))
+            with np.load(os.path.join(self.path, MODEL_FILE)) as model:
+                self._model = {'idf': model['idf'], 'components': model['components']}
+        corpus = TokenCorpus(self._vocabulary)
+        for tokens in token_lists:
+            corpus.add_document(tokens, grow=False)
+        matrix = _tfidf(corpus.to_csr(), self._model['idf'])
+        return _normalize_rows(matrix @ self._model['components'].T)
+
+    def _candidates(self, query, n_probe):
+        # Posições dos documentos das n_probe partições cujos centroides são mais similares à consulta
+        partitions = _top_k(self.centroids @ query, n_probe)
+        return np.concatenate([np.arange(self.offsets[p], self.offsets[p + 1]) for p in partitions])
+
+    def search(self, query, k=10, n_probe=DEFAULT_PROBES, exclude=None):
+        """
+        Retorna os k documentos mais similares (cosseno) a um vetor de consulta.
+
+        Parâmetros:
+            query (numpy.ndarray): Vetor normalizado no espaço do índice (ver transform e vector).
+            k (int): Número de documentos.
+            n_probe (int): Partições examinadas em índices particionados (mais partições, mais precisão).
+            exclude (str): Documento a ignorar (ex.: o próprio documento consultado).
+
+        Retorna:
+            list: Tuplas (documento, similaridade), da mais similar para a menos similar.
+        """
+        query = np.asarray(query, dtype=np.float32).ravel()
+        extra = 1 if exclude is not None else 0
+        if self.centroids is not None and n_probe < len(self.centroids):
+            positions = self._candidates(query, n_probe)
+            scores = self.vectors[positions] @ query
+        else:
+            positions = None
+            scores = self.vectors @ query
+        top = _top_k(scores, k + extra)
+        if positions is not None:
+            top_positions = positions[top]
+        else:
+            top_positions = top
+        results = [(self.ids[p], float(s)) for p, s in zip(top_positions, scores[top])]
+        if exclude is not None:
+            results = [r for r in results if r[0] != str(exclude)]
+        return results[:k]
+
+    def similar_to(self, document_id, k=10, n_probe=DEFAULT_PROBES):
+        """
+        Documentos mais similares a um documento do índice (excluindo ele próprio).
+        """
+        return self.search(self.vector(document_id), k, n_probe, exclude=document_id)
+
+    def similar_to_tokens(self, tokens, k=10, n_probe=DEFAULT_PROBES):
+        """
+        Documentos do índice mais similares a um novo documento (lista de tokens pré-processados).
+        """
+        return self.search(self.transform([tokens])[0], k, n_probe)
+
+
+def corpus_from_export(root, language=None):
+    """
+    Monta o corpus de tokens a partir da tabela 'tokens' dos datasets Parquet exportados pela análise.
+
+    Retorna:
+        tuple: (TokenCorpus, lista de identificadores de documento).
+    """
+    import pyarrow.compute as pc
+    from export import read_export
+    table = read_export(root, 'tokens', columns=['document_id', 'position', 'token'], language=language)
+    if table is None:
+        raise ValueError(f"Tabela de tokens não encontrada em {root}.")
+    table = table.sort_by([('document_id', 'ascending'), ('position', 'ascending')])
+    # dictionary_encode atribui os ids do vocabulário de forma vetorizada
+    tokens = pc.dictionary_encode(table['token']).combine_chunks()
+    ids = tokens.indices.to_numpy(zero_copy_only=False).astype(np.int32)
+    document_column = table['document_id'].to_numpy()
+    starts = np.flatnonzero(np.concatenate(([True], document_column[1:] != document_column[:-1])))
+    corpus = TokenCorpus(Vocabulary(tokens.dictionary.to_pylist()))
+    corpus.documents = np.split(ids, starts[1:]) if len(ids) else []
+    return corpus, [str(document_column[i]) for i in starts] if len(ids) else []
+
+
+def find_similar_documents(index_path, document_id=None, tokens=None, k=10, n_probe=DEFAULT_PROBES):
+    """
+    Consulta o índice de similaridade por um documento indexado ou por uma lista de tokens.
+
+    Retorna:
+        list: Tuplas (documento, similaridade), ou lista vazia em caso de erro.
+    """
+    try:
+        index = SimilarityIndex(index_path)
+        if document_id is not None:
+            return index.similar_to(document_id, k, n_probe)
+        return index.similar_to_tokens(tokens or [], k, n_probe)
+    except Exception as e:
+        logging.error(f"Erro na busca de documentos similares: {str(e)}")
+        print(f"Erro na busca de documentos similares: {str(e)}")
+        return []
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Índice de similaridade de documentos (LSA)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    build_parser = subparsers.add_parser('build', help="Constrói o índice a partir dos datasets exportados.")
+    build_parser.add_argument('dataset', help="Pasta raiz dos datasets Parquet (--export_folder da análise).")
+    build_parser.add_argument('index_path', help="Pasta do índice.")
+    build_parser.add_argument('--language', help="Indexa apenas os documentos deste idioma.")
+    build_parser.add_argument('--components', type=int, default=DEFAULT_COMPONENTS, help="Dimensão dos vetores.")
+    build_parser.add_argument('--partition_threshold', type=int, default=PARTITION_THRESHOLD,
+                              help="Número de documentos a partir do qual o índice é particionado.")
+    query_parser = subparsers.add_parser('query', help="Lista os documentos mais similares a um documento.")
+    query_parser.add_argument('index_path', help="Pasta do índice.")
+    query_parser.add_argument('document_id', help="Identificador do documento (hash do conteúdo).")
+    query_parser.add_argument('--k', type=int, default=10, help="Número de documentos.")
+    query_parser.add_argument('--n_probe', type=int, default=DEFAULT_PROBES,
+                              help="Partições examinadas em índices particionados.")
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        corpus, document_ids = corpus_from_export(args.dataset, args.language)
+        build_similarity_index(corpus, document_ids, args.index_path, args.components, args.partition_threshold)
+    else:
+        for document_id, score in find_similar_documents(args.index_path, args.document_id, k=args.k,
+                                                         n_probe=args.n_probe):
+            print(f"{score:.4f}  {document_id}")
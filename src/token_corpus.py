@@ -0,0 +1,451 @@
+# src/token_corpus.py
+
+import logging
+import os
+import sys
+import numpy as np
+
+# Arquivos do corpus em disco: ids concatenados, deslocamentos dos documentos e vocabulário (uma palavra por linha)
+IDS_FILE = 'ids.int32'
+OFFSETS_FILE = 'offsets.int64'
+VOCABULARY_FILE = 'vocabulary.txt'
+
+class Vocabulary:
+    """
+    Vocabulário compartilhado que mapeia palavras internadas para ids inteiros (int32).
+    """
+
+    def __init__(self, words=()):
+        self._ids = {}
+        self._words = []
+        for word in words:
+            self.add(word)
+
+    def __len__(self):
+        return len(self._words)
+
+    def __contains__(self, word):
+        return word in self._ids
+
+    def __getitem__(self, token_id):
+        return self._words[token_id]
+
+    @property
+    def words(self):
+        return self._words
+
+    def add(self, word):
+        """
+        Adiciona uma palavra ao vocabulário (se ainda não existir) e retorna seu id.
+        """
+        token_id = self._ids.get(word)
+        if token_id is None:
+            token_id = len(self._words)
+            word = sys.intern(word)
+            self._ids[word] = token_id
+            self._words.append(word)
+        return token_id
+
+    def id_of(self, word, default=-1):
+        """
+        Retorna o id de uma palavra, ou default se ela não estiver no vocabulário.
+        """
+        return self._ids.get(word, default)
+
+    def encode(self, tokens, grow=True):
+        """
+        Converte uma sequência de tokens em um array de ids.
+
+        Parâmetros:
+            tokens (iterable): Tokens (str).
+            grow (bool): Se True, palavras novas são adicionadas; se False, recebem o id -1.
+
+        Retorna:
+            numpy.ndarray: Array int32 de ids.
+        """
+        lookup = self.add if grow else self.id_of
+        return np.fromiter((lookup(token) for token in tokens), dtype=np.int32)
+
+    def decode(self, ids):
+        """
+        Converte um array de ids de volta em palavras.
+        """
+        return [self._words[i] for i in ids]
+
+
+class TokenCorpus:
+    """
+    Corpus compacto de documentos tokenizados.
+
+    Cada documento é armazenado como um array NumPy int32 de ids de um vocabulário compartilhado,
+    em vez de uma lista de str. As contagens são vetorizadas com np.bincount e o corpus pode ser
+    convertido diretamente para bag-of-words do gensim e matrizes esparsas do scikit-learn.
+    """
+
+    def __init__(self, vocabulary=None):
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.documents = []
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __getitem__(self, index):
+        return self.documents[index]
+
+    def __iter__(self):
+        return iter(self.documents)
+
+    @classmethod
+    def from_documents(cls, documents, vocabulary=None):
+        """
+        Cria um corpus a partir de um iterável de listas de tokens.
+        """
+        corpus = cls(vocabulary)
+        for tokens in documents:
+            corpus.add_document(tokens)
+        return corpus
+
+    def add_document(self, tokens, grow=True):
+        """
+        Adiciona um documento (lista de tokens) ao corpus.
+
+        Parâmetros:
+            tokens (iterable): Tokens do documento.
+            grow (bool): Se False, palavras fora do vocabulário são descartadas em vez de adicionadas.
+
+        Retorna:
+            int: Índice do documento no corpus.
+        """
+        return self.add_ids(self.vocabulary.encode(tokens, grow=grow))
+
+    def add_ids(self, ids):
+        """
+        Adiciona um documento já codificado; ids negativos (palavras desconhecidas, ver Vocabulary.encode) são descartados.
+
+        Retorna:
+            int: Índice do documento no corpus.
+        """
+        ids = np.asarray(ids, dtype=np.int32)
+        self.documents.append(ids[ids >= 0] if (ids < 0).any() else ids)
+        return len(self.documents) - 1
+
+    @property
+    def num_tokens(self):
+        return sum(len(doc) for doc in self.documents)
+
+    @property
+    def nbytes(self):
+        """
+        Memória ocupada pelos arrays de ids, em bytes.
+        """
+        return sum(doc.nbytes for doc in self.documents)
+
+    def frequencies(self, index=None):
+        """
+        Conta as ocorrências de cada id do vocabulário.
+
+        Parâmetros:
+            index (int): Índice de um documento. None para o corpus inteiro.
+
+        Retorna:
+            numpy.ndarray: Contagens indexadas pelo id (comprimento igual ao do vocabulário).
+        """
+        size = len(self.vocabulary)
+        if index is not None:
+            return np.bincount(self.documents[index], minlength=size)
+        if not self.documents:
+            return np.zeros(size, dtype=np.int64)
+        # Um único bincount sobre todos os ids, em vez de um vetor do tamanho do vocabulário por documento
+        return np.bincount(np.concatenate(self.documents), minlength=size)
+
+    def most_common(self, n=None, index=None):
+        """
+        Retorna as palavras mais frequentes, em ordem decrescente de frequência.
+
+        Parâmetros:
+            n (int): Número de palavras. None para todas as palavras com contagem positiva.
+            index (int): Índice de um documento. None para o corpus inteiro.
+
+        Retorna:
+            list: Lista de tuplas (palavra, frequência).
+        """
+        counts = self.frequencies(index)
+        if n is not None and n < np.count_nonzero(counts):
+            top = np.argpartition(-counts, n - 1)[:n]
+        else:
+            top = np.flatnonzero(counts)
+        # Ordenação estável: empates mantêm a ordem de primeira ocorrência no vocabulário
+        top = top[np.lexsort((top, -counts[top]))]
+        words = self.vocabulary.words
+        return [(words[i], int(counts[i])) for i in top]
+
+    def to_bow(self, index):
+        """
+        Converte um documento no formato bag-of-words do gensim.
+
+        Retorna:
+            list: Lista de tuplas (id, contagem), ordenada por id.
+        """
+        ids, counts = np.unique(self.documents[index], return_counts=True)
+        return list(zip(ids.tolist(), counts.tolist()))
+
+    def iter_bow(self):
+        """
+        Gera os documentos no formato bag-of-words do gensim (corpus em streaming).
+        """
+        for index in range(len(self.documents)):
+            yield self.to_bow(index)
+
+    def bow_corpus(self):
+        """
+        Corpus bag-of-words reiterável (um passe por iteração), aceito pelos modelos do gensim sem materializar a lista.
+        """
+        return BowCorpus(self)
+
+    def id2word(self):
+        """
+        Mapeamento id -> palavra aceito pelo parâmetro id2word dos modelos do gensim.
+        """
+        return dict(enumerate(self.vocabulary.words))
+
+    def to_gensim_dictionary(self):
+        """
+        Cria um gensim.corpora.Dictionary com os mesmos ids do vocabulário e as estatísticas do corpus.
+        """
+        from gensim import corpora
+        matrix = self.to_csr()
+        dictionary = corpora.Dictionary()
+        dictionary.token2id = {word: i for i, word in enumerate(self.vocabulary.words)}
+        dictionary.cfs = dict(enumerate(self.frequencies().tolist()))
+        dictionary.dfs = dict(enumerate(np.bincount(matrix.indices, minlength=len(self.vocabulary)).tolist()))
+        dictionary.num_docs = len(self.documents)
+        dictionary.num_pos = self.num_tokens
+        dictionary.num_nnz = matrix.nnz
+        return dictionary
+
+    def to_csr(self):
+        """
+        Converte o corpus em uma matriz esparsa documento x termo (contagens), compatível com o scikit-learn.
+
+        Retorna:
+            scipy.sparse.csr_matrix: Matriz (número de documentos x tamanho do vocabulário).
+        """
+        from scipy.sparse import csr_matrix
+        lengths = np.fromiter((len(doc) for doc in self.documents), dtype=np.int64, count=len(self.documents))
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate(self.documents) if self.documents else np.zeros(0, dtype=np.int32)
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = csr_matrix((data, indices, indptr), shape=(len(self.documents), len(self.vocabulary)))
+        matrix.sum_duplicates()
+        return matrix
+
+    def save(self, path):
+        """
+        Grava o corpus em disco no formato lido por MappedTokenCorpus.
+
+        Parâmetros:
+            path (str): Pasta do corpus (criada se não existir).
+
+        Retorna:
+            str: A pasta do corpus.
+        """
+        with TokenCorpusWriter(path, self.vocabulary) as writer:
+            for doc in self.documents:
+                writer.add_ids(doc)
+        return path
+
+
+class BowCorpus:
+    """
+    Visão bag-of-words reiterável de um corpus, no formato de corpus em streaming do gensim.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __iter__(self):
+        return self.corpus.iter_bow()
+
+
+class TokenCorpusWriter:
+    """
+    Grava um corpus em disco incrementalmente, um documento por vez, sem mantê-lo em memória.
+
+    Os ids são anexados a <pasta>/ids.int32; os deslocamentos e o vocabulário são gravados ao fechar.
+    """
+
+    def __init__(self, path, vocabulary=None):
+        self.path = path
+        self.vocabulary = vocabulary if vocabulary is not None else Vocabulary()
+        self.offsets = [0]
+        os.makedirs(path, exist_ok=True)
+        self._ids_file = open(os.path.join(path, IDS_FILE), 'wb')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_document(self, tokens, grow=True):
+        """
+        Codifica e grava um documento (lista de tokens).
+        """
+        return self.add_ids(self.vocabulary.encode(tokens, grow=grow))
+
+    def add_ids(self, ids):
+        """
+        Grava um documento já codificado (array de ids do vocabulário do gravador); ids negativos são descartados.
+
+        Retorna:
+            int: Índice do documento no corpus.
+        """
+        ids = np.asarray(ids, dtype='<i4')
+        ids = ids[ids >= 0]
+        ids.tofile(self._ids_file)
+        self.offsets.append(self.offsets[-1] + len(ids))
+        return len(self.offsets) - 2
+
+    def close(self):
+        if self._ids_file.closed:
+            return
+        self._ids_file.close()
+        np.asarray(self.offsets, dtype='<i8').tofile(os.path.join(self.path, OFFSETS_FILE))
+        with open(os.path.join(self.path, VOCABULARY_FILE), 'w', encoding='utf-8') as f:
+            f.writelines(f"{word}\n" for word in self.vocabulary.words)
+
+
+def _map_array(path, dtype):
+    # np.memmap não aceita arquivos vazios
+    if os.path.getsize(path) == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r')
+
+
+class MappedTokenCorpus(TokenCorpus):
+    """
+    Corpus somente leitura mapeado em memória a partir da pasta gravada por TokenCorpus.save ou TokenCorpusWriter.
+
+    Os ids de todos os documentos ficam em um único array int32 aberto com np.memmap, e cada
+    documento é uma visão ids[offsets[i]:offsets[i + 1]], sem cópia. Ao ser serializado com pickle
+    (ex.: enviado a um processo de um multiprocessing.Pool) o corpus leva apenas o caminho da pasta;
+    cada processo reabre o mapeamento e as páginas são compartilhadas pelo cache do sistema operacional,
+    de modo que a memória não cresce com o número de processos.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, VOCABULARY_FILE), encoding='utf-8') as f:
+            super().__init__(Vocabulary(line.rstrip('\n') for line in f))
+        self.ids = _map_array(os.path.join(path, IDS_FILE), np.dtype('<i4'))
+        self.offsets = _map_array(os.path.join(path, OFFSETS_FILE), np.dtype('<i8'))
+        if len(self.offsets) == 0 or self.offsets[-1] != len(self.ids):
+            raise ValueError(f"Corpus em disco inconsistente: {path}")
+        self.documents = _DocumentViews(self.ids, self.offsets)
+
+    def __reduce__(self):
+        return (MappedTokenCorpus, (self.path,))
+
+    def add_document(self, tokens, grow=True):
+        raise TypeError("MappedTokenCorpus é somente leitura; use TokenCorpusWriter para gravar documentos.")
+
+    def add_ids(self, ids):
+        raise TypeError("MappedTokenCorpus é somente leitura; use TokenCorpusWriter para gravar documentos.")
+
+    @property
+    def num_tokens(self):
+        return len(self.ids)
+
+    @property
+    def nbytes(self):
+        return self.ids.nbytes + self.offsets.nbytes
+
+    def frequencies(self, index=None):
+        if index is not None:
+            return super().frequencies(index)
+        return np.bincount(self.ids, minlength=len(self.vocabulary))
+
+    def to_csr(self):
+        """
+        Converte o corpus em uma matriz esparsa documento x termo, usando os ids e deslocamentos mapeados.
+        """
+        from scipy.sparse import csr_matrix
+        data = np.ones(len(self.ids), dtype=np.int32)
+        # sum_duplicates ordena os índices no lugar; o mapeamento é somente leitura, então a matriz recebe cópias
+        matrix = csr_matrix((data, self.ids, self.offsets), shape=(len(self.documents), len(self.vocabulary)),
+                            copy=True)
+        matrix.sum_duplicates()
+        return matrix
+
+
+class _DocumentViews:
+    """
+    Sequência de documentos como visões (sem cópia) do array de ids mapeado.
+    """
+
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Índice de documento fora do intervalo.")
+        return self.ids[self.offsets[index]:self.offsets[index + 1]]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def build_token_corpus(token_lists, vocabulary=None):
+    """
+    Constrói um TokenCorpus a partir das listas de tokens produzidas por preprocess_text.
+
+    Parâmetros:
+        token_lists (iterable): Listas de tokens, uma por documento.
+        vocabulary (Vocabulary): Vocabulário compartilhado. None cria um novo.
+
+    Retorna:
+        TokenCorpus: Corpus com os documentos codificados, ou um corpus vazio em caso de erro.
+    """
+    try:
+        logging.info("Construindo corpus de ids de tokens.")
+        print("Construindo corpus de ids de tokens.")
+        corpus = TokenCorpus.from_documents(token_lists, vocabulary)
+        logging.info(f"Corpus: {len(corpus)} documento(s), {corpus.num_tokens} tokens, "
+                     f"{len(corpus.vocabulary)} palavras, {corpus.nbytes} bytes.")
+        print(f"Corpus: {len(corpus)} documento(s), {corpus.num_tokens} tokens, {len(corpus.vocabulary)} palavras.")
+        return corpus
+    except Exception as e:
+        logging.error(f"Erro ao construir o corpus de tokens: {str(e)}")
+        print(f"Erro ao construir o corpus de tokens: {str(e)}")
+        return TokenCorpus(vocabulary)
+
+
+def open_token_corpus(path):
+    """
+    Abre um corpus gravado em disco, mapeado em memória e compartilhável entre processos sem cópia.
+
+    Parâmetros:
+        path (str): Pasta do corpus (ver TokenCorpus.save e TokenCorpusWriter).
+
+    Retorna:
+        MappedTokenCorpus: Corpus mapeado, ou None em caso de erro.
+    """
+    try:
+        corpus = MappedTokenCorpus(path)
+        logging.info(f"Corpus mapeado de {path}: {len(corpus)} documento(s), {corpus.num_tokens} tokens.")
+        print(f"Corpus mapeado: {len(corpus)} documento(s), {corpus.num_tokens} tokens.")
+        return corpus
+    except Exception as e:
+        logging.error(f"Erro ao abrir o corpus de tokens: {str(e)}")
+        print(f"Erro ao abrir o corpus de tokens: {str(e)}")
+        return None
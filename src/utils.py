@@ -4,6 +4,7 @@ import nltk
 import subprocess
 import sys
 import logging
+from functools import lru_cache
 from importlib import metadata
 
 def download_nltk_packages():
@@ -18,9 +19,11 @@ def download_nltk_packages():
             print(f"Baixando pacote NLTK: {pkg}")
             nltk.download(pkg)
 
+@lru_cache(maxsize=None)
 def load_spacy_model(language):
     """
     Carrega o modelo spaCy correspondente ao idioma. Se não estiver instalado, baixa-o.
+    O modelo é carregado uma única vez por processo e compartilhado entre as análises.
     
     Parâmetros:
         language (str): 'en' para inglês, 'pt' para português.
@@ -1,6 +1,9 @@
 # src/visualization.py
 
 import logging
+import matplotlib
+# As figuras só são gravadas em arquivo; o backend Agg permite gerá-las fora da thread da interface
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import networkx as nx
@@ -28,18 +31,22 @@ def generate_word_cloud(word_freq, output_path):
         logging.error(f"Erro ao gerar nuvem de palavras: {str(e)}")
         print(f"Erro ao gerar nuvem de palavras: {str(e)}")
 
-def generate_entity_network(entities, output_path):
+def generate_entity_network(entities, output_path, layout='spring', max_entities=None):
     """
     Gera uma rede de entidades e salva como imagem.
     
     Parâmetros:
         entities (list): Lista de tuplas com entidades e seus tipos.
         output_path (str): Caminho para salvar a imagem da rede de entidades.
+        layout (str): 'spring' (força dirigida, custo iterativo) ou 'circular' (posições fixas, sem cálculo de layout).
+        max_entities (int): Número máximo de entidades na rede. None para todas.
     """
     try:
         logging.info("Gerando rede de entidades.")
         print("Gerando rede de entidades.")
         G = nx.Graph()
+        if max_entities is not None:
+            entities = entities[:max_entities]
 
         for entity, label in entities:
             G.add_node(entity, label=label)
@@ -51,7 +58,7 @@ def generate_entity_network(entities, output_path):
                 G.add_edge(entities[i][0], entities[j][0])
 
         plt.figure(figsize=(12, 12))
-        pos = nx.spring_layout(G, k=0.5)
+        pos = nx.spring_layout(G, k=0.5) if layout == 'spring' else nx.circular_layout(G)
         labels = {node: node for node in G.nodes()}
         nx.draw_networkx_nodes(G, pos, node_size=700, node_color='skyblue')
         nx.draw_networkx_edges(G, pos, width=1.0, alpha=0.5)
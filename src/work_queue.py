@@ -0,0 +1,312 @@
+# src/work_queue.py
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+DEFAULT_LEASE_SECONDS = 300
+DEFAULT_MAX_ATTEMPTS = 3
+# Tempo máximo de espera pelo bloqueio do banco quando vários processos acessam a fila
+BUSY_TIMEOUT = 60
+
+QUEUE_SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        input_file TEXT UNIQUE,
+        output_folder TEXT,
+        options TEXT,
+        status TEXT DEFAULT 'pending',
+        attempts INTEGER DEFAULT 0,
+        max_attempts INTEGER,
+        worker TEXT,
+        lease_expires REAL,
+        enqueued_at TEXT,
+        started_at TEXT,
+        finished_at TEXT,
+        error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, id);
+'''
+JOB_STATUSES = ('pending', 'leased', 'done', 'failed')
+
+
+def default_worker_id():
+    """
+    Identificador do processo de trabalho: host e pid.
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def job_output_folder(output_root, input_file):
+    """
+    Pasta de saída de um documento da fila: <raiz>/<nome do arquivo>-<hash curto do caminho>.
+    """
+    stem = os.path.splitext(os.path.basename(input_file))[0]
+    digest = hashlib.sha256(os.path.abspath(input_file).encode('utf-8')).hexdigest()[:8]
+    return os.path.join(output_root, f"{stem}-{digest}")
+
+
+class WorkQueue:
+    """
+    Fila de documentos em um banco SQLite, compartilhável por processos em vários hosts.
+
+    Um processo de trabalho reserva um documento por vez com uma concessão (lease) com prazo,
+    renovada periodicamente (heartbeat) enquanto o documento é analisado. Concessões vencidas
+    (processo ou host que parou) voltam para a fila, e documentos que falham são tentados de
+    novo até max_attempts vezes. Cada operação abre uma conexão curta e usa transações
+    BEGIN IMMEDIATE, de modo que nenhum processo mantém o banco bloqueado entre operações;
+    o banco usa o journal padrão (não WAL), que funciona em sistemas de arquivos de rede.
+    """
+
+    def __init__(self, db_path, lease_seconds=DEFAULT_LEASE_SECONDS, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        self.db_path = db_path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        conn = self._connect()
+        try:
+            conn.executescript(QUEUE_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+        finally:
+            conn.close()
+
+    def enqueue(self, input_files, output_root, options=None):
+        """
+        Adiciona documentos à fila. Documentos já presentes na fila são ignorados.
+
+        Parâmetros:
+            input_files (iterable): Caminhos dos documentos.
+            output_root (str): Pasta raiz das saídas; cada documento recebe uma subpasta (ver job_output_folder).
+            options (dict): Opções da análise repassadas ao processo de trabalho.
+
+        Retorna:
+            int: Número de documentos adicionados.
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        options = json.dumps(options or {})
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany('''
+                INSERT OR IGNORE INTO jobs (input_file, output_folder, options, max_attempts, enqueued_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', ((os.path.abspath(path), job_output_folder(output_root, path), options, self.max_attempts, now)
+                  for path in input_files))
+            return conn.total_changes - before
+
+    def _requeue_expired(self, conn, now):
+        conn.execute('''
+            UPDATE jobs SET status = 'failed', worker = NULL, finished_at = ?,
+                            error = COALESCE(error, 'Concessão expirada')
+            WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts
+        ''', (datetime.now().isoformat(timespec='seconds'), now))
+        return conn.execute('''
+            UPDATE jobs SET status = 'pending', worker = NULL
+            WHERE status = 'leased' AND lease_expires < ?
+        ''', (now,)).rowcount
+
+    def requeue_expired(self):
+        """
+        Devolve à fila os documentos cuja concessão venceu (ou os marca como falhos, se esgotaram as tentativas).
+
+        Retorna:
+            int: Número de documentos devolvidos à fila.
+        """
+        with self._transaction() as conn:
+            return self._requeue_expired(conn, time.time())
+
+    def claim(self, worker_id):
+        """
+        Reserva o próximo documento pendente para o processo de trabalho.
+
+        Retorna:
+            dict: Dados do documento ('id', 'input_file', 'output_folder', 'options', 'attempts'),
+            ou None se não houver documentos pendentes.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            self._requeue_expired(conn, now)
+            row = conn.execute("SELECT * FROM jobs WHERE status = 'pending' ORDER BY id LIMIT 1").fetchone()
+            if row is None:
+                return None
+            conn.execute('''
+                UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, lease_expires = ?,
+                                started_at = ?
+                WHERE id = ?
+            ''', (worker_id, now + self.lease_seconds, datetime.now().isoformat(timespec='seconds'), row['id']))
+        return {'id': row['id'], 'input_file': row['input_file'], 'output_folder': row['output_folder'],
+                'options': json.loads(row['options']), 'attempts': row['attempts'] + 1}
+
+    def heartbeat(self, job_id, worker_id):
+        """
+        Renova a concessão do documento.
+
+        Retorna:
+            bool: False se a concessão não pertence mais ao processo (venceu e foi reatribuída).
+        """
+        with self._transaction() as conn:
+            return conn.execute('''
+                UPDATE jobs SET lease_expires = ?
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            ''', (time.time() + self.lease_seconds, job_id, worker_id)).rowcount == 1
+
+    def complete(self, job_id, worker_id):
+        """
+        Marca o documento como concluído.
+
+        Retorna:
+            bool: False se a concessão não pertencia mais ao processo.
+        """
+        with self._transaction() as conn:
+            return conn.execute('''
+                UPDATE jobs SET status = 'done', worker = NULL, finished_at = ?, error = NULL
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            ''', (datetime.now().isoformat(timespec='seconds'), job_id, worker_id)).rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """
+        Registra a falha do documento; ele volta para a fila enquanto houver tentativas.
+
+        Retorna:
+            bool: False se a concessão não pertencia mais ao processo.
+        """
+        with self._transaction() as conn:
+            return conn.execute('''
+                UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END,
+                                worker = NULL, finished_at = ?, error = ?
+                WHERE id = ? AND worker = ? AND status = 'leased'
+            ''', (datetime.now().isoformat(timespec='seconds'), str(error), job_id, worker_id)).rowcount == 1
+
+    def counts(self):
+        """
+        Número de documentos por situação.
+
+        Retorna:
+            dict: Situação ('pending', 'leased', 'done', 'failed') -> número de documentos.
+        """
+        conn = self._connect()
+        try:
+            counts = dict.fromkeys(JOB_STATUSES, 0)
+            counts.update(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+            return counts
+        finally:
+            conn.close()
+
+    def failures(self):
+        """
+        Documentos que esgotaram as tentativas.
+
+        Retorna:
+            list: Tuplas (caminho, tentativas, erro).
+        """
+        conn = self._connect()
+        try:
+            return [tuple(row) for row in conn.execute(
+                "SELECT input_file, attempts, error FROM jobs WHERE status = 'failed' ORDER BY id")]
+        finally:
+            conn.close()
+
+
+class _Heartbeat(threading.Thread):
+    """
+    Renova a concessão de um documento em segundo plano enquanto ele é analisado.
+    """
+
+    def __init__(self, queue, job_id, worker_id):
+        super().__init__(daemon=True)
+        self.queue = queue
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+        self.lost = False
+
+    def run(self):
+        while not self.stopped.wait(self.queue.lease_seconds / 3):
+            try:
+                if not self.queue.heartbeat(self.job_id, self.worker_id):
+                    self.lost = True
+                    return
+            except sqlite3.Error as e:
+                logging.warning(f"Falha ao renovar a concessão do documento {self.job_id}: {str(e)}")
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
+
+
+def run_worker(db_path, process, worker_id=None, lease_seconds=DEFAULT_LEASE_SECONDS, poll_interval=5,
+               wait=False, max_jobs=None):
+    """
+    Processa documentos da fila até ela esvaziar (ou indefinidamente, com wait=True).
+
+    Parâmetros:
+        db_path (str): Banco SQLite da fila.
+        process (callable): Função chamada com o dict do documento (ver WorkQueue.claim); deve retornar
+            True em caso de sucesso. Retornar False ou levantar uma exceção registra uma falha.
+        worker_id (str): Identificador do processo. None usa host:pid.
+        lease_seconds (float): Prazo da concessão; é renovada a cada lease_seconds / 3.
+        poll_interval (float): Espera, em segundos, entre consultas quando a fila está vazia (com wait=True).
+        wait (bool): Se True, continua aguardando novos documentos quando a fila esvazia.
+        max_jobs (int): Número máximo de documentos a processar. None para não limitar.
+
+    Retorna:
+        dict: Número de documentos concluídos ('done') e com falha ('failed') por este processo.
+    """
+    worker_id = worker_id or default_worker_id()
+    queue = WorkQueue(db_path, lease_seconds)
+    processed = {'done': 0, 'failed': 0}
+    logging.info(f"Processo de trabalho {worker_id} iniciado na fila {db_path}.")
+    print(f"Processo de trabalho {worker_id} iniciado.")
+    while max_jobs is None or sum(processed.values()) < max_jobs:
+        job = queue.claim(worker_id)
+        if job is None:
+            if not wait:
+                break
+            time.sleep(poll_interval)
+            continue
+        logging.info(f"Processando {job['input_file']} (tentativa {job['attempts']}).")
+        print(f"Processando {job['input_file']} (tentativa {job['attempts']}).")
+        heartbeat = _Heartbeat(queue, job['id'], worker_id)
+        heartbeat.start()
+        try:
+            succeeded, error = bool(process(job)), "A análise não foi concluída."
+        except Exception as e:
+            succeeded, error = False, str(e)
+        finally:
+            heartbeat.stop()
+        if heartbeat.lost:
+            logging.warning(f"Concessão de {job['input_file']} perdida; o documento foi reatribuído.")
+        elif succeeded:
+            queue.complete(job['id'], worker_id)
+            processed['done'] += 1
+        else:
+            queue.fail(job['id'], worker_id, error)
+            processed['failed'] += 1
+            logging.error(f"Falha ao processar {job['input_file']}: {error}")
+            print(f"Falha ao processar {job['input_file']}: {error}")
+    logging.info(f"Processo de trabalho {worker_id} finalizado: {processed}.")
+    print(f"Processo de trabalho finalizado: {processed['done']} concluído(s), {processed['failed']} com falha.")
+    return processed
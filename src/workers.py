@@ -0,0 +1,228 @@
+# src/workers.py
+
+import gc
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Modelos que podem ser pré-carregados no processo principal antes de criar os processos de trabalho
+PRELOADABLE_MODELS = ('spacy', 'sentiment', 'vader', 'spellchecker')
+DEFAULT_LANGUAGES = ('pt', 'en')
+# Campos de /proc/<pid>/smaps_rollup (em kB) usados no relatório de memória
+SMAPS_FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Shared_Clean': 'shared_clean', 'Shared_Dirty': 'shared_dirty',
+                'Private_Clean': 'private_clean', 'Private_Dirty': 'private_dirty'}
+# Pools vivos que congelaram objetos com gc.freeze(); o último a terminar descongela
+_frozen_pools = 0
+
+
+def _model_loaders(language):
+    """
+    Funções de carregamento (memoizadas por processo) de cada modelo para o idioma.
+    """
+    from analysis import _get_sentiment_pipeline, _get_spellchecker, _get_vader
+    from utils import load_spacy_model
+    return {
+        'spacy': lambda: load_spacy_model(language),
+        'sentiment': lambda: _get_sentiment_pipeline(language),
+        'vader': _get_vader,
+        'spellchecker': lambda: _get_spellchecker(language),
+    }
+
+
+def preload_models(languages=DEFAULT_LANGUAGES, models=PRELOADABLE_MODELS):
+    """
+    Carrega os modelos no processo atual, preenchendo os caches usados pelas funções de análise.
+
+    Modelos que não puderem ser carregados (ex.: não instalados) são ignorados; os processos de
+    trabalho os carregarão sob demanda, como antes.
+
+    Parâmetros:
+        languages (tuple): Idiomas ('pt', 'en').
+        models (tuple): Modelos a carregar (ver PRELOADABLE_MODELS).
+
+    Retorna:
+        list: Nomes dos modelos carregados, no formato '<modelo>:<idioma>'.
+    """
+    loaded = []
+    for language in languages if models else ():
+        loaders = _model_loaders(language)
+        for name in models:
+            try:
+                loaders[name]()
+                loaded.append(f"{name}:{language}")
+            except Exception as e:
+                logging.warning(f"Não foi possível pré-carregar o modelo {name} ({language}): {str(e)}")
+    return loaded
+
+
+def process_memory(pid=None):
+    """
+    Lê o uso de memória de um processo em /proc/<pid>/smaps_rollup (Linux).
+
+    A memória única (USS, privada) é a que seria liberada ao encerrar o processo; as páginas
+    compartilhadas copy-on-write com o processo principal aparecem em 'shared'.
+
+    Parâmetros:
+        pid (int): Id do processo. None para o processo atual.
+
+    Retorna:
+        dict: 'pid', 'rss', 'pss', 'uss' e 'shared', em bytes, ou None se a informação não estiver disponível.
+    """
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+    values = dict.fromkeys(SMAPS_FIELDS.values(), 0)
+    for line in lines:
+        parts = line.split()
+        field = parts[0].rstrip(':') if parts else None
+        if field in SMAPS_FIELDS:
+            values[SMAPS_FIELDS[field]] = int(parts[1]) * 1024
+    return {
+        'pid': pid,
+        'rss': values['rss'],
+        'pss': values['pss'],
+        'uss': values['private_clean'] + values['private_dirty'],
+        'shared': values['shared_clean'] + values['shared_dirty'],
+    }
+
+
+def child_process_context():
+    """
+    Contexto do multiprocessing para processos auxiliares criados durante a análise (processos
+    supervisionados dos orçamentos, extração de páginas de PDF).
+
+    Com fork, o processo herda os modelos já carregados sem copiá-los. Se houver outras threads
+    (interface gráfica, renovação de reservas da fila), um fork pode copiar travas mantidas por elas
+    (ex.: a do logging) e travar o processo filho; nesse caso usa-se forkserver (ou spawn), em que o
+    filho carrega os modelos sob demanda e a função e os argumentos precisam ser serializáveis com pickle.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if threading.active_count() == 1 and 'fork' in methods:
+        return multiprocessing.get_context('fork')
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _enable_gc():
+    # Executado no início de cada processo de trabalho
+    gc.enable()
+
+
+class PreloadedPool:
+    """
+    Pool de processos que compartilham, por copy-on-write, os modelos carregados no processo principal.
+
+    Os modelos são carregados no processo principal com o coletor de lixo desativado e, em seguida,
+    os objetos existentes são movidos para a geração permanente com gc.freeze(). Os processos são
+    criados com fork: como o coletor não percorre (nem escreve nos cabeçalhos de) objetos congelados,
+    as páginas dos modelos continuam compartilhadas e cada processo só paga pela memória que altera.
+    Em plataformas sem fork, os processos são iniciados com spawn e carregam os modelos sob demanda.
+
+    O pool usa concurrent.futures.ProcessPoolExecutor: os processos não são daemon (podem criar os
+    processos supervisionados dos orçamentos de budget.run_with_budget) e, se um deles morrer (OOM
+    killer, falha no código nativo, SIGKILL), as tarefas pendentes falham com BrokenProcessPool em vez
+    de aguardarem para sempre.
+    """
+
+    def __init__(self, processes=None, languages=DEFAULT_LANGUAGES, models=PRELOADABLE_MODELS, preload=()):
+        """
+        Parâmetros:
+            processes (int): Número de processos. None usa o número de CPUs.
+            languages (tuple): Idiomas dos modelos a pré-carregar.
+            models (tuple): Modelos a pré-carregar (ver PRELOADABLE_MODELS).
+            preload (iterable): Funções adicionais executadas no processo principal antes do fork.
+        """
+        global _frozen_pools
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.models = preload_models(languages, models)
+            for loader in preload:
+                loader()
+            try:
+                context = multiprocessing.get_context('fork')
+            except ValueError:
+                logging.warning("fork indisponível; os processos de trabalho carregarão os modelos individualmente.")
+                context = multiprocessing.get_context('spawn')
+            gc.freeze()
+            _frozen_pools += 1
+            self.frozen = True
+            self.executor = ProcessPoolExecutor(processes, mp_context=context, initializer=_enable_gc)
+            # Com fork, todos os processos são criados na primeira tarefa, antes da thread de controle do executor
+            self.executor.submit(gc.isenabled).result()
+        except BaseException:
+            self._release_freeze()
+            raise
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        logging.info(f"Pool com {len(self.pids)} processo(s) e modelos pré-carregados: {self.models}")
+        print(f"Pool com {len(self.pids)} processo(s) e {len(self.models)} modelo(s) pré-carregado(s).")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.terminate()
+        self.join()
+
+    def submit(self, func, *args, **kwargs):
+        return self.executor.submit(func, *args, **kwargs)
+
+    def map(self, func, iterable):
+        return list(self.executor.map(func, iterable))
+
+    def imap(self, func, iterable):
+        return self.executor.map(func, iterable)
+
+    def imap_unordered(self, func, iterable):
+        for future in as_completed([self.executor.submit(func, item) for item in iterable]):
+            yield future.result()
+
+    @property
+    def pids(self):
+        return list(self.executor._processes or {})
+
+    def memory_report(self):
+        """
+        Uso de memória do processo principal e de cada processo de trabalho.
+
+        Retorna:
+            dict: 'parent' (dict de process_memory) e 'workers' (lista de dicts, um por processo).
+        """
+        workers = [memory for memory in map(process_memory, self.pids) if memory is not None]
+        report = {'parent': process_memory(), 'workers': workers}
+        for memory in workers:
+            logging.info(f"Processo {memory['pid']}: USS {memory['uss'] / 2 ** 20:.1f} MB, "
+                         f"PSS {memory['pss'] / 2 ** 20:.1f} MB, compartilhada {memory['shared'] / 2 ** 20:.1f} MB.")
+            print(f"Processo {memory['pid']}: memória única (USS) {memory['uss'] / 2 ** 20:.1f} MB, "
+                  f"compartilhada {memory['shared'] / 2 ** 20:.1f} MB.")
+        return report
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    def terminate(self):
+        processes = list((self.executor._processes or {}).values())
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def join(self):
+        self.executor.shutdown(wait=True)
+        self._release_freeze()
+
+    def _release_freeze(self):
+        # Objetos congelados voltam a ser coletados normalmente quando não há outro pool vivo
+        # (o descongelamento é global e desfaria o compartilhamento dos demais pools)
+        global _frozen_pools
+        if getattr(self, 'frozen', False):
+            self.frozen = False
+            _frozen_pools -= 1
+            if _frozen_pools == 0:
+                gc.unfreeze()
@@ -1,6 +1,11 @@
 # tests/test_analysis.py
 
 import unittest
+from datetime import date
+from unittest.mock import patch
+import numpy as np
+import spacy
+from spacy.tokens import Doc, Span
 from src.analysis import (
     extract_entities,
     extract_pos_tags,
@@ -15,8 +20,11 @@ from src.analysis import (
     extract_dates,
     extract_actions_and_responsibles,
     check_verb_agreement,
-    detect_person_changes
+    detect_person_changes,
+    check_grammar_corpus,
+    sentiment_by_segment
 )
+from src import main
 
 class TestAnalysis(unittest.TestCase):
 
@@ -48,6 +56,55 @@ class TestAnalysis(unittest.TestCase):
         sentiment = sentiment_analysis(text, language)
         self.assertIn(sentiment['label'], ['POSITIVE', 'NEGATIVE'])
 
+    def test_sentiment_analysis_transformer_keeps_model_labels(self):
+        model = lambda text: [{'label': '4 stars', 'score': 0.61}]
+        with patch('src.analysis._get_sentiment_pipeline', return_value=model):
+            sentiment = sentiment_analysis("O projeto foi um sucesso.", 'pt')
+        self.assertEqual(sentiment['label'], '4 stars')
+        self.assertEqual(sentiment['score'], 0.61)
+
+    def test_sentiment_analysis_lexicon_pt(self):
+        text = "O projeto foi um sucesso excelente.\nA equipe está satisfeita.\nO documento descreve o processo."
+        sentiment = sentiment_analysis(text, 'pt', mode='lexicon')
+        self.assertEqual(sentiment['sentences'], 3)
+        self.assertEqual(sentiment['label'], 'positive')
+        # A negação inverte a polaridade
+        self.assertEqual(sentiment_analysis("A equipe não está satisfeita.", 'pt', mode='lexicon')['label'], 'negative')
+
+    def test_sentiment_analysis_with_sentences(self):
+        text = "O projeto foi um sucesso excelente.\nO documento descreve o processo."
+        sentiment, sentences = sentiment_analysis(text, 'pt', mode='lexicon', with_sentences=True)
+        self.assertEqual(sentiment['sentences'], len(sentences))
+        self.assertEqual([s['label'] for s in sentences], ['positive', 'neutral'])
+        self.assertFalse(sentences[0]['escalated'])
+
+    def test_sentiment_analysis_tiered_without_uncertain_sentences(self):
+        # Nenhuma sentença dentro da faixa de incerteza: o transformer não é chamado
+        sentiment = sentiment_analysis("Um resultado excelente e ótimo.", 'pt', mode='tiered', band=(0.0, 0.0))
+        self.assertEqual(sentiment['escalated'], 0)
+        self.assertEqual(sentiment['escalation_rate'], 0.0)
+        self.assertEqual(sentiment['label'], 'positive')
+
+    def test_sentiment_analysis_tiered_reports_failed_escalation(self):
+        with patch('src.analysis._get_sentiment_pipeline', side_effect=OSError('modelo indisponível')):
+            sentiment = sentiment_analysis("O resultado foi bom, mas houve atraso.", 'pt', mode='tiered')
+        self.assertEqual(sentiment['escalated'], 0)
+        self.assertEqual(sentiment['escalation_failed'], 1)
+        self.assertIn('modelo indisponível', sentiment['escalation_error'])
+
+    def test_sentiment_by_segment_uses_each_language(self):
+        segments = [{'language': 'pt', 'text': 'O projeto foi um sucesso.', 'start': 0, 'end': 25},
+                    {'language': 'en', 'text': 'The team is not happy with the delay.', 'start': 27, 'end': 64}]
+        # Polaridade fixa por idioma: o léxico de cada segmento é o do seu idioma
+        polarity = {'pt': 0.8, 'en': -0.4}
+        with patch('src.analysis._lexicon_scores', side_effect=lambda sentences, language: (
+                np.full(len(sentences), polarity[language]), np.ones(len(sentences), dtype=bool))):
+            sentiment, sentences = sentiment_by_segment(segments, mode='lexicon')
+        weights = [len(segment['text']) for segment in segments]
+        self.assertAlmostEqual(sentiment['score'], round(np.average([0.8, -0.4], weights=weights), 4))
+        self.assertEqual(sentiment['sentences'], 2)
+        self.assertEqual([s['label'] for s in sentences], ['positive', 'negative'])
+
     def test_spelling_correction_en(self):
         text = "Ths is a smple English txt."
         language = 'en'
@@ -75,6 +132,53 @@ class TestAnalysis(unittest.TestCase):
         expected_connectives = {'aditivos': 2, 'adversativos': 0, 'conclusivos': 0}
         self.assertEqual(connectives, expected_connectives)
 
+    def test_extract_dates_pt(self):
+        text = "O contrato foi assinado em 15 de março de 2023 e revisado em 02/04/2023."
+        dates = extract_dates(text, 'pt')
+        self.assertEqual([d['date'] for d in dates], ['2023-03-15', '2023-04-02'])
+        self.assertEqual(text[dates[0]['start']:dates[0]['end']], '15 de março de 2023')
+
+    def test_extract_dates_en(self):
+        text = "The audit started on March 15, 2023 and ended 2023-04-02. Call 555-1234."
+        dates = extract_dates(text, 'en')
+        self.assertEqual([d['date'] for d in dates], ['2023-03-15', '2023-04-02'])
+
+    def test_extract_dates_without_year(self):
+        text = "A reunião de 1º de maio foi adiada para 15 de mar."
+        self.assertEqual(extract_dates(text, 'pt'), [])
+        dates = extract_dates(text, 'pt', reference_date=date(2021, 6, 30))
+        self.assertEqual([d['date'] for d in dates], ['2021-05-01', '2021-03-15'])
+        self.assertEqual(dates[1]['text'], '15 de mar')
+        self.assertEqual(text[dates[1]['start']:dates[1]['end']], '15 de mar')
+
+    def test_extract_actions_and_responsibles_pt(self):
+        nlp = spacy.blank('pt')
+        doc = Doc(
+            nlp.vocab,
+            words=['O', 'documento', 'foi', 'aprovado', 'pelo', 'gerente', '.'],
+            heads=[1, 3, 3, 3, 5, 3, 3],
+            deps=['det', 'nsubj:pass', 'aux:pass', 'ROOT', 'case', 'obl:agent', 'punct'],
+            pos=['DET', 'NOUN', 'AUX', 'VERB', 'ADP', 'NOUN', 'PUNCT'],
+            lemmas=['o', 'documento', 'ser', 'aprovar', 'por', 'gerente', '.']
+        )
+        actions = extract_actions_and_responsibles(doc.text, 'pt', doc=doc)
+        self.assertEqual(len(actions), 1)
+        self.assertEqual(actions[0]['action'], 'aprovar O documento')
+        self.assertEqual(actions[0]['responsible'], 'gerente')
+
+    def test_extract_actions_and_responsibles_en(self):
+        nlp = spacy.blank('en')
+        doc = Doc(
+            nlp.vocab,
+            words=['The', 'manager', 'is', 'responsible', 'for', 'approving', 'the', 'budget', '.'],
+            heads=[1, 2, 2, 2, 3, 4, 7, 5, 2],
+            deps=['det', 'nsubj', 'ROOT', 'acomp', 'prep', 'pcomp', 'det', 'dobj', 'punct'],
+            pos=['DET', 'NOUN', 'AUX', 'ADJ', 'ADP', 'VERB', 'DET', 'NOUN', 'PUNCT']
+        )
+        actions = extract_actions_and_responsibles(doc.text, 'en', doc=doc)
+        self.assertEqual(actions[0]['action'], 'approving the budget')
+        self.assertEqual(actions[0]['responsible'], 'The manager')
+
     def test_detect_person_changes_en(self):
         text = "I am going to the store. He is coming with me."
         language = 'en'
@@ -88,5 +192,107 @@ class TestAnalysis(unittest.TestCase):
         self.assertTrue(len(errors) > 0)
         self.assertEqual(errors[0]['error'], 'Concordância incorreta para sujeito singular.')
 
+    def test_columnar_extraction_parsed_doc(self):
+        nlp = spacy.blank('en')
+        doc = Doc(
+            nlp.vocab,
+            words=['Apple', 'opened', 'in', 'London', 'with', 'Google', '.'],
+            heads=[0, 0, 0, 2, 0, 4, 0],
+            deps=['ROOT', 'acl', 'prep', 'pobj', 'prep', 'pobj', 'punct'],
+            pos=['PROPN', 'VERB', 'ADP', 'PROPN', 'ADP', 'PROPN', 'PUNCT']
+        )
+        doc.ents = [Span(doc, 0, 1, 'ORG'), Span(doc, 3, 4, 'GPE'), Span(doc, 5, 6, 'ORG')]
+        relationships = extract_relationships(doc.text, 'en', doc=doc)
+        self.assertEqual(relationships, [('Apple', 'in', 'London'), ('Apple', 'with', 'Google')])
+        dependencies = dependency_parsing(doc.text, 'en', doc=doc)
+        self.assertEqual(len(dependencies), 7)
+        self.assertEqual(dependencies[:2], [('Apple', 'ROOT', 'Apple'), ('opened', 'acl', 'Apple')])
+        self.assertEqual(dependencies[-2], ('Google', 'pobj', 'with'))
+        pos_tags = extract_pos_tags(doc.text, 'en', doc=doc)
+        self.assertEqual(pos_tags.column('pos'), ['PROPN', 'VERB', 'ADP', 'PROPN', 'ADP', 'PROPN', 'PUNCT'])
+
+    def test_columnar_extraction_error_keeps_columns(self):
+        with patch('src.analysis.load_spacy_model', side_effect=OSError("modelo ausente")):
+            pos_tags = extract_pos_tags("Texto qualquer.", 'en')
+            dependencies = dependency_parsing("Texto qualquer.", 'en')
+            relationships = extract_relationships("Texto qualquer.", 'en')
+        self.assertEqual(pos_tags.names, ['token', 'pos'])
+        self.assertEqual(dependencies.names, ['token', 'dep', 'head'])
+        self.assertEqual(relationships.names, ['entity', 'relation', 'target'])
+        self.assertEqual(len(pos_tags[:20]), 0)
+        self.assertEqual(relationships.to_list(), [])
+        self.assertEqual(dependencies.column('dep'), [])
+
+    def test_check_verb_agreement_parsed_doc(self):
+        nlp = spacy.blank('pt')
+        doc = Doc(
+            nlp.vocab,
+            words=['Ele', 'vão', 'ao', 'mercado', '.', 'Eles', 'vão', 'também', '.'],
+            heads=[1, 1, 3, 1, 1, 6, 6, 6, 6],
+            deps=['nsubj', 'ROOT', 'case', 'obl', 'punct', 'nsubj', 'ROOT', 'advmod', 'punct'],
+            pos=['PRON', 'VERB', 'ADP', 'NOUN', 'PUNCT', 'PRON', 'VERB', 'ADV', 'PUNCT'],
+            morphs=['Number=Sing|Person=3|PronType=Prs', 'Mood=Ind|Number=Plur|Person=3|VerbForm=Fin', '', '', '',
+                    'Number=Plur|Person=3|PronType=Prs', 'Mood=Ind|Number=Plur|Person=3|VerbForm=Fin', '', '']
+        )
+        errors = check_verb_agreement(doc.text, 'pt', doc=doc)
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]['subject'], 'Ele')
+        self.assertEqual(doc.text[errors[0]['start']:errors[0]['end']], 'Ele vão ao mercado .')
+
+    def test_detect_person_changes_parsed_doc(self):
+        nlp = spacy.blank('en')
+        doc = Doc(
+            nlp.vocab,
+            words=['I', 'am', 'here', '.', 'He', 'is', 'there', '.'],
+            heads=[1, 1, 1, 1, 5, 5, 5, 5],
+            deps=['nsubj', 'ROOT', 'advmod', 'punct', 'nsubj', 'ROOT', 'advmod', 'punct'],
+            morphs=['Number=Sing|Person=1|PronType=Prs', 'VerbForm=Fin', '', '',
+                    'Number=Sing|Person=3|PronType=Prs', 'VerbForm=Fin', '', '']
+        )
+        person_changes = detect_person_changes(doc.text, 'en', doc=doc)
+        self.assertTrue(person_changes['inconsistent_person'])
+        self.assertEqual(person_changes['changes'][0]['from'], '1')
+        self.assertEqual(person_changes['changes'][0]['to'], '3')
+
+    def test_check_grammar_corpus_matches_single_document(self):
+        nlp = spacy.blank('en')
+        doc = Doc(
+            nlp.vocab,
+            words=['I', 'am', 'here', '.', 'He', 'is', 'there', '.'],
+            heads=[1, 1, 1, 1, 5, 5, 5, 5],
+            deps=['nsubj', 'ROOT', 'advmod', 'punct', 'nsubj', 'ROOT', 'advmod', 'punct'],
+            morphs=['Number=Sing|Person=1|PronType=Prs', 'VerbForm=Fin', '', '',
+                    'Number=Sing|Person=3|PronType=Prs', 'VerbForm=Fin', '', '']
+        )
+        nlp.pipe = lambda texts, batch_size, n_process: iter([doc])
+        with patch('src.analysis.load_spacy_model', return_value=nlp):
+            results = list(check_grammar_corpus([doc.text], 'en'))
+        self.assertEqual(results, [{'verb_agreement_errors': check_verb_agreement(doc.text, 'en', doc=doc),
+                                    'person_changes': detect_person_changes(doc.text, 'en', doc=doc)}])
+
+    def test_parsed_analyses_per_segment(self):
+        # Documento misto: cada segmento é analisado à parte e os offsets se referem ao texto inteiro
+        en = Doc(spacy.blank('en').vocab, words=['I', 'am', 'here', '.'], heads=[1, 1, 1, 1],
+                 deps=['nsubj', 'ROOT', 'advmod', 'punct'],
+                 morphs=['Number=Sing|Person=1|PronType=Prs', 'VerbForm=Fin', '', ''])
+        pt = Doc(spacy.blank('pt').vocab, words=['Ele', 'vão', 'ao', 'mercado', '.'], heads=[1, 1, 3, 1, 1],
+                 deps=['nsubj', 'ROOT', 'case', 'obl', 'punct'],
+                 pos=['PRON', 'VERB', 'ADP', 'NOUN', 'PUNCT'],
+                 morphs=['Number=Sing|Person=3|PronType=Prs', 'Mood=Ind|Number=Plur|Person=3|VerbForm=Fin',
+                         '', '', ''])
+        text = f"{en.text}\n\n{pt.text}"
+        segments = [{'language': 'en', 'text': en.text, 'start': 0, 'end': len(en.text)},
+                    {'language': 'pt', 'text': pt.text, 'start': len(en.text) + 2, 'end': len(text)}]
+        docs = {'en': en, 'pt': pt}
+        with patch('src.main.load_or_parse', side_effect=lambda text, language, store: docs[language]):
+            results = main._parsed_analyses(segments, None)
+        errors = results['verb_agreement_errors']
+        self.assertEqual([error['subject'] for error in errors], ['Ele'])
+        self.assertEqual(text[errors[0]['start']:errors[0]['end']], 'Ele vão ao mercado .')
+        changes = results['person_changes']['changes']
+        self.assertEqual([(change['from'], change['to']) for change in changes], [('1', '3')])
+        self.assertEqual(text[changes[0]['start']:changes[0]['end']], 'Ele vão ao mercado .')
+        self.assertEqual(len(results['pos_tags']), len(en) + len(pt))
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+# tests/test_budget.py
+
+import threading
+import time
+import unittest
+from src.budget import AnalysisCancelled, call_with_fallback, parse_budget, run_with_budget, sample_text
+
+def _slow(seconds, value):
+    time.sleep(seconds)
+    return value
+
+def _allocate(megabytes):
+    block = bytearray(megabytes * 2 ** 20)
+    time.sleep(5)
+    return len(block)
+
+class TestBudget(unittest.TestCase):
+
+    def test_run_with_budget(self):
+        self.assertEqual(run_with_budget(_slow, (0, 'ok'), seconds=5), ('ok', 'ok'))
+        start = time.monotonic()
+        self.assertEqual(run_with_budget(_slow, (30, 'lento'), seconds=0.3), ('timed_out', None))
+        self.assertLess(time.monotonic() - start, 5)
+
+    def test_run_with_budget_with_other_threads(self):
+        # Com outras threads ativas o processo supervisionado não é criado com fork
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            self.assertEqual(run_with_budget(_slow, (0, 'ok'), seconds=30), ('ok', 'ok'))
+            self.assertEqual(run_with_budget(_slow, (30, 'lento'), seconds=0.5), ('timed_out', None))
+        finally:
+            stop.set()
+            thread.join()
+
+    def test_memory_budget(self):
+        self.assertEqual(run_with_budget(_allocate, (256,), memory_mb=64)[0], 'memory_exceeded')
+
+    def test_fallback_to_cheaper_mode(self):
+        budgets = {'analise': {'seconds': 0.3}}
+        attempts = [('completo', _slow, (30, 'completo'), {}), ('amostra', _slow, (0, 'amostra'), {})]
+        self.assertEqual(call_with_fallback('analise', attempts, budgets), ('amostra', 'amostra'))
+        self.assertEqual(call_with_fallback('analise', attempts[:1], budgets, default=[]), ([], 'timed_out'))
+        # Análises sem orçamento são executadas diretamente
+        self.assertEqual(call_with_fallback('outra', attempts[1:], budgets), ('amostra', 'ok'))
+
+    def test_cancel_event_terminates_child(self):
+        # O cancelamento chega de outra thread, como na interface gráfica (processo criado sem fork)
+        cancel_event = threading.Event()
+        timer = threading.Timer(0.3, cancel_event.set)
+        timer.start()
+        start = time.monotonic()
+        self.assertEqual(run_with_budget(_slow, (30, 'lento'), cancel_event=cancel_event), ('cancelled', None))
+        self.assertLess(time.monotonic() - start, 10)
+        attempts = [('completo', _slow, (30, 'completo'), {}), ('amostra', _slow, (0, 'amostra'), {})]
+        with self.assertRaises(AnalysisCancelled):
+            call_with_fallback('analise', attempts, {}, cancel_event=cancel_event)
+
+    def test_parse_budget_and_sample_text(self):
+        self.assertEqual(parse_budget('lda_topic_modeling=60:512'),
+                         ('lda_topic_modeling', {'seconds': 60.0, 'memory_mb': 512.0}))
+        self.assertEqual(parse_budget('spelling_correction=30')[1], {'seconds': 30.0, 'memory_mb': None})
+        text = '\n'.join(f"linha {i}" for i in range(1000))
+        sample = sample_text(text, 800)
+        self.assertLessEqual(len(sample), 800)
+        self.assertIn('linha 0', sample)
+        # As linhas amostradas cobrem o documento inteiro, não só o início
+        self.assertTrue(any(int(line.split()[1]) > 900 for line in sample.splitlines()))
+
+if __name__ == '__main__':
+    unittest.main()
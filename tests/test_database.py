@@ -0,0 +1,83 @@
+# tests/test_database.py
+
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from src import main
+from src.database import index_document, search_documents
+
+class TestDatabase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'indice.db')
+        self.text = "Relatório de energia.\nA Petrobras apresentou o plano em 10/03/2021.\n\nOutro parágrafo sem relação."
+        self.results = {
+            'entities': [('Petrobras', 'ORG')],
+            'keywords': [('energia', 0.8)],
+            'dates': [{'text': '10/03/2021', 'start': 0, 'end': 10, 'date': '2021-03-10'}],
+        }
+        self.document_id = index_document(self.results, self.text, self.db_path, 'relatorio.txt')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_search_with_snippet(self):
+        results = search_documents(self.db_path, 'petrobras plano')
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]['path'], 'relatorio.txt')
+        self.assertEqual(results[0]['paragraph'], 1)
+        self.assertIn('[Petrobras]', results[0]['snippet'])
+        # Acentos são ignorados pelo tokenizador
+        self.assertEqual(len(search_documents(self.db_path, 'relatorio')), 1)
+
+    def test_filters(self):
+        self.assertEqual(len(search_documents(self.db_path, 'energia', label='ORG')), 1)
+        self.assertEqual(search_documents(self.db_path, 'energia', label='PER'), [])
+        self.assertEqual(len(search_documents(self.db_path, label='ORG', entity='petrobras')), 1)
+        self.assertEqual(len(search_documents(self.db_path, date_from='2021-01-01', date_to='2021-12-31')), 1)
+        self.assertEqual(search_documents(self.db_path, date_from='2022-01-01'), [])
+
+    def test_incremental_indexing(self):
+        self.assertEqual(index_document(self.results, self.text, self.db_path, 'relatorio.txt'), self.document_id)
+        new_id = index_document({}, "Texto revisado sobre petróleo.", self.db_path, 'relatorio.txt')
+        self.assertNotEqual(new_id, self.document_id)
+        self.assertEqual(search_documents(self.db_path, 'energia'), [])
+        self.assertEqual(len(search_documents(self.db_path, 'petroleo')), 1)
+        conn = sqlite3.connect(self.db_path)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM documents').fetchone()[0], 1)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM document_entities').fetchone()[0], 0)
+        conn.close()
+
+    def test_index_keeps_default_journal(self):
+        # O índice pode ficar em um sistema de arquivos de rede, onde o WAL não funciona
+        conn = sqlite3.connect(self.db_path)
+        try:
+            self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+        finally:
+            conn.close()
+        self.assertFalse(os.path.exists(self.db_path + '-wal'))
+
+    def test_run_batch_indexes_the_corpus_in_one_database(self):
+        documents = os.path.join(self.tmp.name, 'documentos')
+        os.makedirs(documents)
+        for name, text in (('a.txt', "Plano de energia da Petrobras."), ('b.txt', "Plano de energia da Vibra.")):
+            with open(os.path.join(documents, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+
+        def _index(state):
+            index_document({}, state['text'], state['index_db'], state['input_file'])
+            return {}, [state['index_db']]
+
+        stages = {'read': main._stage_read, 'dedup': main._stage_dedup, 'index': _index}
+        output = os.path.join(self.tmp.name, 'saida')
+        with patch.object(main, 'PIPELINE_STAGES', stages), patch.object(main, 'download_nltk_packages'):
+            main.run_batch([documents], output, dedup_mode='off')
+        # Sem --index_path, a busca no banco da raiz das saídas encontra todos os documentos do lote
+        results = search_documents(os.path.join(output, main.CORPUS_INDEX_DB), 'energia')
+        self.assertEqual(sorted(os.path.basename(r['path']) for r in results), ['a.txt', 'b.txt'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_dedup.py
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from src import main
+from src.dedup import check_duplicate, duplicate_clusters, estimate_jaccard, mark_analyzed, minhash_signature
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'indice.db')
+        words = [f"palavra{i % 97} termo{i % 13}" for i in range(600)]
+        self.original = ' '.join(words)
+        revised = list(words)
+        revised[300] = 'revisão pontual do procedimento'
+        self.revision = ' '.join(revised)
+        self.other = ' '.join(f"assunto{i % 89} tema{i % 7}" for i in range(600))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_signature_estimates_jaccard(self):
+        original, revision, other = (minhash_signature(t) for t in (self.original, self.revision, self.other))
+        self.assertGreater(estimate_jaccard(original, revision), 0.9)
+        self.assertLess(estimate_jaccard(original, other), 0.1)
+
+    def test_check_duplicate_and_clusters(self):
+        first = check_duplicate(self.original, 'v1.pdf', self.db_path, 'saida_v1')
+        self.assertFalse(first['duplicate'])
+        second = check_duplicate(self.revision, 'v2.docx', self.db_path, 'saida_v2')
+        self.assertTrue(second['duplicate'])
+        self.assertEqual(second['canonical'], 'v1.pdf')
+        self.assertEqual(second['canonical_output'], 'saida_v1')
+        self.assertFalse(check_duplicate(self.other, 'outro.pdf', self.db_path)['duplicate'])
+        # Reprocessar o mesmo arquivo não o marca como duplicata de si mesmo
+        self.assertFalse(check_duplicate(self.original, 'v1.pdf', self.db_path, 'saida_v1')['duplicate'])
+        clusters = duplicate_clusters(self.db_path)
+        self.assertEqual(list(clusters), ['v1.pdf'])
+        self.assertEqual(clusters['v1.pdf'][0][0], 'v2.docx')
+
+    def test_canonical_analyzed_only_after_mark(self):
+        check_duplicate(self.original, 'v1.pdf', self.db_path, 'saida_v1')
+        self.assertFalse(check_duplicate(self.revision, 'v2.docx', self.db_path, 'saida_v2')['canonical_analyzed'])
+        mark_analyzed(self.original, 'v1.pdf', self.db_path)
+        self.assertTrue(check_duplicate(self.revision, 'v3.docx', self.db_path, 'saida_v3')['canonical_analyzed'])
+
+    def test_run_batch_shares_the_duplicate_index(self):
+        documents = os.path.join(self.tmp.name, 'documentos')
+        os.makedirs(documents)
+        for name, text in (('a_original.txt', self.original), ('b_revisao.txt', self.revision)):
+            with open(os.path.join(documents, name), 'w', encoding='utf-8') as f:
+                f.write(text)
+        analyzed = []
+
+        def _record(state):
+            analyzed.append(os.path.basename(state['input_file']))
+            return {}, []
+
+        stages = {'read': main._stage_read, 'dedup': main._stage_dedup, 'record': _record}
+        output = os.path.join(self.tmp.name, 'saida')
+        with patch.object(main, 'PIPELINE_STAGES', stages), patch.object(main, 'download_nltk_packages'):
+            processed = main.run_batch([documents], output, dedup_mode='skip')
+        # Sem --index_path, os documentos do lote são comparados no índice da raiz das saídas
+        self.assertEqual(processed, {'done': 2, 'failed': 0})
+        self.assertEqual(analyzed, ['a_original.txt'])
+        clusters = duplicate_clusters(os.path.join(output, main.CORPUS_INDEX_DB))
+        self.assertEqual([os.path.basename(path) for path in clusters], ['a_original.txt'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_export.py
+
+import os
+import tempfile
+import unittest
+from src.export import COMPACTED_FILE, EXPORT_SCHEMAS, compact_export, export_analysis_results, read_export
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.results = {
+            'document_path': 'relatorio.pdf',
+            'entities': [('Petrobras', 'ORG'), ('São Paulo', 'LOC')],
+            'keywords': [('energia', 0.8), ('norma', 0.5)],
+            'topics': [(0, '0.1*"energia" + 0.05*"norma"')],
+            'tokens': ['energia', 'norma', 'energia'],
+            'sentences': [{'text': 'Um sucesso.', 'score': 0.6, 'label': 'positive', 'escalated': False}],
+            'sentiment': {'label': 'positive', 'score': 0.6},
+            'text_statistics': {'total_words': 120, 'avg_words_sentence': 12.5},
+            'readability': {'flesch_reading_ease': 50.0},
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_export_and_read(self):
+        export_analysis_results(self.results, self.tmp.name, 'doc1', 'pt')
+        export_analysis_results(dict(self.results, entities=[('Vibra', 'ORG')]), self.tmp.name, 'doc2', 'en')
+        self.assertTrue(os.path.exists(os.path.join(self.tmp.name, 'entities', 'language=pt', 'doc1.parquet')))
+
+        entities = read_export(self.tmp.name, 'entities')
+        self.assertEqual(entities.num_rows, 3)
+        self.assertEqual(entities.schema.names, [name for name, _ in EXPORT_SCHEMAS['entities']] + ['language'])
+        pt_entities = read_export(self.tmp.name, 'entities', columns=['entity'], language='pt')
+        self.assertEqual(pt_entities.column('entity').to_pylist(), ['Petrobras', 'São Paulo'])
+
+        statistics = read_export(self.tmp.name, 'statistics', columns=['document_id', 'total_words', 'total_sentences'])
+        self.assertEqual(sorted(statistics.column('total_words').to_pylist()), [120, 120])
+        self.assertEqual(statistics.column('total_sentences').to_pylist(), [None, None])
+
+    def test_reexport_replaces_document(self):
+        export_analysis_results(self.results, self.tmp.name, 'doc1', 'pt')
+        export_analysis_results(dict(self.results, tokens=['norma']), self.tmp.name, 'doc1', 'pt')
+        self.assertEqual(read_export(self.tmp.name, 'tokens').column('token').to_pylist(), ['norma'])
+
+    def test_reexport_with_other_language_removes_old_partition_file(self):
+        export_analysis_results(self.results, self.tmp.name, 'doc1', 'pt')
+        export_analysis_results(self.results, self.tmp.name, 'doc1', 'en')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'tokens', 'language=pt', 'doc1.parquet')))
+        self.assertEqual(read_export(self.tmp.name, 'statistics', columns=['language']).column('language').to_pylist(),
+                         ['en'])
+
+    def test_compact_export(self):
+        for document_id in ('doc2', 'doc1', 'doc3'):
+            export_analysis_results(self.results, self.tmp.name, document_id, 'pt')
+        self.assertEqual(compact_export(self.tmp.name, row_group_size=2), 18)
+        self.assertEqual(os.listdir(os.path.join(self.tmp.name, 'tokens', 'language=pt')), [COMPACTED_FILE])
+        tokens = read_export(self.tmp.name, 'tokens', columns=['document_id', 'position'])
+        self.assertEqual(tokens.column('document_id').to_pylist(), ['doc1'] * 3 + ['doc2'] * 3 + ['doc3'] * 3)
+        self.assertEqual(tokens.column('position').to_pylist(), [0, 1, 2] * 3)
+
+        # Reexportar um documento compactado não reescreve o arquivo compactado; as linhas antigas são ignoradas
+        compacted = os.path.join(self.tmp.name, 'tokens', 'language=pt', COMPACTED_FILE)
+        modified = os.stat(compacted).st_mtime_ns
+        export_analysis_results(dict(self.results, tokens=['norma']), self.tmp.name, 'doc2', 'en')
+        self.assertEqual(os.stat(compacted).st_mtime_ns, modified)
+        self.assertEqual(read_export(self.tmp.name, 'tokens', language='pt').num_rows, 6)
+        self.assertEqual(read_export(self.tmp.name, 'tokens', columns=['document_id']).num_rows, 7)
+        self.assertEqual(compact_export(self.tmp.name), 6)
+        tokens = read_export(self.tmp.name, 'tokens', columns=['document_id', 'token'], language='en')
+        self.assertEqual(tokens.column('token').to_pylist(), ['norma'])
+        self.assertEqual(read_export(self.tmp.name, 'tokens').num_rows, 7)
+
+if __name__ == '__main__':
+    unittest.main()
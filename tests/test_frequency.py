@@ -0,0 +1,60 @@
+# tests/test_frequency.py
+
+import pickle
+import unittest
+from collections import Counter
+from src.frequency import WordFrequencyCounter, count_word_frequencies
+
+class TestFrequency(unittest.TestCase):
+
+    def setUp(self):
+        # Distribuição com poucas palavras muito frequentes e uma cauda longa
+        self.tokens = []
+        for i in range(2000):
+            self.tokens.append(f"palavra{i % 5}")
+            self.tokens.append(f"rara{i}")
+        self.expected = Counter(self.tokens).most_common(5)
+
+    def test_exact_mode(self):
+        counter = count_word_frequencies([self.tokens], mode='exact', k=5)
+        self.assertEqual(counter.top_k(), self.expected)
+        self.assertEqual(counter.total, len(self.tokens))
+
+    def test_approximate_mode_finds_heavy_hitters(self):
+        counter = WordFrequencyCounter(mode='approximate', k=5, capacity=50, width=2 ** 12)
+        for start in range(0, len(self.tokens), 100):
+            counter.update(self.tokens[start:start + 100])
+        top = counter.top_k()
+        self.assertEqual({word for word, _ in top}, {word for word, _ in self.expected})
+        for word, count in top:
+            self.assertGreaterEqual(count, 400)
+        self.assertGreaterEqual(counter.count('palavra0'), 400)
+
+    def test_merge_worker_counters(self):
+        half = len(self.tokens) // 2
+        for mode in WordFrequencyCounter.MODES:
+            first = WordFrequencyCounter(mode=mode, k=5, capacity=50, width=2 ** 12)
+            second = WordFrequencyCounter(mode=mode, k=5, capacity=50, width=2 ** 12)
+            first.update(self.tokens[:half])
+            second.update(self.tokens[half:])
+            # O estado é serializável, como ao voltar de um processo de trabalho
+            first.merge(pickle.loads(pickle.dumps(second)))
+            self.assertEqual(first.total, len(self.tokens))
+            self.assertEqual({word for word, _ in first.top_k()}, {word for word, _ in self.expected})
+
+    def test_sketch_allocated_only_when_needed(self):
+        counter = WordFrequencyCounter(mode='approximate', k=5, capacity=50, width=2 ** 12)
+        counter.update(self.tokens[:40])
+        self.assertIsNone(counter.sketch)
+        self.assertEqual(counter.top_k(), Counter(self.tokens[:40]).most_common(5))
+        counter.update(self.tokens[40:])
+        self.assertIsNotNone(counter.sketch)
+        # As contagens anteriores à alocação foram transferidas para o sketch
+        self.assertGreaterEqual(counter.count('palavra0'), 400)
+
+    def test_invalid_mode(self):
+        with self.assertRaises(ValueError):
+            WordFrequencyCounter(mode='aproximado')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/test_manifest.py
+
+import os
+import tempfile
+import unittest
+from src.manifest import RunManifest, load_checkpoint
+
+class TestManifest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manifest = RunManifest(os.path.join(self.tmp.name, 'manifest.db'), max_failures=2)
+        self.output = os.path.join(self.tmp.name, 'saida')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_resume_completed_stages(self):
+        run = self.manifest.start('doc.txt', self.output, 'v1')
+        self.assertEqual((run['status'], run['stages']), ('running', {}))
+        self.manifest.complete_stage('doc.txt', self.output, 'read', {'text': 'abc'})
+        # O processo cai antes de concluir o documento; a execução seguinte retoma após 'read'
+        run = self.manifest.start('doc.txt', self.output, 'v1')
+        self.assertEqual(run['failures'], 1)
+        self.assertEqual(load_checkpoint(run['stages']['read']), {'text': 'abc'})
+        self.manifest.finish('doc.txt')
+        self.assertEqual(self.manifest.start('doc.txt', self.output, 'v1')['status'], 'done')
+        # Um arquivo alterado é processado de novo desde o início
+        run = self.manifest.start('doc.txt', self.output, 'v2')
+        self.assertEqual((run['status'], run['stages']), ('running', {}))
+
+    def test_quarantine_after_repeated_failures(self):
+        self.manifest.start('ruim.pdf', self.output)
+        self.manifest.finish('ruim.pdf', ValueError('pdf inválido'))
+        self.assertEqual(self.manifest.start('ruim.pdf', self.output)['status'], 'running')
+        # Segunda falha: o processo foi interrompido com o documento em andamento
+        self.assertEqual(self.manifest.start('ruim.pdf', self.output)['status'], 'quarantined')
+        self.assertEqual(self.manifest.quarantined(), [('ruim.pdf', 2, 'pdf inválido')])
+        self.manifest.release('ruim.pdf')
+        self.assertEqual(self.manifest.start('ruim.pdf', self.output)['status'], 'running')
+
+    def test_cancel_is_not_a_failure(self):
+        self.manifest.start('doc.txt', self.output)
+        self.manifest.complete_stage('doc.txt', self.output, 'read', {'text': 'abc'})
+        self.manifest.cancel('doc.txt')
+        run = self.manifest.start('doc.txt', self.output)
+        self.assertEqual((run['status'], run['failures'], list(run['stages'])), ('running', 0, ['read']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# tests/test_parse_store.py
+
+import tempfile
+import unittest
+import spacy
+from spacy.tokens import Span
+from src.parse_store import ParseStore
+
+class TestParseStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ParseStore(self.tmp.name)
+        self.nlp = spacy.blank('pt')
+        self.text = "A Petrobras aprovou o plano."
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_keeps_annotations(self):
+        doc = self.nlp(self.text)
+        doc.ents = [Span(doc, 1, 2, label='ORG')]
+        doc[2].pos_ = 'VERB'
+        doc[2].lemma_ = 'aprovar'
+        self.store.put(doc, self.nlp)
+        loaded = self.store.get(self.text, self.nlp)
+        self.assertEqual([(ent.text, ent.label_) for ent in loaded.ents], [('Petrobras', 'ORG')])
+        self.assertEqual((loaded[2].pos_, loaded[2].lemma_), ('VERB', 'aprovar'))
+        self.assertIsNone(self.store.get("Outro texto.", self.nlp))
+
+    def test_parse_reuses_stored_docs(self):
+        self.store.parse(self.text, self.nlp)
+        docs = self.store.parse_corpus([self.text, "Outro texto."], self.nlp)
+        self.assertEqual([doc.text for doc in docs], [self.text, "Outro texto."])
+        self.assertEqual((self.store.hits, self.store.misses), (1, 2))
+
+if __name__ == '__main__':
+    unittest.main()
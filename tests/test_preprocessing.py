@@ -1,7 +1,15 @@
 # tests/test_preprocessing.py
 
 import unittest
-from src.preprocessing import preprocess_text, text_statistics, count_syllables_pt
+from src.preprocessing import (
+    preprocess_text,
+    text_statistics,
+    count_syllables_pt,
+    detect_language,
+    language_profile,
+    segment_by_language,
+    tag_and_lemmatize
+)
 
 class TestPreprocessing(unittest.TestCase):
 
@@ -19,6 +27,15 @@ class TestPreprocessing(unittest.TestCase):
         tokens = preprocess_text(text, language)
         self.assertEqual(tokens, expected_tokens)
 
+    def test_tag_and_lemmatize_en(self):
+        tagged = tag_and_lemmatize(['the', 'dogs', 'were', 'running'], 'en')
+        self.assertEqual([token for token, _, _ in tagged], ['the', 'dogs', 'were', 'running'])
+        self.assertEqual([lemma for _, _, lemma in tagged], ['the', 'dog', 'be', 'run'])
+
+    def test_tag_and_lemmatize_unsupported_language(self):
+        self.assertEqual(tag_and_lemmatize(['texto'], 'es'), [('texto', None, 'texto')])
+        self.assertEqual(tag_and_lemmatize([], 'pt'), [])
+
     def test_preprocess_text_empty(self):
         text = ""
         language = 'en'
@@ -42,5 +59,26 @@ class TestPreprocessing(unittest.TestCase):
         syllables = count_syllables_pt(text)
         self.assertEqual(syllables, 16)
 
+    def test_detect_language(self):
+        text = "O procedimento estabelece as responsabilidades da gerência na aprovação das normas internas. " * 50
+        self.assertEqual(detect_language(text, sample_size=200, max_samples=4), 'pt')
+
+    def test_language_profile_mixed(self):
+        pt = "O procedimento estabelece as responsabilidades da gerência na aprovação das normas internas. " * 10
+        en = "This procedure defines the responsibilities of the department regarding approval of rules. " * 10
+        self.assertFalse(language_profile(pt, sample_size=200, max_samples=4)['mixed'])
+        profile = language_profile(pt + en, sample_size=200, max_samples=4)
+        self.assertTrue(profile['mixed'])
+        self.assertEqual(set(profile['votes']), {'pt', 'en'})
+
+    def test_segment_by_language(self):
+        pt = "O procedimento estabelece as responsabilidades da gerência na aprovação das normas internas."
+        en = "This procedure defines the responsibilities of the department regarding approval of internal rules."
+        text = f"{pt}\nResumo\n{en}\n{pt}"
+        segments = segment_by_language(text, 'pt')
+        self.assertEqual([segment['language'] for segment in segments], ['pt', 'en', 'pt'])
+        self.assertEqual(segments[1]['text'], en)
+        self.assertEqual(segments[0]['text'], f"{pt}\nResumo")
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,89 @@
+# tests/test_readers.py
+
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+from src.readers import count_pdf_pages, iter_pdf_pages, iter_docx_paragraphs, iter_pptx_slides
+
+def _pages_without_pool(path):
+    # Em um processo filho, a extração não deve criar outro pool de processos
+    with patch('src.readers.ProcessPoolExecutor', side_effect=AssertionError("pool criado")):
+        return [number for number, _ in iter_pdf_pages(path, chunk_size=1)]
+
+class TestReaders(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        from reportlab.pdfgen import canvas
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.pdf_path = os.path.join(cls.tmp.name, 'documento.pdf')
+        pdf = canvas.Canvas(cls.pdf_path)
+        for page in range(1, 6):
+            pdf.drawString(72, 720, f"Conteudo da pagina {page}")
+            pdf.showPage()
+        pdf.save()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_count_pdf_pages(self):
+        self.assertEqual(count_pdf_pages(self.pdf_path), 5)
+
+    def test_iter_pdf_pages_in_order(self):
+        pages = list(iter_pdf_pages(self.pdf_path, workers=2, chunk_size=2))
+        self.assertEqual([number for number, _ in pages], [1, 2, 3, 4, 5])
+        self.assertIn('Conteudo da pagina 3', pages[2][1])
+
+    def test_iter_pdf_pages_range_and_budget(self):
+        pages = list(iter_pdf_pages(self.pdf_path, page_range=(2, 5), max_pages=2, workers=1))
+        self.assertEqual([number for number, _ in pages], [2, 3])
+
+    def test_iter_pdf_pages_in_child_process_uses_one_process(self):
+        with ProcessPoolExecutor(1) as executor:
+            self.assertEqual(executor.submit(_pages_without_pool, self.pdf_path).result(), [1, 2, 3, 4, 5])
+
+    def test_iter_pdf_pages_with_other_threads(self):
+        # Com outras threads ativas, o pool de extração não é criado com fork
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait)
+        thread.start()
+        try:
+            with patch('src.readers.ProcessPoolExecutor', wraps=ProcessPoolExecutor) as executor:
+                pages = list(iter_pdf_pages(self.pdf_path, workers=2, chunk_size=2))
+            self.assertNotEqual(executor.call_args.kwargs['mp_context'].get_start_method(), 'fork')
+        finally:
+            stop.set()
+            thread.join()
+        self.assertEqual([number for number, _ in pages], [1, 2, 3, 4, 5])
+
+    def test_iter_docx_paragraphs(self):
+        from docx import Document
+        path = os.path.join(self.tmp.name, 'documento.docx')
+        document = Document()
+        document.add_paragraph('Primeiro parágrafo.')
+        table = document.add_table(rows=1, cols=2)
+        table.cell(0, 0).text = 'Célula A'
+        table.cell(0, 1).text = 'Célula B'
+        document.add_paragraph('Último parágrafo.')
+        document.save(path)
+        paragraphs = [p for p in iter_docx_paragraphs(path) if p]
+        self.assertEqual(paragraphs, ['Primeiro parágrafo.', 'Célula A', 'Célula B', 'Último parágrafo.'])
+
+    def test_iter_pptx_slides(self):
+        from pptx import Presentation
+        path = os.path.join(self.tmp.name, 'apresentacao.pptx')
+        presentation = Presentation()
+        for title in ('Introdução', 'Conclusão'):
+            slide = presentation.slides.add_slide(presentation.slide_layouts[1])
+            slide.shapes.title.text = title
+            slide.placeholders[1].text = f"Texto sobre {title.lower()}"
+        presentation.save(path)
+        slides = list(iter_pptx_slides(path))
+        self.assertEqual(slides, [(1, 'Introdução\nTexto sobre introdução'), (2, 'Conclusão\nTexto sobre conclusão')])
+
+if __name__ == '__main__':
+    unittest.main()
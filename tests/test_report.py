@@ -0,0 +1,55 @@
+# tests/test_report.py
+
+import os
+import tempfile
+import unittest
+from src.report import generate_abnt_report, iter_report_blocks
+
+class TestReport(unittest.TestCase):
+
+    def setUp(self):
+        self.analysis_results = {
+            'word_frequency': {'energia': 3, 'norma': 2},
+            'entities': [('Vibra', 'ORG')],
+            'actions': [{'action': 'aprovar o documento', 'responsible': 'gerente'}],
+            'method_explanations': {
+                'Frequência de Palavras': '<b>Frequência de Palavras</b>: Palavras mais frequentes.\n'
+            }
+        }
+
+    def test_iter_report_blocks_corpus(self):
+        blocks = list(iter_report_blocks(iter([self.analysis_results, self.analysis_results])))
+        self.assertEqual(sum(1 for block in blocks if block[0] == 'page_break'), 1)
+        tables = [block for block in blocks if block[0] == 'table']
+        self.assertIn(('gerente', 'aprovar o documento'), tables[2][2])
+
+    def test_generate_markdown_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = os.path.join(tmp, 'relatorio.md')
+            self.assertEqual(generate_abnt_report(self.analysis_results, report_path), report_path)
+            with open(report_path, encoding='utf-8') as f:
+                content = f.read()
+            self.assertIn('**Frequência de Palavras**', content)
+            self.assertIn('| energia | 3 |', content)
+
+    def test_generate_html_report_escapes_text(self):
+        self.analysis_results['method_explanations']['Entidades Nomeadas'] = '<b>Entidades</b>: R&D <script>'
+        self.analysis_results['word_frequency'] = {'<img>': 1}
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = os.path.join(tmp, 'relatorio.html')
+            generate_abnt_report(self.analysis_results, report_path)
+            with open(report_path, encoding='utf-8') as f:
+                content = f.read()
+            self.assertIn('<p><b>Entidades</b>: R&amp;D &lt;script&gt;</p>', content)
+            self.assertNotIn('<script>', content)
+            self.assertIn('&lt;img&gt;', content)
+
+    def test_generate_pdf_report(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            report_path = os.path.join(tmp, 'relatorio.pdf')
+            generate_abnt_report(self.analysis_results, report_path)
+            with open(report_path, 'rb') as f:
+                self.assertEqual(f.read(5), b'%PDF-')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# tests/test_similarity.py
+
+import os
+import tempfile
+import unittest
+from src.similarity import SimilarityIndex, build_similarity_index
+from src.token_corpus import TokenCorpus
+
+TOPICS = [
+    ['energia', 'solar', 'painel', 'eólica', 'turbina', 'rede'],
+    ['contrato', 'cláusula', 'multa', 'prazo', 'rescisão', 'parte'],
+    ['paciente', 'exame', 'diagnóstico', 'tratamento', 'médico', 'dose'],
+]
+
+def make_documents(per_topic):
+    documents, ids = [], []
+    for topic, words in enumerate(TOPICS):
+        for n in range(per_topic):
+            # Cada documento usa as palavras do tópico em proporções diferentes
+            documents.append([word for i, word in enumerate(words) for _ in range(1 + (i + n) % 3)])
+            ids.append(f"t{topic}-{n}")
+    return documents, ids
+
+class TestSimilarityIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.documents, self.ids = make_documents(per_topic=20)
+        self.corpus = TokenCorpus.from_documents(self.documents)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_similar_documents_share_topic(self):
+        path = os.path.join(self.tmp.name, 'index')
+        index = build_similarity_index(self.corpus, self.ids, path, n_components=8)
+        self.assertEqual(len(index), 60)
+        results = index.similar_to('t1-3', k=5)
+        self.assertEqual(len(results), 5)
+        self.assertNotIn('t1-3', [document_id for document_id, _ in results])
+        self.assertTrue(all(document_id.startswith('t1-') for document_id, _ in results))
+        self.assertEqual([score for _, score in results], sorted((score for _, score in results), reverse=True))
+
+        # Reaberto do disco, o índice projeta novos documentos no mesmo espaço
+        reopened = SimilarityIndex(path)
+        top, score = reopened.similar_to_tokens(['paciente', 'exame', 'dose', 'desconhecida'], k=1)[0]
+        self.assertTrue(top.startswith('t2-'))
+        self.assertGreater(score, 0.5)
+
+    def test_partitioned_index_matches_exact_search(self):
+        exact = build_similarity_index(self.corpus, self.ids, os.path.join(self.tmp.name, 'exact'), n_components=8)
+        partitioned = build_similarity_index(self.corpus, self.ids, os.path.join(self.tmp.name, 'ivf'),
+                                             n_components=8, partition_threshold=10, n_partitions=3)
+        self.assertEqual(partitioned.meta['partitions'], 3)
+        self.assertEqual(sorted(partitioned.ids), sorted(self.ids))
+        for document_id in ('t0-0', 't1-7', 't2-19'):
+            found = {d for d, _ in partitioned.similar_to(document_id, k=3, n_probe=1)}
+            self.assertEqual({d[:2] for d in found}, {document_id[:2]})
+            self.assertAlmostEqual(partitioned.similar_to(document_id, k=3, n_probe=3)[0][1],
+                                   exact.similar_to(document_id, k=3)[0][1], places=5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+# tests/test_token_corpus.py
+
+import os
+import pickle
+import tempfile
+import unittest
+from src.token_corpus import MappedTokenCorpus, TokenCorpus, TokenCorpusWriter, Vocabulary
+
+class TestTokenCorpus(unittest.TestCase):
+
+    def setUp(self):
+        self.corpus = TokenCorpus.from_documents([
+            ['norma', 'energia', 'norma', 'documento'],
+            ['energia', 'norma', 'processo'],
+        ])
+
+    def test_shared_vocabulary(self):
+        vocabulary = self.corpus.vocabulary
+        self.assertEqual(vocabulary.words, ['norma', 'energia', 'documento', 'processo'])
+        self.assertEqual(self.corpus[1].dtype.name, 'int32')
+        self.assertEqual(vocabulary.decode(self.corpus[1]), ['energia', 'norma', 'processo'])
+
+    def test_most_common(self):
+        self.assertEqual(self.corpus.most_common(2), [('norma', 3), ('energia', 2)])
+        self.assertEqual(self.corpus.most_common(index=1), [('norma', 1), ('energia', 1), ('processo', 1)])
+
+    def test_to_bow_and_csr(self):
+        self.assertEqual(self.corpus.to_bow(0), [(0, 2), (1, 1), (2, 1)])
+        matrix = self.corpus.to_csr()
+        self.assertEqual(matrix.shape, (2, 4))
+        self.assertEqual(matrix.toarray().tolist(), [[2, 1, 1, 0], [1, 1, 0, 1]])
+
+    def test_encode_without_growing(self):
+        vocabulary = Vocabulary(['norma'])
+        self.assertEqual(vocabulary.encode(['norma', 'inédita'], grow=False).tolist(), [0, -1])
+        self.assertEqual(len(vocabulary), 1)
+
+    def test_unknown_words_are_dropped(self):
+        corpus = TokenCorpus(self.corpus.vocabulary)
+        corpus.add_document(['norma', 'inédita', 'processo'], grow=False)
+        corpus.add_ids([1, -1])
+        self.assertEqual(corpus[0].tolist(), [0, 3])
+        self.assertEqual(corpus.frequencies().tolist(), [1, 1, 0, 1])
+        self.assertEqual(corpus.to_csr().toarray().tolist(), [[1, 0, 0, 1], [0, 1, 0, 0]])
+        self.assertNotIn('inédita', corpus.vocabulary)
+
+    def test_mapped_corpus_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.corpus.save(os.path.join(tmp, 'corpus'))
+            mapped = MappedTokenCorpus(path)
+            self.assertEqual(len(mapped), 2)
+            self.assertEqual(mapped.vocabulary.decode(mapped[1]), ['energia', 'norma', 'processo'])
+            self.assertEqual(mapped.most_common(2), self.corpus.most_common(2))
+            self.assertEqual(mapped.to_csr().toarray().tolist(), self.corpus.to_csr().toarray().tolist())
+            self.assertEqual(list(mapped.bow_corpus()), list(self.corpus.iter_bow()))
+            # O pickle leva apenas o caminho; o processo de destino reabre o mapeamento
+            payload = pickle.dumps(mapped)
+            self.assertLess(len(payload), 200)
+            self.assertEqual(pickle.loads(payload).to_bow(0), self.corpus.to_bow(0))
+            del mapped
+
+    def test_writer_streams_documents(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with TokenCorpusWriter(tmp) as writer:
+                writer.add_document(['norma', 'energia'])
+                writer.add_document([])
+                writer.add_document(['energia'])
+            mapped = MappedTokenCorpus(tmp)
+            self.assertEqual([len(doc) for doc in mapped], [2, 0, 1])
+            self.assertEqual(mapped.frequencies().tolist(), [1, 2])
+            with self.assertRaises(TypeError):
+                mapped.add_document(['norma'])
+            del mapped
+
+if __name__ == '__main__':
+    unittest.main()
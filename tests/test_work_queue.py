@@ -0,0 +1,58 @@
+# tests/test_work_queue.py
+
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from src.work_queue import WorkQueue, run_worker
+
+def _touch_output(job):
+    os.makedirs(job['output_folder'])
+    with open(os.path.join(job['output_folder'], 'done'), 'w') as f:
+        f.write(str(os.getpid()))
+    return True
+
+def _local_worker(db_path):
+    run_worker(db_path, _touch_output, lease_seconds=30)
+
+class TestWorkQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, 'queue.db')
+        self.files = [os.path.join(self.tmp.name, f"doc{i}.txt") for i in range(12)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_retries_and_expired_leases(self):
+        queue = WorkQueue(self.db_path, lease_seconds=0.05, max_attempts=2)
+        self.assertEqual(queue.enqueue(self.files[:2], self.tmp.name), 2)
+        self.assertEqual(queue.enqueue(self.files[:2], self.tmp.name), 0)
+        first = queue.claim('a')
+        self.assertTrue(queue.fail(first['id'], 'a', 'erro'))
+        # A concessão do worker 'b' vence e o documento é reatribuído a 'c'
+        leased = [queue.claim('b'), queue.claim('b')]
+        self.assertEqual(sorted(job['id'] for job in leased), [1, 2])
+        time.sleep(0.1)
+        retried = queue.claim('c')
+        self.assertFalse(queue.heartbeat(retried['id'], 'b'))
+        self.assertTrue(queue.complete(retried['id'], 'c'))
+        # O documento restante esgotou as tentativas quando a concessão venceu
+        self.assertIsNone(queue.claim('c'))
+        self.assertEqual(queue.counts(), {'pending': 0, 'leased': 0, 'done': 1, 'failed': 1})
+        self.assertEqual(len(queue.failures()), 1)
+
+    def test_local_workers_process_each_document_once(self):
+        WorkQueue(self.db_path).enqueue(self.files, os.path.join(self.tmp.name, 'saida'))
+        workers = [multiprocessing.Process(target=_local_worker, args=(self.db_path,)) for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(WorkQueue(self.db_path).counts()['done'], len(self.files))
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp.name, 'saida'))), len(self.files))
+
+if __name__ == '__main__':
+    unittest.main()
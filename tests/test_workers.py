@@ -0,0 +1,74 @@
+# tests/test_workers.py
+
+import gc
+import os
+import signal
+import time
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from src.budget import run_with_budget
+from src.workers import PreloadedPool, process_memory
+
+_MODEL = None
+
+def _load_model():
+    global _MODEL
+    _MODEL = bytearray(8 * 2 ** 20)
+
+def _model_size(_):
+    return os.getpid(), len(_MODEL) if _MODEL is not None else 0
+
+def _slow(seconds):
+    time.sleep(seconds)
+    return seconds
+
+def _kill_self(_):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+def _budgeted(seconds):
+    return run_with_budget(_slow, (seconds,), seconds=0.5)[0]
+
+@unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), "Requer /proc/<pid>/smaps_rollup (Linux).")
+class TestWorkers(unittest.TestCase):
+
+    def test_process_memory(self):
+        memory = process_memory()
+        self.assertEqual(memory['pid'], os.getpid())
+        self.assertGreater(memory['uss'], 0)
+        self.assertLessEqual(memory['uss'], memory['rss'])
+
+    def test_preloaded_pool_shares_models(self):
+        with PreloadedPool(2, models=(), preload=[_load_model]) as pool:
+            results = pool.map(_model_size, range(4))
+            report = pool.memory_report()
+        # O modelo carregado antes do fork já está disponível nos processos de trabalho
+        self.assertEqual({size for _, size in results}, {8 * 2 ** 20})
+        self.assertEqual(len(report['workers']), 2)
+        for memory in report['workers']:
+            # As páginas do modelo continuam compartilhadas com o processo principal
+            self.assertLess(memory['uss'], 8 * 2 ** 20)
+
+    def test_budgets_inside_pool_workers(self):
+        with PreloadedPool(2, models=()) as pool:
+            self.assertEqual(pool.map(_budgeted, [0, 30]), ['ok', 'timed_out'])
+
+    def test_killed_worker_fails_pending_tasks(self):
+        with PreloadedPool(2, models=()) as pool:
+            future = pool.submit(_kill_self, None)
+            # A tarefa do processo morto falha em vez de deixar o pool aguardando indefinidamente
+            with self.assertRaises(BrokenProcessPool):
+                future.result(timeout=30)
+
+    def test_join_keeps_other_pools_frozen(self):
+        first = PreloadedPool(1, models=())
+        second = PreloadedPool(1, models=())
+        second.terminate()
+        second.join()
+        # O outro pool continua vivo: os objetos congelados não voltam ao coletor
+        self.assertGreater(gc.get_freeze_count(), 0)
+        first.terminate()
+        first.join()
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+if __name__ == '__main__':
+    unittest.main()